@@ -3,12 +3,24 @@ import yaml
 import argparse
 from pathlib import Path
 from src.processors.whisper_processor import WhisperProcessor
-from src.processors.argos_translator import ArgosTranslator
-from src.processors.tts_processor import TTSProcessor
+from src.processors.translation_backends import create_translator
+from src.processors.tts_scheduler import TTSScheduler
+from src.utils.audio_buffer import SAMPLE_RATE, AudioBuffer
+from src.utils.audio_mixer import CROSSFADE_SECONDS, TimelineMixer, load_clip
+from src.utils.ducking import Ducker
+from src.utils.model_registry import get_registry
+from src.utils.timeline import is_non_vocal_text
+from src.utils.transcription_cache import TranscriptionCache
+from src.utils.translation_memory import TranslationMemory
+from src.utils.tts_cache import TTSCache
+from src.utils.time_stretch import fit_clip, log_stretch_report
 import os
 import subprocess
-from pydub import AudioSegment
 import glob
+import threading
+import time
+import torch
+from concurrent.futures import ThreadPoolExecutor
 
 # Configuration du logging
 logging.basicConfig(
@@ -22,117 +34,49 @@ def load_config(config_path: str) -> dict:
     with open(config_path, 'r') as f:
         return yaml.safe_load(f)
 
-def extract_audio(video_path, output_path):
-    """Extrait l'audio d'une vidéo."""
-    command = [
-        'ffmpeg', '-i', video_path,
-        '-vn',  # Pas de vidéo
-        '-acodec', 'pcm_s16le',  # Codec audio PCM
-        '-ar', '16000',  # Taux d'échantillonnage
-        '-ac', '1',  # Mono
-        '-y',  # Écraser si existe
-        output_path
-    ]
-    subprocess.run(command, check=True)
+def extract_audio(video_path, output_path) -> AudioBuffer:
+    """
+    Extrait l'audio d'une vidéo.
+    
+    L'audio est décodé une seule fois en mémoire ; le WAV est écrit depuis ce tampon,
+    qui est retourné pour être réutilisé par la transcription.
+    """
+    audio = AudioBuffer.from_file(video_path)
+    audio.write_wav(output_path)
+    return audio
 
 def sync_audio_with_original(original_audio_path, new_audio_path, timestamps, output_path):
-    """Synchronise le nouvel audio avec l'original en utilisant les timestamps."""
+    """
+    Synchronise le nouvel audio avec l'original en utilisant les timestamps.
+    
+    Le nouvel audio contient les segments vocaux mis bout à bout : chacun est écrit à son
+    timestamp dans l'audio original, chargé une seule fois en mémoire ; les segments non
+    vocaux gardent l'audio original.
+    """
     if not os.path.exists(new_audio_path):
         raise FileNotFoundError(f"Le fichier audio généré {new_audio_path} n'existe pas.")
     
-    # Créer un fichier audio silencieux de la même durée que l'original
-    original_duration = float(subprocess.check_output([
-        'ffprobe', '-v', 'error', '-show_entries', 'format=duration',
-        '-of', 'default=noprint_wrappers=1:nokey=1', original_audio_path
-    ]).decode().strip())
-    
-    # Créer un fichier audio silencieux
-    silent_audio = os.path.join(os.path.dirname(output_path), 'silent.wav')
-    subprocess.run([
-        'ffmpeg', '-f', 'lavfi', '-i', f'anullsrc=r=16000:cl=mono',
-        '-t', str(original_duration), '-y', silent_audio
-    ], check=True)
-    
-    # Créer un fichier temporaire pour l'audio original
-    original_audio_temp = os.path.join(os.path.dirname(output_path), 'original_temp.wav')
-    subprocess.run([
-        'ffmpeg', '-i', original_audio_path,
-        '-acodec', 'pcm_s16le',
-        '-ar', '16000',
-        '-ac', '1',
-        '-y', original_audio_temp
-    ], check=True)
-    
-    # Liste pour stocker les segments
-    segments = []
+    mixer = TimelineMixer.from_file(original_audio_path, SAMPLE_RATE)
+    new_audio = load_clip(new_audio_path, SAMPLE_RATE)
     tts_cursor = 0  # Position dans l'audio TTS
     
     for i, seg in enumerate(timestamps):
         start = seg["start"]
         end = seg["end"]
-        text = seg["text"]
-        
-        # Pour les segments non vocaux, utiliser l'audio original
-        if text.startswith('[') and text.endswith(']'):
-            logger.info(f"Utilisation de l'audio original pour le segment {i} : {text}")
-            segment_path = os.path.join(os.path.dirname(output_path), f'segment_{i}.wav')
-            subprocess.run([
-                'ffmpeg', '-i', original_audio_temp,
-                '-ss', str(start),
-                '-t', str(end - start),
-                '-y', segment_path
-            ], check=True)
-        else:
-            # Pour les segments vocaux, utiliser l'audio TTS
-            if end - start < 0.1:  # Ignorer les segments trop courts
-                continue
-                
-            segment_path = os.path.join(os.path.dirname(output_path), f'segment_{i}.wav')
-            segment_duration = end - start
-            
-            subprocess.run([
-                'ffmpeg', '-i', new_audio_path,
-                '-ss', str(tts_cursor),
-                '-t', str(segment_duration),
-                '-acodec', 'pcm_s16le',
-                '-ar', '16000',
-                '-ac', '1',
-                '-y', segment_path
-            ], check=True)
-            tts_cursor += segment_duration
         
-        # Vérifier que le segment a été correctement extrait
-        if not os.path.exists(segment_path) or os.path.getsize(segment_path) == 0:
-            logger.warning(f"Le segment {i} n'a pas été correctement extrait, on le saute")
+        # Pour les segments non vocaux, l'audio original reste en place
+        if is_non_vocal_text(seg["text"]):
+            logger.info(f"Utilisation de l'audio original pour le segment {i} : {seg['text']}")
             continue
-            
-        segments.append((start, segment_path))
-    
-    # Trier les segments par ordre chronologique
-    segments.sort(key=lambda x: x[0])
-    
-    # Créer le fichier de concaténation
-    concat_file = os.path.join(os.path.dirname(output_path), 'concat.txt')
-    with open(concat_file, 'w') as f:
-        for start, segment_path in segments:
-            f.write(f"file '{os.path.abspath(segment_path)}'\n")
-    
-    # Concaténer tous les segments
-    subprocess.run([
-        'ffmpeg', '-f', 'concat', '-safe', '0',
-        '-i', concat_file,
-        '-y', output_path
-    ], check=True)
+        if end - start < 0.1:  # Ignorer les segments trop courts
+            continue
+        
+        # Pour les segments vocaux, utiliser l'audio TTS
+        n_samples = int(round((end - start) * SAMPLE_RATE))
+        mixer.write(new_audio[tts_cursor:tts_cursor + n_samples], start)
+        tts_cursor += n_samples
     
-    # Nettoyer les fichiers temporaires
-    try:
-        os.remove(silent_audio)
-        os.remove(original_audio_temp)
-        os.remove(concat_file)
-        for _, segment_path in segments:
-            os.remove(segment_path)
-    except Exception as e:
-        logger.warning(f"Impossible de supprimer un fichier temporaire: {e}")
+    mixer.write_wav(output_path)
 
 def combine_video_audio(video_path, audio_path, output_path):
     """Combine la vidéo avec l'audio synchronisé."""
@@ -149,24 +93,52 @@ def combine_video_audio(video_path, audio_path, output_path):
     ]
     subprocess.run(command, check=True)
 
-def replace_speech_with_tts(original_audio_path, tts_audio_path, timestamps, output_path):
+# Codes de langue ISO 639-2 des pistes audio (métadonnées du conteneur)
+TRACK_LANGUAGES = {
+    "ar": "ara", "de": "deu", "en": "eng", "es": "spa", "fr": "fra", "hi": "hin", "it": "ita",
+    "ja": "jpn", "ko": "kor", "nl": "nld", "pl": "pol", "pt": "por", "ru": "rus", "tr": "tur",
+    "uk": "ukr", "zh": "zho",
+}
+
+def combine_video_tracks(video_path, audio_tracks, output_path):
+    """
+    Combine la vidéo avec une piste audio par langue (conteneur MKV ou MP4).
+    
+    Args:
+        audio_tracks (dict): Chemin de l'audio doublé par code de langue, dans l'ordre des pistes
+    """
+    command = ['ffmpeg', '-i', video_path]
+    for audio_path in audio_tracks.values():
+        command += ['-i', str(audio_path)]
+    command += ['-map', '0:v:0']
+    for i in range(len(audio_tracks)):
+        command += ['-map', f'{i + 1}:a:0']
+    command += ['-c:v', 'copy', '-c:a', 'aac']
+    for i, language in enumerate(audio_tracks):
+        command += [f'-metadata:s:a:{i}', f'language={TRACK_LANGUAGES.get(language, language)}']
+    command += ['-disposition:a:0', 'default', '-y', output_path]
+    subprocess.run(command, check=True)
+
+def replace_speech_with_tts(original_audio_path, tts_audio_path, timestamps, output_path, ducker=None):
     """
     Remplace les segments de parole de l'audio original par l'audio TTS,
     en gardant la musique/bruit d'ambiance.
+    
+    L'audio TTS contient les segments mis bout à bout : chaque segment TTS est ajouté à son
+    timestamp, avec de courts fondus, dans un seul tampon préalloué ; le résultat est écrit.
+    Avec `ducker` (None : pas d'atténuation), l'original est d'abord atténué pendant la parole.
     """
-    original = AudioSegment.from_wav(original_audio_path)
-    tts = AudioSegment.from_wav(tts_audio_path)
-    output = original
+    mixer = TimelineMixer.from_file(original_audio_path, SAMPLE_RATE)
+    tts = load_clip(tts_audio_path, SAMPLE_RATE)
+    if ducker is not None:
+        ducker.apply(mixer.buffer, SAMPLE_RATE, [(seg["start"], seg["end"]) for seg in timestamps])
     tts_cursor = 0  # Position dans l'audio TTS
     for seg in timestamps:
-        start = int(seg["start"] * 1000)
-        end = int(seg["end"] * 1000)
-        seg_duration = end - start
-        # Extraire le segment TTS correspondant
-        tts_seg = tts[tts_cursor:tts_cursor + seg_duration]
+        seg_samples = int(round((seg["end"] - seg["start"]) * SAMPLE_RATE))
         # Mixer le TTS sur l'original (remplacement, mais on peut aussi faire un mix léger si besoin)
-        output = output.overlay(tts_seg, position=start)
-        tts_cursor += seg_duration
+        mixer.overlay(tts[tts_cursor:tts_cursor + seg_samples], seg["start"], fade_in=0.01, fade_out=0.01)
+        tts_cursor += seg_samples
+    mixer.write_wav(output_path)
 
 def clean_temp_files():
     """Nettoie les fichiers temporaires générés lors du traitement."""
@@ -177,34 +149,267 @@ def clean_temp_files():
         except Exception as e:
             logging.warning(f"Impossible de supprimer {file}: {e}")
 
-def is_non_vocal_segment(text):
-    """Vérifie si un segment est non vocal (musique, applaudissements, etc.)"""
-    return text.strip().startswith('[') and text.strip().endswith(']')
+def translate_segment(i, text, translation_processor):
+    """Traduit un segment vocal (le traducteur découpe lui-même les textes trop longs)."""
+    try:
+        logger.info(f"Traduction du segment {i}...")
+        translated = translation_processor.translate(text)
+        if not translated:
+            raise ValueError("La traduction est vide")
+        logger.info(f"Segment {i} traduit : {text} -> {translated}")
+        return translated
+    except Exception as e:
+        logger.error(f"Erreur lors de la traduction du segment {i} : {str(e)}")
+        return text
+
+def translate_segments(vocal_segments, translation_processor):
+    """
+    Traduit tous les segments vocaux en un seul appel groupé au traducteur.
+    
+    Args:
+        vocal_segments (list): Couples (indice, segment) des segments vocaux
+        
+    Returns:
+        list: Les textes traduits, dans l'ordre des segments
+    """
+    texts = [seg["text"] for _, seg in vocal_segments]
+    try:
+        translations = translation_processor.translate_batch(texts)
+    except Exception as e:
+        logger.error(f"Erreur lors de la traduction groupée, traduction segment par segment : {str(e)}")
+        return [translate_segment(i, seg["text"], translation_processor) for i, seg in vocal_segments]
+    
+    # Un segment dont la traduction est vide garde son texte d'origine
+    return [translated or text for text, translated in zip(texts, translations)]
+
+def synthesize_segment(i, translated_text, tts_processor, temp_dir):
+    """Génère l'audio TTS d'un segment traduit et retourne son chemin."""
+    segment_audio_path = temp_dir / f'segment_tts_{i}.wav'
+    logger.info(f"Génération audio pour le segment {i}...")
+    tts_processor.generate_audio(translated_text, str(segment_audio_path))
+    
+    # Vérification que le fichier audio a été généré
+    if not segment_audio_path.exists():
+        raise FileNotFoundError(f"Le fichier audio pour le segment {i} n'a pas été généré")
+    
+    logger.info(f"Audio généré pour le segment {i} : {segment_audio_path}")
+    return str(segment_audio_path)
 
-def split_long_segment(text, max_length=100):
-    """Divise un segment trop long en segments plus courts."""
-    if len(text) <= max_length:
-        return [text]
+def stream_segments(transcription_processor, audio, translation_processor, tts_processor, temp_dir):
+    """
+    Enchaîne transcription, traduction et TTS en flux.
+    
+    Chaque segment produit par Whisper est envoyé à un thread de traduction, puis à un
+    thread de synthèse vocale : les trois étapes se recouvrent au lieu de se succéder.
+    
+    Returns:
+        tuple: (TranscriptionResult, liste des (début, fin, chemin audio) des segments vocaux)
+    """
+    start_time = time.perf_counter()
+    first_segment_logged = threading.Event()
     
-    # Diviser sur les points ou les virgules
-    parts = []
-    current_part = ""
+    def on_first_segment(future):
+        if not future.exception() and not first_segment_logged.is_set():
+            first_segment_logged.set()
+            logger.info(f"Premier segment doublé après {time.perf_counter() - start_time:.2f}s")
+    
+    def synthesize_after(i, translated, start, end):
+        return start, end, synthesize_segment(i, translated.result(), tts_processor, temp_dir)
+    
+    language = transcription_processor.detect_language(audio)
+    segments = []
+    pending = []
+    tts_workers = getattr(tts_processor, 'workers', 1)
+    with ThreadPoolExecutor(max_workers=1) as translate_pool, ThreadPoolExecutor(max_workers=tts_workers) as tts_pool:
+        for seg in transcription_processor.iter_segments(audio, language):
+            i = len(segments)
+            segments.append(seg)
+            if is_non_vocal_text(seg["text"]):
+                logger.info(f"Segment {i} ignoré (non vocal) : {seg['text']}")
+                continue
+            logger.info(f"Traitement du segment vocal {i} : {seg['text']}")
+            translated = translate_pool.submit(translate_segment, i, seg["text"], translation_processor)
+            synthesized = tts_pool.submit(synthesize_after, i, translated, seg["start"], seg["end"])
+            synthesized.add_done_callback(on_first_segment)
+            pending.append((i, synthesized))
     
-    for char in text:
-        current_part += char
-        if len(current_part) >= max_length and (char in '.!?,;'):
-            parts.append(current_part.strip())
-            current_part = ""
+    segments_audio = []
+    for i, synthesized in pending:
+        try:
+            segments_audio.append(synthesized.result())
+        except Exception as e:
+            logger.error(f"Erreur lors du traitement du segment {i} : {str(e)}")
     
-    if current_part:
-        parts.append(current_part.strip())
+    logger.info(f"Transcription, traduction et TTS en flux terminées en {time.perf_counter() - start_time:.2f}s")
+    text = " ".join(seg["text"].strip() for seg in segments)
+    return transcription_processor.build_result(text, segments, language), segments_audio
+
+def tts_config_for(tts_cfg, language):
+    """
+    Configuration TTS d'une langue : la voix de `tts.voices.<langue>` complète la configuration commune.
     
-    return parts
+    Sans entrée pour la langue, la voix commune n'est utilisée que si elle est de cette langue
+    (nom Piper `<langue>_<PAYS>-...`) : une piste allemande ne doit pas être lue par une voix française.
+    """
+    voices = tts_cfg.get('voices') or {}
+    merged = {key: value for key, value in tts_cfg.items() if key != 'voices'}
+    if language in voices:
+        merged.update(voices[language])
+        return merged
+    base_voice = tts_cfg.get('voice') or ''
+    if '_' in base_voice and base_voice.split('_')[0] != language:
+        raise ValueError(f"Aucune voix tts.voices.{language} : la voix commune {base_voice} "
+                         f"n'est pas de la langue {language}")
+    if '_' not in base_voice:
+        logger.warning(f"Aucune voix tts.voices.{language} : voix commune {base_voice or '(non nommée)'} utilisée")
+    return merged
+
+def synthesize_segments(transcription, translation_processor, tts_processor, temp_dir):
+    """
+    Traduit les segments vocaux d'une transcription puis génère leur audio TTS.
+    
+    Returns:
+        list: Triplets (début, fin, chemin audio) des segments synthétisés
+    """
+    # Pour les segments non vocaux, on ne fait rien
+    vocal_segments = []
+    for i, seg in enumerate(transcription.timestamps):
+        if is_non_vocal_text(seg["text"]):
+            logger.info(f"Segment {i} ignoré (non vocal) : {seg['text']}")
+        else:
+            vocal_segments.append((i, seg))
+    
+    # Traduction de tous les segments vocaux en une passe groupée
+    logger.info(f"Traduction groupée de {len(vocal_segments)} segments vocaux...")
+    translations = translate_segments(vocal_segments, translation_processor)
+    
+    # Génération audio des segments en parallèle, résultats dans l'ordre de la timeline
+    logger.info("Début de la génération audio des segments...")
+    jobs = [(translated_text, str(temp_dir / f'segment_tts_{i}.wav'))
+            for (i, _), translated_text in zip(vocal_segments, translations)]
+    audio_paths = tts_processor.generate_many(jobs)
+    segments_audio = [
+        (seg["start"], seg["end"], audio_path)
+        for (_, seg), audio_path in zip(vocal_segments, audio_paths)
+        if audio_path is not None
+    ]
+    return segments_audio
+
+def sync_segments_audio(audio, segments_audio, synced_audio_path, tts_cfg, mix_cfg=None):
+    """
+    Assemble l'audio doublé en mémoire : l'audio original est chargé une fois dans un
+    tampon, puis chaque clip TTS, rééchantillonné et calé sur la durée de son segment
+    (étirement temporel borné par tts.min_speed / tts.max_speed), y est placé à son
+    timestamp. Les segments non vocaux gardent l'audio original.
+    
+    En mode `replace` (mix.mode), le clip remplace l'original avec un fondu enchaîné ; en
+    mode `duck`, l'original est d'abord atténué pendant la parole puis le clip est ajouté.
+    
+    Args:
+        audio (AudioBuffer): Audio original décodé
+        segments_audio (list): Triplets (début, fin, chemin audio) des segments synthétisés
+        synced_audio_path (Path): Chemin du WAV produit
+        tts_cfg (dict): Section `tts` de la configuration
+        mix_cfg (dict): Section `mix` de la configuration
+    """
+    mix_cfg = mix_cfg or {}
+    if not segments_audio:
+        raise ValueError("Aucun segment audio n'a été généré")
+    
+    logger.info("Début de la synchronisation de l'audio...")
+    start_time = time.perf_counter()
+    mixer = TimelineMixer(audio.samples, audio.sample_rate)
+    duck = mix_cfg.get('mode', 'replace') == 'duck'
+    if duck:
+        Ducker.from_config(mix_cfg).apply(
+            mixer.buffer, mixer.sample_rate, [(start, end) for start, end, _ in segments_audio]
+        )
+    stretch_results = []
+    for i, (start, end, audio_path) in enumerate(segments_audio):
+        try:
+            clip = load_clip(audio_path, mixer.sample_rate)
+        except Exception as e:
+            logger.error(f"Erreur lors de la lecture du segment {start}-{end} : {str(e)}")
+            continue
+        fitted, result = fit_clip(
+            clip, mixer.sample_rate, end - start,
+            min_speed=tts_cfg.get('min_speed', 0.8),
+            max_speed=tts_cfg.get('max_speed', 1.5),
+            index=i
+        )
+        if duck:
+            mixer.overlay(fitted, start, fade_in=CROSSFADE_SECONDS, fade_out=CROSSFADE_SECONDS)
+        else:
+            mixer.write(fitted, start)
+        stretch_results.append(result)
+    
+    if not stretch_results:
+        raise ValueError("Aucun segment n'a pu être placé dans l'audio doublé")
+    log_stretch_report(stretch_results)
+    mixer.write_wav(synced_audio_path)
+    logger.info(f"{len(stretch_results)} segments placés en {time.perf_counter() - start_time:.2f}s")
+    
+    # Nettoyage des fichiers temporaires
+    for _, _, audio_path in segments_audio:
+        try:
+            os.remove(audio_path)
+        except Exception as e:
+            logger.warning(f"Impossible de supprimer un fichier temporaire: {e}")
+
+def close_translator(translation_processor):
+    """Arrête les processus d'un traducteur qui en possède (TranslationPool)"""
+    close = getattr(translation_processor, 'close', None)
+    if close is not None:
+        close()
+
+def dub_language(language, transcription, audio, config, memory, tts_cache, output_dir, temp_dir, threads=None):
+    """
+    Double la transcription dans une langue cible : traduction, TTS avec la voix de la
+    langue et assemblage de l'audio. La transcription est partagée entre les langues.
+    
+    Args:
+        threads (int): Cœurs alloués à la langue (processus de traduction et voix TTS), tous si None
+    
+    Returns:
+        Path: Chemin de l'audio doublé
+    """
+    language_temp_dir = temp_dir / language
+    language_temp_dir.mkdir(parents=True, exist_ok=True)
+    translation_cfg = dict(config.get('translation', {}))
+    tts_cfg = tts_config_for(config['tts'], language)
+    voice_threads = None
+    if threads:
+        translation_cfg.setdefault('threads', threads)
+        voice_threads = tts_cfg.get('threads') or max(1, threads // max(1, tts_cfg.get('workers', 1)))
+    translation_processor = create_translator(translation_cfg, memory=memory, target_lang=language)
+    tts_processor = TTSScheduler(tts_cfg, threads=voice_threads, cache=tts_cache)
+    
+    logger.info(f"[{language}] Traduction et synthèse vocale...")
+    try:
+        segments_audio = synthesize_segments(transcription, translation_processor, tts_processor, language_temp_dir)
+    finally:
+        tts_processor.close()
+        close_translator(translation_processor)
+    synced_audio_path = output_dir / f'synced_audio_{language}.wav'
+    sync_segments_audio(audio, segments_audio, synced_audio_path, config['tts'], config.get('mix'))
+    logger.info(f"[{language}] Audio doublé généré : {synced_audio_path}")
+    return synced_audio_path
 
 def main():
     # Configuration des arguments en ligne de commande
     parser = argparse.ArgumentParser(description='Traduction et synchronisation de vidéo')
     parser.add_argument('video_path', type=str, help='Chemin vers le fichier vidéo à traiter')
+    parser.add_argument('--stream', action='store_true',
+                        help='Traduire et synthétiser chaque segment dès sa transcription (une seule langue cible ; '
+                             'une transcription déjà en cache est réutilisée sans flux)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Ne pas utiliser les caches (transcriptions, mémoire de traduction, clips TTS)')
+    parser.add_argument('--targets', type=str, default=None,
+                        help='Langues cibles séparées par des virgules (ex. fr,de,es), traduction.target_lang par défaut')
+    parser.add_argument('--jobs', type=int, default=2,
+                        help='Nombre de langues cibles doublées en parallèle (2 par défaut)')
+    parser.add_argument('--multitrack', action='store_true',
+                        help='Produire une seule vidéo MKV avec une piste audio par langue')
     args = parser.parse_args()
 
     # Vérification que le fichier vidéo existe
@@ -214,11 +419,19 @@ def main():
     
     # Chargement de la configuration
     config = load_config('config.yaml')
+    registry = get_registry(config.get('models', {}).get('memory_budget_mb'))
+    targets = [lang.strip() for lang in args.targets.split(',')] if args.targets else \
+        [config.get('translation', {}).get('target_lang', 'fr')]
+    for language in targets:
+        tts_config_for(config['tts'], language)  # Voix vérifiées avant la transcription
+    if args.stream and len(targets) > 1:
+        logger.warning("Le mode flux ne gère qu'une langue cible : transcription complète puis doublage parallèle")
     
     # Initialisation des processeurs
-    transcription_processor = WhisperProcessor(config['whisper']['model'])
-    translation_processor = ArgosTranslator(from_code="en", to_code="fr")
-    tts_processor = TTSProcessor(config['tts'])
+    cache = None if args.no_cache else TranscriptionCache.from_config(config.get('cache', {}))
+    transcription_processor = WhisperProcessor.from_config(config['whisper'], cache=cache)
+    memory = None if args.no_cache else TranslationMemory.from_config(config.get('translation_memory', {}))
+    tts_cache = None if args.no_cache else TTSCache.from_config(config.get('cache', {}))
     
     # Configuration des dossiers de sortie
     output_dir = Path(config['output']['directory'])
@@ -229,203 +442,98 @@ def main():
         directory.mkdir(parents=True, exist_ok=True)
         logger.info(f"Vérification du dossier {directory} : {'existe' if directory.exists() else 'créé'}")
     
+    translation_processor = None
     try:
         # Extraction de l'audio original
         original_audio_path = temp_dir / 'original_audio.wav'
-        extract_audio(str(video_path), str(original_audio_path))
+        audio = extract_audio(str(video_path), str(original_audio_path))
         logger.info("Audio original extrait")
         
         # Vérification de l'audio original
         if not original_audio_path.exists():
             raise FileNotFoundError(f"L'audio original n'a pas été extrait correctement : {original_audio_path}")
         
-        # Transcription
-        logger.info("Début de la transcription...")
-        transcription = transcription_processor.transcribe(str(video_path))
-        logger.info("Transcription terminée")
-        
-        # Vérification des timestamps
-        if not transcription.timestamps:
-            raise ValueError("Aucun timestamp n'a été généré lors de la transcription")
-        
-        # Traduction et génération audio segment par segment
-        logger.info("Début de la traduction et génération audio segment par segment...")
-        segments_audio = []
+        transcription = None
+        if args.stream and len(targets) == 1:
+            # Transcription déjà en cache : pas de flux, le doublage démarre immédiatement
+            transcription = transcription_processor.cached_transcription(audio)
         
-        for i, seg in enumerate(transcription.timestamps):
-            text = seg["text"]
-            
-            # Pour les segments non vocaux, on ne fait rien
-            if is_non_vocal_segment(text):
-                logger.info(f"Segment {i} ignoré (non vocal) : {text}")
-                continue
-            
-            logger.info(f"Traitement du segment vocal {i} : {text}")
-            
+        if args.stream and len(targets) == 1 and transcription is None:
+            # Transcription en flux : traduction et TTS démarrent dès le premier segment
+            language = targets[0]
+            language_temp_dir = temp_dir / language
+            language_temp_dir.mkdir(parents=True, exist_ok=True)
+            translation_processor = create_translator(config.get('translation', {}), memory=memory, target_lang=language)
+            tts_processor = TTSScheduler(tts_config_for(config['tts'], language), cache=tts_cache)
+            logger.info("Début de la transcription en flux...")
             try:
-                # Diviser le segment s'il est trop long
-                text_parts = split_long_segment(text)
-                if len(text_parts) > 1:
-                    logger.info(f"Segment {i} divisé en {len(text_parts)} parties")
-                
-                translated_parts = []
-                for j, part in enumerate(text_parts):
-                    try:
-                        # Traduction du segment
-                        logger.info(f"Traduction de la partie {j+1}/{len(text_parts)} du segment {i}...")
-                        translated_part = translation_processor.translate(part)
-                        if not translated_part:
-                            raise ValueError("La traduction est vide")
-                        logger.info(f"Partie {j+1} du segment {i} traduite : {part} -> {translated_part}")
-                        translated_parts.append(translated_part)
-                    except Exception as e:
-                        logger.error(f"Erreur lors de la traduction de la partie {j+1} du segment {i} : {str(e)}")
-                        translated_parts.append(part)
-                
-                # Recombiner les parties traduites
-                translated_text = " ".join(translated_parts)
-                
-                # Génération audio pour ce segment
-                segment_audio_path = temp_dir / f'segment_tts_{i}.wav'
-                logger.info(f"Génération audio pour le segment {i}...")
-                tts_processor.generate_audio(translated_text, str(segment_audio_path))
-                
-                # Vérification que le fichier audio a été généré
-                if not segment_audio_path.exists():
-                    raise FileNotFoundError(f"Le fichier audio pour le segment {i} n'a pas été généré")
-                
-                logger.info(f"Audio généré pour le segment {i} : {segment_audio_path}")
-                segments_audio.append((seg["start"], seg["end"], str(segment_audio_path)))
-                
-            except Exception as e:
-                logger.error(f"Erreur lors du traitement du segment {i} : {str(e)}")
-                continue
-        
-        if not segments_audio:
-            raise ValueError("Aucun segment audio n'a été généré")
-        
-        # Synchronisation de l'audio
-        logger.info("Début de la synchronisation de l'audio...")
-        synced_audio_path = output_dir / 'synced_audio.wav'
-        
-        try:
-            # Créer un fichier audio silencieux de la même durée que l'original
-            logger.info("Création du fichier audio silencieux...")
-            original_duration = float(subprocess.check_output([
-                'ffprobe', '-v', 'error', '-show_entries', 'format=duration',
-                '-of', 'default=noprint_wrappers=1:nokey=1', str(original_audio_path)
-            ]).decode().strip())
-            
-            silent_audio = temp_dir / 'silent.wav'
-            subprocess.run([
-                'ffmpeg', '-f', 'lavfi', '-i', f'anullsrc=r=16000:cl=mono',
-                '-t', str(original_duration), '-y', str(silent_audio)
-            ], check=True)
-            logger.info("Fichier audio silencieux créé")
-            
-            # Créer un fichier temporaire pour l'audio original
-            logger.info("Préparation de l'audio original...")
-            original_audio_temp = temp_dir / 'original_temp.wav'
-            subprocess.run([
-                'ffmpeg', '-i', str(original_audio_path),
-                '-acodec', 'pcm_s16le',
-                '-ar', '16000',
-                '-ac', '1',
-                '-y', str(original_audio_temp)
-            ], check=True)
-            logger.info("Audio original préparé")
-            
-            # Liste pour stocker les segments
-            segments = []
-            
-            # Ajouter les segments TTS
-            logger.info("Préparation des segments TTS...")
-            for start, end, audio_path in segments_audio:
-                try:
-                    segment_path = temp_dir / f'segment_{start}_{end}.wav'
-                    logger.info(f"Conversion du segment {start}-{end}...")
-                    subprocess.run([
-                        'ffmpeg', '-i', audio_path,
-                        '-acodec', 'pcm_s16le',
-                        '-ar', '16000',
-                        '-ac', '1',
-                        '-y', str(segment_path)
-                    ], check=True)
-                    segments.append((start, str(segment_path)))
-                    logger.info(f"Segment {start}-{end} préparé")
-                except Exception as e:
-                    logger.error(f"Erreur lors de la préparation du segment {start}-{end} : {str(e)}")
-                    continue
-            
-            # Ajouter les segments non vocaux de l'audio original
-            logger.info("Préparation des segments non vocaux...")
-            for seg in transcription.timestamps:
-                if is_non_vocal_segment(seg["text"]):
-                    try:
-                        segment_path = temp_dir / f'segment_orig_{seg["start"]}_{seg["end"]}.wav'
-                        logger.info(f"Extraction du segment original {seg['start']}-{seg['end']}...")
-                        subprocess.run([
-                            'ffmpeg', '-i', str(original_audio_temp),
-                            '-ss', str(seg["start"]),
-                            '-t', str(seg["end"] - seg["start"]),
-                            '-y', str(segment_path)
-                        ], check=True)
-                        segments.append((seg["start"], str(segment_path)))
-                        logger.info(f"Segment original {seg['start']}-{seg['end']} extrait")
-                    except Exception as e:
-                        logger.error(f"Erreur lors de l'extraction du segment original {seg['start']}-{seg['end']} : {str(e)}")
-                        continue
-            
-            if not segments:
-                raise ValueError("Aucun segment n'a été préparé pour la concaténation")
-            
-            # Trier les segments par ordre chronologique
-            segments.sort(key=lambda x: x[0])
-            
-            # Créer le fichier de concaténation
-            logger.info("Création du fichier de concaténation...")
-            concat_file = temp_dir / 'concat.txt'
-            with open(concat_file, 'w') as f:
-                for _, segment_path in segments:
-                    f.write(f"file '{os.path.abspath(segment_path)}'\n")
+                transcription, segments_audio = stream_segments(
+                    transcription_processor, audio, translation_processor, tts_processor, language_temp_dir
+                )
+            finally:
+                tts_processor.close()
+            logger.info("Transcription terminée")
+            synced_audio_path = output_dir / f'synced_audio_{language}.wav'
+            sync_segments_audio(audio, segments_audio, synced_audio_path, config['tts'], config.get('mix'))
+            dubbed_audio = {language: synced_audio_path}
+        else:
+            # Transcription unique, partagée par toutes les langues cibles
+            if transcription is None:
+                logger.info("Début de la transcription...")
+                transcription = transcription_processor.transcribe(audio)
+                logger.info("Transcription terminée")
             
-            # Concaténer tous les segments
-            logger.info("Concaténation des segments...")
-            subprocess.run([
-                'ffmpeg', '-f', 'concat', '-safe', '0',
-                '-i', str(concat_file),
-                '-y', str(synced_audio_path)
-            ], check=True)
-            logger.info("Segments concaténés avec succès")
+            # Vérification des timestamps
+            if len(transcription.timeline) == 0:
+                raise ValueError("Aucun timestamp n'a été généré lors de la transcription")
             
-        except Exception as e:
-            logger.error(f"Erreur lors de la synchronisation audio : {str(e)}")
-            raise
+            # Doublage des langues cibles en parallèle, les cœurs étant répartis entre elles
+            jobs = max(1, min(len(targets), args.jobs))
+            threads = max(1, (os.cpu_count() or 1) // jobs)
+            if jobs > 1:
+                torch.set_num_threads(threads)
+            logger.info(f"Doublage en {len(targets)} langue(s) : {', '.join(targets)} "
+                        f"({jobs} en parallèle, {threads} threads chacune)")
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                futures = {
+                    language: executor.submit(
+                        dub_language, language, transcription, audio,
+                        config, memory, tts_cache, output_dir, temp_dir, threads if jobs > 1 else None
+                    )
+                    for language in targets
+                }
+                dubbed_audio = {language: future.result() for language, future in futures.items()}
         
         # Combinaison vidéo + audio
         logger.info("Début de la combinaison vidéo + audio...")
-        output_video = output_dir / f"{video_path.stem}_traduit.mp4"
-        combine_video_audio(str(video_path), str(synced_audio_path), str(output_video))
-        logger.info("Vidéo finale générée")
-        
-        # Nettoyage des fichiers temporaires
-        try:
-            os.remove(silent_audio)
-            os.remove(original_audio_temp)
-            os.remove(concat_file)
-            for _, segment_path in segments:
-                os.remove(segment_path)
-            for _, _, audio_path in segments_audio:
-                os.remove(audio_path)
-        except Exception as e:
-            logger.warning(f"Impossible de supprimer un fichier temporaire: {e}")
+        if args.multitrack:
+            output_videos = [output_dir / f"{video_path.stem}_traduit.mkv"]
+            combine_video_tracks(str(video_path), dubbed_audio, str(output_videos[0]))
+        else:
+            output_videos = []
+            for language, synced_audio_path in dubbed_audio.items():
+                suffix = "" if len(targets) == 1 else f"_{language}"
+                output_video = output_dir / f"{video_path.stem}_traduit{suffix}.mp4"
+                combine_video_audio(str(video_path), str(synced_audio_path), str(output_video))
+                output_videos.append(output_video)
         
+        registry.log_stats()
+        if memory is not None:
+            memory.log_stats()
+        if tts_cache is not None:
+            tts_cache.log_stats()
         logger.info("Traitement terminé avec succès!")
-        logger.info(f"Vidéo finale générée : {output_video}")
+        for output_video in output_videos:
+            logger.info(f"Vidéo finale générée : {output_video}")
         
     except Exception as e:
         logger.error(f"Une erreur est survenue : {str(e)}")
         raise
+    finally:
+        # Traducteur du mode flux (ceux de dub_language sont fermés par leur thread)
+        close_translator(translation_processor)
+        if memory is not None:
+            memory.close()
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import time
+import logging
+import argparse
+import queue
+import resource
+import multiprocessing
+
+import numpy as np
+import yaml
+
+# Ajout du répertoire src au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.processors.translation_backends import ENGINES, create_translator
+
+# Configuration du logging
+logging.basicConfig(
+    level=logging.WARNING,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def _peak_rss_mb() -> float:
+    """Pic de mémoire résidente du processus courant (ru_maxrss est en Ko sous Linux)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def _run_engine(translation_cfg: dict, sentences: list, latency_samples: int, results):
+    """Mesure un moteur dans un processus dédié, pour que le pic de mémoire lui soit propre"""
+    try:
+        start = time.perf_counter()
+        translator = create_translator(translation_cfg)
+        load_time = time.perf_counter() - start
+
+        # Latence : une phrase par appel
+        latencies = []
+        for sentence in sentences[:latency_samples]:
+            start = time.perf_counter()
+            translator.translate(sentence)
+            latencies.append(time.perf_counter() - start)
+
+        # Débit : tout le corpus en appels groupés
+        start = time.perf_counter()
+        translator.translate_batch(sentences)
+        batch_time = time.perf_counter() - start
+
+        results.put({
+            "load_s": load_time,
+            "sentences_per_s": len(sentences) / batch_time,
+            "p50_ms": float(np.percentile(latencies, 50)) * 1000,
+            "p95_ms": float(np.percentile(latencies, 95)) * 1000,
+            "peak_rss_mb": _peak_rss_mb()
+        })
+    except Exception as e:
+        results.put({"error": str(e)})
+
+def benchmark_translation(corpus_path: str, config_path: str, engines: list, latency_samples: int = 50,
+                          timeout: float = 1800):
+    """
+    Compare les moteurs de traduction sur un corpus local (une phrase par ligne).
+
+    Args:
+        corpus_path (str): Fichier texte du corpus de test
+        config_path (str): Configuration dont la section `translation` sert de base
+        engines (list): Moteurs à comparer (argos, mbart, nllb)
+        latency_samples (int): Nombre de phrases traduites une à une pour la latence
+        timeout (float): Durée maximale de la mesure d'un moteur, en secondes
+    """
+    with open(corpus_path, 'r', encoding='utf-8') as f:
+        sentences = [line.strip() for line in f if line.strip()]
+    with open(config_path, 'r') as f:
+        base_cfg = yaml.safe_load(f).get('translation', {})
+
+    print(f"Corpus : {len(sentences)} phrases, {base_cfg.get('source_lang', 'en')} -> {base_cfg.get('target_lang', 'fr')}")
+    print(f"{'moteur':<10} {'chargement (s)':>15} {'phrases/s':>10} {'p50 (ms)':>9} {'p95 (ms)':>9} {'pic RSS (Mo)':>13}")
+    context = multiprocessing.get_context("spawn")
+    for engine in engines:
+        translation_cfg = dict(base_cfg, engine=engine)
+        results = context.Queue()
+        process = context.Process(target=_run_engine, args=(translation_cfg, sentences, latency_samples, results))
+        process.start()
+        try:
+            result = results.get(timeout=timeout)
+        except queue.Empty:
+            # Processus bloqué ou mort sans résultat (ex. tué faute de mémoire)
+            process.terminate()
+            result = {"error": f"aucun résultat après {timeout:.0f}s"}
+        process.join()
+        if "error" in result:
+            print(f"{engine:<10} erreur : {result['error']}")
+            continue
+        print(f"{engine:<10} {result['load_s']:>15.1f} {result['sentences_per_s']:>10.2f} "
+              f"{result['p50_ms']:>9.0f} {result['p95_ms']:>9.0f} {result['peak_rss_mb']:>13.0f}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Mesure du débit et de la latence des moteurs de traduction')
+    parser.add_argument('corpus_path', help='Fichier texte du corpus (une phrase par ligne)')
+    parser.add_argument('--config', default='config.yaml', help='Chemin vers le fichier de configuration')
+    parser.add_argument('--engines', default=','.join(ENGINES), help='Moteurs à comparer')
+    parser.add_argument('--latency-samples', type=int, default=50, help='Phrases traduites une à une pour la latence')
+    parser.add_argument('--timeout', type=float, default=1800, help='Durée maximale de la mesure d\'un moteur (s)')
+    args = parser.parse_args()
+
+    benchmark_translation(args.corpus_path, args.config, args.engines.split(','), args.latency_samples, args.timeout)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import time
+import logging
+import argparse
+
+# Ajout du répertoire src au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.processors.whisper_processor import WhisperProcessor
+from src.utils.audio_buffer import AudioBuffer
+
+# Configuration du logging
+logging.basicConfig(
+    level=logging.WARNING,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def benchmark_whisper(video_path: str, model_name: str, batch_sizes: list, language: str = None):
+    """
+    Compare le débit de la transcription standard et du décodage par lots.
+
+    Args:
+        video_path (str): Chemin vers le fichier audio ou vidéo de test
+        model_name (str): Nom du modèle Whisper
+        batch_sizes (list): Tailles de lot à mesurer (1 = transcription standard)
+        language (str): Langue imposée (détectée une fois si None)
+    """
+    audio = AudioBuffer.from_file(video_path)
+    processor = WhisperProcessor(model_name)
+    language = processor.detect_language(audio, language)
+
+    print(f"Audio : {audio.duration:.1f}s, modèle {model_name}, langue {language}")
+    print(f"{'mode':<12} {'temps (s)':>10} {'x temps réel':>13} {'segments':>9}")
+    for batch_size in batch_sizes:
+        start = time.perf_counter()
+        if batch_size == 1:
+            result = processor.transcribe(audio, language)
+        else:
+            result = processor.transcribe_batched(audio, language, batch_size=batch_size)
+        elapsed = time.perf_counter() - start
+        mode = "standard" if batch_size == 1 else f"lot={batch_size}"
+        print(f"{mode:<12} {elapsed:>10.2f} {audio.duration / elapsed:>13.2f} {len(result.timeline):>9}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Mesure du débit de transcription Whisper')
+    parser.add_argument('video_path', help='Chemin vers le fichier audio ou vidéo de test')
+    parser.add_argument('--model', default='base', help='Modèle Whisper')
+    parser.add_argument('--batch-sizes', default='1,2,4,8', help='Tailles de lot à comparer')
+    parser.add_argument('--language', default=None, help='Langue imposée')
+    args = parser.parse_args()
+
+    batch_sizes = [int(size) for size in args.batch_sizes.split(',')]
+    benchmark_whisper(args.video_path, args.model, batch_sizes, args.language)
+
+if __name__ == "__main__":
+    main()
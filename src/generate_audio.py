@@ -4,10 +4,15 @@
 import argparse
 import logging
 import os
+import sys
 import json
 from pathlib import Path
 import yaml
-from processors.audio_generator import AudioGenerator
+
+# Ajout de la racine du projet au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.processors.audio_generator import AudioGenerator
 
 # Configuration du logging
 logging.basicConfig(
@@ -9,6 +9,7 @@ import tempfile
 from pathlib import Path
 
 from src.utils.config import load_config
+from src.utils.model_registry import get_registry
 from src.processors.s3_handler import S3Handler
 from src.processors.audio_extractor import AudioExtractor
 from src.processors.whisper_processor import WhisperProcessor
@@ -29,15 +30,11 @@ def process_video(
 ) -> dict:
     """Traite une vidéo et génère les résultats"""
     try:
-        # Extraction de l'audio
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as audio_file:
-            audio_extractor.extract_audio(video_path, audio_file.name)
-            
-            # Transcription
-            transcription = whisper_processor.transcribe(audio_file.name)
-            
-            # Nettoyage du fichier audio temporaire
-            os.unlink(audio_file.name)
+        # Extraction de l'audio (décodage unique en mémoire, sans WAV intermédiaire)
+        audio = audio_extractor.load_audio(video_path)
+        
+        # Transcription
+        transcription = whisper_processor.transcribe(audio)
         
         # Génération des résumés
         summaries = summary_generator.generate_summaries(transcription.text)
@@ -72,10 +69,11 @@ def main():
     try:
         # Chargement de la configuration
         config = load_config(args.config)
+        registry = get_registry(config.get('models', {}).get('memory_budget_mb'))
         
         # Initialisation des composants
         s3_handler = S3Handler(config['s3'])
-        whisper_processor = WhisperProcessor(config['whisper']['model_name'])
+        whisper_processor = WhisperProcessor.from_config(config['whisper'])
         summary_generator = SummaryGenerator()
         audio_extractor = AudioExtractor()
         
@@ -108,6 +106,8 @@ def main():
                 os.unlink(temp_file.name)
                 
             logger.info(f"Traitement terminé pour {video_key}")
+        
+        registry.log_stats()
             
     except Exception as e:
         logger.error(f"Erreur lors de l'exécution: {e}")
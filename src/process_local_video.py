@@ -17,8 +17,11 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src.processors.audio_extractor import AudioExtractor
 from src.processors.whisper_processor import WhisperProcessor
 from src.processors.summary_generator import SummaryGenerator
-from src.processors.translator import Translator
+from src.processors.translation_backends import create_translator
 from src.utils.config import load_config
+from src.utils.model_registry import get_registry
+from src.utils.transcription_cache import TranscriptionCache
+from src.utils.translation_memory import TranslationMemory
 
 # Configuration du logging
 logging.basicConfig(
@@ -27,7 +30,7 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def process_local_video(video_path: str, config_path: str, output_dir: str):
+def process_local_video(video_path: str, config_path: str, output_dir: str, use_cache: bool = True):
     """
     Traite une vidéo locale en extrayant l'audio, en le transcrivant et en générant des résumés.
     
@@ -35,11 +38,15 @@ def process_local_video(video_path: str, config_path: str, output_dir: str):
         video_path (str): Chemin vers le fichier vidéo
         config_path (str): Chemin vers le fichier de configuration
         output_dir (str): Répertoire de sortie pour les résultats
+        use_cache (bool): Réutiliser les transcriptions en cache et la mémoire de traduction
     """
+    memory = None
+    translator = None
     try:
         # Chargement de la configuration
         with open(config_path, 'r') as f:
             config = yaml.safe_load(f)
+        registry = get_registry(config.get('models', {}).get('memory_budget_mb'))
             
         # Création des répertoires de sortie
         output_dir = Path(output_dir)
@@ -50,35 +57,35 @@ def process_local_video(video_path: str, config_path: str, output_dir: str):
         # Initialisation des processeurs
         logger.info("Initialisation des processeurs...")
         audio_extractor = AudioExtractor()
-        whisper_processor = WhisperProcessor(config['whisper']['model'])
-        translator = Translator(config['translation']['model'])
+        cache = TranscriptionCache.from_config(config.get('cache', {})) if use_cache else None
+        whisper_processor = WhisperProcessor.from_config(config['whisper'], cache=cache)
+        memory = TranslationMemory.from_config(config.get('translation_memory', {})) if use_cache else None
+        # mBART par défaut, comme avant le choix du moteur dans la configuration
+        translator = create_translator(dict({'engine': 'mbart'}, **config['translation']), memory=memory)
         
-        # Extraction de l'audio
+        # Extraction de l'audio (décodage unique en mémoire)
         logger.info("Extraction de l'audio...")
-        audio_path = temp_dir / f"{Path(video_path).stem}.wav"
-        audio_extractor.extract_audio(video_path, str(audio_path))
+        audio = audio_extractor.load_audio(video_path)
         
         # Transcription avec Whisper
         logger.info("Transcription avec Whisper...")
         with tqdm(total=100, desc="Transcription", unit="%") as pbar:
-            transcription = whisper_processor.transcribe(str(audio_path))
+            transcription = whisper_processor.transcribe(audio)
             pbar.update(100)
         
-        # Traduction du texte
+        # Traduction des segments par lots ; le texte complet est reconstitué à partir des segments
         if config['whisper']['translate']:
-            logger.info("Traduction du texte...")
-            translated_text = translator.translate(transcription.text)
-            
-            # Traduction des segments individuels
             logger.info("Traduction des segments...")
+            segments = transcription.segments
+            translations = translator.translate_batch([segment['text'] for segment in segments])
             translated_segments = []
-            for segment in transcription.segments:
-                translated_segment = translator.translate(segment['text'])
+            for segment, translated_segment in zip(segments, translations):
                 # Conserver tous les éléments existants et ajouter les textes traduits
                 segment_copy = segment.copy()
                 segment_copy['text_original'] = segment['text']
                 segment_copy['text_translated'] = translated_segment
                 translated_segments.append(segment_copy)
+            translated_text = " ".join(t.strip() for t in translations if t and t.strip())
             
             # Création d'un dictionnaire avec les résultats
             result = {
@@ -109,24 +116,30 @@ def process_local_video(video_path: str, config_path: str, output_dir: str):
             json.dump(result, f, ensure_ascii=False, indent=2)
             
         logger.info(f"Résultats sauvegardés dans {output_file}")
-        
-        # Nettoyage des fichiers temporaires
-        if audio_path.exists():
-            audio_path.unlink()
+        registry.log_stats()
+        if memory is not None:
+            memory.log_stats()
             
     except Exception as e:
         logger.error(f"Erreur lors du traitement de la vidéo : {str(e)}")
         raise
+    finally:
+        # Processus de traduction (TranslationPool) et connexion SQLite de la mémoire
+        if getattr(translator, 'close', None) is not None:
+            translator.close()
+        if memory is not None:
+            memory.close()
 
 def main():
     parser = argparse.ArgumentParser(description='Traitement de vidéo locale avec Whisper')
     parser.add_argument('video_path', help='Chemin vers le fichier vidéo')
     parser.add_argument('--config', default='config.yaml', help='Chemin vers le fichier de configuration')
     parser.add_argument('--output', default='./output', help='Répertoire de sortie')
+    parser.add_argument('--no-cache', action='store_true', help='Ne pas utiliser le cache des transcriptions ni la mémoire de traduction')
     
     args = parser.parse_args()
     
-    process_local_video(args.video_path, args.config, args.output)
+    process_local_video(args.video_path, args.config, args.output, use_cache=not args.no_cache)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -5,7 +5,9 @@ import os
 import time
 from typing import Optional, List
 import gc
-import re
+from src.utils.model_registry import get_registry
+from src.utils.text_segmenter import TextSegmenter, count_words
+from src.utils.translation_memory import TranslationMemory
 
 logger = logging.getLogger(__name__)
 
@@ -14,13 +16,17 @@ class TranslationError(Exception):
     pass
 
 class ArgosTranslator:
-    def __init__(self, from_code="en", to_code="fr", max_retries=3, timeout=30, max_chunk_size=100):
+    engine_name = "argos"
+
+    def __init__(self, from_code="en", to_code="fr", max_retries=3, timeout=30, max_chunk_tokens=96,
+                 memory: Optional[TranslationMemory] = None):
         self.from_code = from_code
         self.to_code = to_code
         self.max_retries = max_retries
         self.timeout = timeout
-        self.max_chunk_size = max_chunk_size
-        self.translation = None
+        self.max_chunk_tokens = max_chunk_tokens
+        self.memory = memory
+        self._segmenter = None
         self._ensure_installed()
         self._load_languages()
 
@@ -48,20 +54,42 @@ class ArgosTranslator:
         """Charge les langues pour la traduction."""
         try:
             logger.info("Chargement des langues pour la traduction...")
-            installed_languages = argostranslate.translate.get_installed_languages()
-            self.from_lang = next(lang for lang in installed_languages if lang.code == self.from_code)
-            self.to_lang = next(lang for lang in installed_languages if lang.code == self.to_code)
-            self.translation = self.from_lang.get_translation(self.to_lang)
+            self.translation  # Chargement immédiat
             logger.info("Langues chargées avec succès")
         except Exception as e:
             logger.error(f"Erreur lors du chargement des langues : {str(e)}")
             raise TranslationError(f"Erreur lors du chargement des langues : {str(e)}")
 
+    @property
+    def translation(self):
+        """
+        Traduction Argos demandée au registre à chaque usage : le traducteur n'en garde
+        aucune référence, pour qu'une éviction libère réellement sa mémoire.
+        """
+        return get_registry().get("argos", self._model_name, self._load_translation)
+
+    @property
+    def _model_name(self) -> str:
+        return f"{self.from_code}-{self.to_code}"
+
+    @property
+    def memory_key(self) -> tuple:
+        """(moteur, modèle, langue source, langue cible) identifiant les traductions en mémoire"""
+        return (self.engine_name, self._model_name, self.from_code, self.to_code)
+
+    def _load_translation(self):
+        """Charge la traduction Argos entre les deux langues"""
+        installed_languages = argostranslate.translate.get_installed_languages()
+        from_lang = next(lang for lang in installed_languages if lang.code == self.from_code)
+        to_lang = next(lang for lang in installed_languages if lang.code == self.to_code)
+        return from_lang.get_translation(to_lang)
+
     def reset(self):
         """Réinitialise le traducteur."""
         try:
             logger.info("Réinitialisation du traducteur...")
-            self.translation = None
+            self._segmenter = None
+            get_registry().evict(("argos", self._model_name, "cpu", None))
             gc.collect()  # Force le nettoyage de la mémoire
             self._load_languages()
             logger.info("Traducteur réinitialisé avec succès")
@@ -69,44 +97,15 @@ class ArgosTranslator:
             logger.error(f"Erreur lors de la réinitialisation du traducteur : {str(e)}")
             raise TranslationError(f"Erreur lors de la réinitialisation du traducteur : {str(e)}")
 
-    def _split_text(self, text: str) -> List[str]:
-        """
-        Divise le texte en morceaux plus petits en respectant la ponctuation.
-        
-        Args:
-            text (str): Le texte à diviser
-            
-        Returns:
-            List[str]: Liste des morceaux de texte
-        """
-        if len(text) <= self.max_chunk_size:
-            return [text]
-
-        # Points de séparation possibles
-        separators = ['. ', '? ', '! ', '; ', ', ']
-        chunks = []
-        current_chunk = ""
-        
-        # Diviser le texte en phrases
-        sentences = re.split(r'([.!?;]\s+)', text)
-        
-        for i in range(0, len(sentences), 2):
-            sentence = sentences[i]
-            if i + 1 < len(sentences):
-                sentence += sentences[i + 1]  # Ajouter le séparateur
-            
-            if len(current_chunk) + len(sentence) <= self.max_chunk_size:
-                current_chunk += sentence
+    def _get_segmenter(self) -> TextSegmenter:
+        """Découpeur en morceaux d'au plus `max_chunk_tokens` jetons du modèle (en mots à défaut de tokenizer)"""
+        if self._segmenter is None:
+            if self._get_batch_engine() is not None:
+                counter = lambda texts: [len(self._get_batch_engine()[1](text)) for text in texts]
             else:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                current_chunk = sentence
-        
-        if current_chunk:
-            chunks.append(current_chunk.strip())
-        
-        logger.info(f"Texte divisé en {len(chunks)} morceaux")
-        return chunks
+                counter = count_words
+            self._segmenter = TextSegmenter(self.max_chunk_tokens, counter)
+        return self._segmenter
 
     def translate(self, text: str) -> Optional[str]:
         """
@@ -125,8 +124,21 @@ class ArgosTranslator:
             logger.warning("Texte vide reçu pour la traduction")
             return text
 
+        if self.memory is not None:
+            cached = self.memory.lookup(*self.memory_key, text)
+            if cached is not None:
+                logger.info(f"Traduction trouvée en mémoire : {text[:50]}...")
+                return cached
+
+        final_translation = self._translate_text(text)
+        if self.memory is not None:
+            self.memory.store(*self.memory_key, text, final_translation)
+        return final_translation
+
+    def _translate_text(self, text: str) -> str:
+        """Traduit un texte morceau par morceau, avec nouvelles tentatives, sans mémoire de traduction"""
         # Diviser le texte en morceaux plus petits si nécessaire
-        chunks = self._split_text(text)
+        chunks = [piece.text for piece in self._get_segmenter().split(text)]
         if len(chunks) > 1:
             logger.info(f"Texte trop long ({len(text)} caractères), divisé en {len(chunks)} morceaux")
         
@@ -169,4 +181,106 @@ class ArgosTranslator:
         # Recombiner les morceaux traduits
         final_translation = " ".join(translated_chunks)
         logger.info(f"Traduction complète réussie : {text[:50]}... -> {final_translation[:50]}...")
-        return final_translation 
\ No newline at end of file
+        return final_translation
+
+    def _get_batch_engine(self):
+        """
+        Accède au traducteur CTranslate2 et au tokenizer du paquet Argos, pour traduire par lots.
+        
+        Returns:
+            Optional[tuple]: (traducteur, encodage, décodage, préfixe cible), ou None si la
+                traduction n'est pas un paquet direct (pivot par une autre langue, identité)
+        """
+        # CachedTranslation enveloppe la traduction réelle du paquet
+        translation = self.translation
+        translation = getattr(translation, 'underlying', translation)
+        # Mémorisé sur la traduction elle-même, pour être libéré avec elle en cas d'éviction
+        engine = getattr(translation, '_batch_engine', None)
+        if engine is not None:
+            return engine
+        pkg = getattr(translation, 'pkg', None)
+        if pkg is None:
+            logger.info("Traduction Argos composite : pas de traduction par lots directe")
+            return None
+        
+        if getattr(translation, 'translator', None) is None:
+            import ctranslate2
+            from argostranslate import settings
+            translation.translator = ctranslate2.Translator(str(pkg.package_path / "model"), device=settings.device)
+        
+        tokenizer = getattr(pkg, 'tokenizer', None)
+        if tokenizer is not None:
+            encode, decode = tokenizer.encode, tokenizer.decode
+        else:
+            import sentencepiece
+            sp = sentencepiece.SentencePieceProcessor(model_file=str(pkg.package_path / "sentencepiece.model"))
+            encode = lambda text: sp.encode(text, out_type=str)
+            decode = sp.decode
+        
+        translation._batch_engine = (translation.translator, encode, decode, getattr(pkg, 'target_prefix', '') or '')
+        return translation._batch_engine
+
+    def translate_batch(self, texts: List[str], max_batch_size: int = 32) -> List[str]:
+        """
+        Traduit une liste de textes en quelques appels groupés au modèle CTranslate2.
+        
+        Les textes sont découpés en morceaux, triés par longueur en jetons pour limiter
+        le remplissage, traduits par lots puis réassemblés dans l'ordre d'entrée.
+        
+        Args:
+            texts (List[str]): Les textes à traduire
+            max_batch_size (int): Nombre maximal de morceaux par appel au modèle
+            
+        Returns:
+            List[str]: Les traductions, dans l'ordre des textes d'entrée
+            
+        Raises:
+            TranslationError: Si la traduction groupée échoue
+        """
+        if self.memory is None:
+            return self._translate_batch(texts, max_batch_size)
+        # Seuls les textes absents de la mémoire de traduction sont envoyés au modèle
+        return self.memory.translate_batch(
+            *self.memory_key, texts, lambda missing: self._translate_batch(missing, max_batch_size)
+        )
+
+    def _translate_batch(self, texts: List[str], max_batch_size: int) -> List[str]:
+        """Traduction groupée sans mémoire de traduction"""
+        engine = self._get_batch_engine()
+        if engine is None:
+            return [self._translate_text(text) if text and text.strip() else text for text in texts]
+        translator, encode, decode, target_prefix = engine
+        
+        # Morceaux de tous les textes, avec l'indice du texte d'origine
+        pieces = self._get_segmenter().split_many(texts)
+        if not pieces:
+            return list(texts)
+        chunks = [piece.text for piece in pieces]
+        
+        tokenized = [encode(chunk) for chunk in chunks]
+        order = sorted(range(len(chunks)), key=lambda k: len(tokenized[k]))
+        translated_chunks = [None] * len(chunks)
+        
+        start_time = time.time()
+        try:
+            for batch_start in range(0, len(order), max_batch_size):
+                batch = order[batch_start:batch_start + max_batch_size]
+                results = translator.translate_batch(
+                    [tokenized[k] for k in batch],
+                    target_prefix=[[target_prefix]] * len(batch) if target_prefix else None,
+                    replace_unknowns=True,
+                    beam_size=4,
+                    length_penalty=0.2
+                )
+                for k, result in zip(batch, results):
+                    tokens = result.hypotheses[0]
+                    if target_prefix:
+                        tokens = tokens[1:]
+                    translated_chunks[k] = decode(tokens)
+        except Exception as e:
+            logger.error(f"Erreur lors de la traduction par lots : {str(e)}")
+            raise TranslationError(f"Erreur lors de la traduction par lots : {str(e)}")
+        
+        logger.info(f"{len(texts)} textes ({len(chunks)} morceaux) traduits par lots "
+                    f"en {time.time() - start_time:.2f}s")
+        return TextSegmenter.join(texts, pieces, translated_chunks)
@@ -1,5 +1,6 @@
 import logging
 import ffmpeg
+from src.utils.audio_buffer import AudioBuffer
 
 logger = logging.getLogger(__name__)
 
@@ -8,6 +9,10 @@ class AudioExtractor:
     def __init__(self):
         self.sample_rate = 16000  # Taux d'échantillonnage standard pour Whisper
 
+    def load_audio(self, video_path: str) -> AudioBuffer:
+        """Décode l'audio d'une vidéo en mémoire, une seule fois, pour toutes les étapes suivantes"""
+        return AudioBuffer.from_file(video_path, self.sample_rate)
+
     def extract_audio(self, video_path: str, output_path: str) -> None:
         """Extrait l'audio d'une vidéo en WAV"""
         try:
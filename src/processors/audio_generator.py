@@ -5,19 +5,23 @@ from pathlib import Path
 from datetime import datetime
 import soundfile as sf
 import tempfile
-import os
-from pydub import AudioSegment
-from pydub.effects import speedup
 from .tts_processor import TTSProcessor
+from src.utils.tts_cache import TTSCache
+from src.utils.audio_mixer import TimelineMixer, resample
+from src.utils.time_stretch import fit_clip, log_stretch_report
 
 logger = logging.getLogger(__name__)
 
 class AudioGenerator:
     """Générateur de fichier audio à partir d'une transcription"""
     
-    def __init__(self, config: dict, sample_rate=16000):
+    def __init__(self, config: dict, sample_rate=16000, use_cache: bool = True):
         self.sample_rate = sample_rate
-        self.tts_processor = TTSProcessor(config.get('tts', {}))
+        cache = TTSCache.from_config(config.get('cache', {})) if use_cache else None
+        self.tts_processor = TTSProcessor(config.get('tts', {}), cache=cache)
+        # Bornes du facteur de vitesse pour caler les clips sur les timestamps
+        self.min_speed = config.get('tts', {}).get('min_speed', 0.8)
+        self.max_speed = config.get('tts', {}).get('max_speed', 1.5)
         
     def generate_audio(self, json_path: str, output_path: str, language: str = "fr") -> None:
         """
@@ -41,7 +45,7 @@ class AudioGenerator:
                 full_text += text + " "
             
             # Génération de la synthèse vocale avec le texte complet
-            self.tts_processor.generate_speech(full_text.strip(), language, output_path)
+            self.tts_processor.generate_audio(full_text.strip(), output_path)
             
             logger.info(f"Fichier audio généré avec succès : {output_path}")
             
@@ -64,72 +68,52 @@ class AudioGenerator:
             with open(json_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             
-            # Création d'un fichier audio temporaire pour chaque segment
-            temp_files = []
-            for segment in data['segments']:
-                # Utilisation du texte traduit si disponible, sinon le texte original
-                text = segment.get('text_translated', segment.get('text_original', segment['text']))
-                
-                # Génération de la synthèse vocale
-                temp_file = self.tts_processor.generate_speech(text, language)
-                temp_files.append((temp_file, segment['start'], segment['end']))
+            segments = data['segments']
             
-            # Création d'un fichier audio vide de la durée totale
-            total_duration = max(segment['end'] for segment in data['segments'])
-            combined = AudioSegment.silent(duration=int(total_duration * 1000))  # Conversion en millisecondes
+            # Tampon préalloué de la durée totale, dans lequel chaque segment est ajouté en place
+            total_duration = max(segment['end'] for segment in segments)
+            mixer = TimelineMixer.silent(total_duration, self.sample_rate)
             
             # Paramètres pour le fondu enchaîné
-            fade_duration = 100  # 100ms de fondu
+            fade_duration = 0.1  # 100ms de fondu
             
             # Insertion des segments aux bons timestamps
-            for i, (temp_file, start, end) in enumerate(temp_files):
-                segment_audio = AudioSegment.from_wav(temp_file)
-                # Ajustement de la durée du segment
-                segment_duration = (end - start) * 1000  # Conversion en millisecondes
-                
-                if adjust_speed and len(segment_audio) > 0:
-                    # Calcul du facteur de vitesse pour correspondre à la durée cible
-                    speed_factor = len(segment_audio) / segment_duration
-                    
-                    # Limites de vitesse plus strictes
-                    min_speed = 0.8  # Ne pas ralentir plus que 20%
-                    max_speed = 1.2  # Ne pas accélérer plus que 20%
-                    
-                    if speed_factor > max_speed:
-                        # Si l'audio est trop long, on le coupe plutôt que de trop l'accélérer
-                        segment_audio = segment_audio[:int(segment_duration)]
-                    elif speed_factor < min_speed:
-                        # Si l'audio est trop court, on ajoute du silence
-                        silence = AudioSegment.silent(duration=int(segment_duration - len(segment_audio)))
-                        segment_audio += silence
-                    else:
-                        # Ajustement de vitesse dans les limites acceptables
-                        segment_audio = speedup(segment_audio, speed_factor)
-                
-                # Ajustement final de la durée avec une transition plus douce
-                if len(segment_audio) > segment_duration:
-                    # Au lieu de couper brutalement, on fait un fondu
-                    fade_out_duration = min(200, int(segment_duration * 0.1))  # 10% de la durée ou 200ms max
-                    segment_audio = segment_audio[:int(segment_duration)].fade_out(fade_out_duration)
-                elif len(segment_audio) < segment_duration:
-                    # Ajout d'un silence avec fondu
-                    silence = AudioSegment.silent(duration=int(segment_duration - len(segment_audio)))
-                    segment_audio = segment_audio.fade_out(100) + silence.fade_in(100)
+            stretch_results = []
+            for i, segment in enumerate(segments):
+                # Utilisation du texte traduit si disponible, sinon le texte original
+                text = segment.get('text_translated', segment.get('text_original', segment['text']))
                 
-                # Ajout des effets de fondu
-                if i > 0:  # Fondu en entrée pour tous les segments sauf le premier
-                    segment_audio = segment_audio.fade_in(fade_duration)
-                if i < len(temp_files) - 1:  # Fondu en sortie pour tous les segments sauf le dernier
-                    segment_audio = segment_audio.fade_out(fade_duration)
+                # Génération de la synthèse vocale en mémoire
+                samples, sample_rate = self.tts_processor.synthesize(text)
+                samples = resample(samples, sample_rate, self.sample_rate)
+                segment_duration = segment['end'] - segment['start']
                 
-                # Insertion du segment
-                combined = combined.overlay(segment_audio, position=int(start * 1000))
+                trimmed = False
+                if adjust_speed:
+                    # Étirement temporel sans changement de hauteur, facteur borné ; au-delà,
+                    # le clip est complété de silence ou tronqué avec un fondu
+                    samples, result = fit_clip(
+                        samples, self.sample_rate, segment_duration,
+                        min_speed=self.min_speed, max_speed=self.max_speed, index=i
+                    )
+                    stretch_results.append(result)
+                else:
+                    # Sans ajustement, le clip est coupé à la fin de son segment
+                    trimmed = len(samples) > segment_duration * self.sample_rate
+                    samples = samples[:int(segment_duration * self.sample_rate)]
                 
-                # Suppression du fichier temporaire
-                os.unlink(temp_file)
+                # Fondu en entrée pour tous les segments sauf le premier, en sortie pour tous
+                # sauf le dernier (et pour un clip coupé)
+                mixer.overlay(
+                    samples, segment['start'],
+                    fade_in=fade_duration if i > 0 else 0.0,
+                    fade_out=fade_duration if i < len(segments) - 1 or trimmed else 0.0
+                )
+            
+            log_stretch_report(stretch_results)
             
             # Export du fichier final
-            combined.export(output_path, format="wav")
+            mixer.write_wav(output_path)
             
             logger.info(f"Fichier audio généré avec succès : {output_path}")
             
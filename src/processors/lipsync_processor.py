@@ -5,6 +5,9 @@ from pathlib import Path
 import tempfile
 import cv2
 import numpy as np
+import soundfile as sf
+from src.utils.audio_buffer import SAMPLE_RATE
+from src.utils.audio_mixer import TimelineMixer, load_clip
 
 logger = logging.getLogger(__name__)
 
@@ -51,55 +54,26 @@ class LipsyncProcessor:
         out.release()
         
     def sync_audio_with_original(self, original_audio_path, new_audio_path, timestamps, output_path):
-        """Synchronise le nouvel audio avec l'original en utilisant les timestamps."""
-        # Créer un fichier audio silencieux de la même durée que l'original
-        original_duration = float(subprocess.check_output([
-            'ffprobe', '-v', 'error', '-show_entries', 'format=duration',
-            '-of', 'default=noprint_wrappers=1:nokey=1', original_audio_path
-        ]).decode().strip())
+        """
+        Synchronise le nouvel audio avec l'original en utilisant les timestamps.
         
-        # Créer un fichier audio silencieux
-        silent_audio = os.path.join(os.path.dirname(output_path), 'silent.wav')
-        subprocess.run([
-            'ffmpeg', '-f', 'lavfi', '-i', f'anullsrc=r=16000:cl=mono',
-            '-t', str(original_duration), '-y', silent_audio
-        ], check=True)
+        Les segments de parole du nouvel audio, mis bout à bout, sont écrits en mémoire à leur
+        timestamp sur un fond silencieux de la durée de l'original.
+        """
+        original_duration = sf.info(original_audio_path).duration
+        mixer = TimelineMixer.silent(original_duration, SAMPLE_RATE)
+        new_audio = load_clip(new_audio_path, SAMPLE_RATE)
         
         # Pour chaque segment de parole, insérer le nouvel audio aux bons timestamps
-        temp_segments = []
-        for i, (start, end) in enumerate(timestamps):
+        cursor = 0  # Position dans le nouvel audio
+        for start, end in timestamps:
             if end - start < 0.1:  # Ignorer les segments trop courts
                 continue
-                
-            # Extraire le segment correspondant du nouvel audio
-            segment_path = os.path.join(os.path.dirname(output_path), f'segment_{i}.wav')
-            subprocess.run([
-                'ffmpeg', '-i', new_audio_path,
-                '-ss', str(i * (end - start)),  # Prendre le segment correspondant du nouvel audio
-                '-t', str(end - start),
-                '-y', segment_path
-            ], check=True)
-            
-            # Insérer ce segment dans l'audio silencieux
-            temp_output = os.path.join(os.path.dirname(output_path), f'synced_{i}.wav')
-            subprocess.run([
-                'ffmpeg', '-i', silent_audio,
-                '-i', segment_path,
-                '-filter_complex', f'[0:a][1:a]amix=inputs=2:duration=first[aout]',
-                '-map', '[aout]',
-                '-y', temp_output
-            ], check=True)
-            
-            silent_audio = temp_output
-            temp_segments.append(temp_output)
-        
-        # Copier le résultat final
-        subprocess.run(['cp', silent_audio, output_path], check=True)
+            n_samples = int(round((end - start) * SAMPLE_RATE))
+            mixer.write(new_audio[cursor:cursor + n_samples], start)
+            cursor += n_samples
         
-        # Nettoyer les fichiers temporaires
-        for temp_file in temp_segments:
-            os.remove(temp_file)
-        os.remove(os.path.join(os.path.dirname(output_path), 'silent.wav'))
+        mixer.write_wav(output_path)
 
     def generate_lipsync(self, video_path: str, audio_path: str, output_path: str, timestamps: list = None) -> None:
         """
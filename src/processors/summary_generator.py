@@ -1,25 +1,36 @@
 import logging
 from transformers import pipeline
 from src.utils.types import SummaryResult
+from src.utils.model_registry import get_registry
 
 logger = logging.getLogger(__name__)
 
 class SummaryGenerator:
     """Générateur de résumés"""
-    def __init__(self):
-        self.summarizer = pipeline("summarization", model="facebook/bart-large-cnn")
+    def __init__(self, model_name: str = "facebook/bart-large-cnn"):
+        self.model_name = model_name
+        self.summarizer  # Chargement immédiat
+
+    @property
+    def summarizer(self):
+        """Pipeline demandé au registre à chaque usage (aucune référence gardée entre deux appels)"""
+        return get_registry().get(
+            "summarization", self.model_name,
+            lambda: pipeline("summarization", model=self.model_name)
+        )
 
     def generate_summaries(self, text: str) -> SummaryResult:
         """Génère trois résumés de différentes longueurs"""
         try:
+            summarizer = self.summarizer
             # Résumé court (100 mots)
-            short_summary = self.summarizer(text, max_length=100, min_length=50, do_sample=False)[0]['summary_text']
+            short_summary = summarizer(text, max_length=100, min_length=50, do_sample=False)[0]['summary_text']
             
             # Résumé moyen (200 mots)
-            medium_summary = self.summarizer(text, max_length=200, min_length=100, do_sample=False)[0]['summary_text']
+            medium_summary = summarizer(text, max_length=200, min_length=100, do_sample=False)[0]['summary_text']
             
             # Résumé long (500 mots)
-            long_summary = self.summarizer(text, max_length=500, min_length=300, do_sample=False)[0]['summary_text']
+            long_summary = summarizer(text, max_length=500, min_length=300, do_sample=False)[0]['summary_text']
 
             return SummaryResult(
                 short=short_summary,
@@ -0,0 +1,77 @@
+import logging
+from typing import Dict, Optional
+
+from src.utils.translation_memory import TranslationMemory
+
+logger = logging.getLogger(__name__)
+
+# Codes ISO 639-1 -> codes de langue propres à chaque modèle
+MBART_LANG_CODES = {
+    "ar": "ar_AR", "de": "de_DE", "en": "en_XX", "es": "es_XX", "fr": "fr_XX", "hi": "hi_IN",
+    "it": "it_IT", "ja": "ja_XX", "ko": "ko_KR", "nl": "nl_XX", "pl": "pl_PL", "pt": "pt_XX",
+    "ru": "ru_RU", "tr": "tr_TR", "uk": "uk_UA", "zh": "zh_CN",
+}
+NLLB_LANG_CODES = {
+    "ar": "arb_Arab", "de": "deu_Latn", "en": "eng_Latn", "es": "spa_Latn", "fr": "fra_Latn", "hi": "hin_Deva",
+    "it": "ita_Latn", "ja": "jpn_Jpan", "ko": "kor_Hang", "nl": "nld_Latn", "pl": "pol_Latn", "pt": "por_Latn",
+    "ru": "rus_Cyrl", "tr": "tur_Latn", "uk": "ukr_Cyrl", "zh": "zho_Hans",
+}
+LANG_CODES = {"mbart": MBART_LANG_CODES, "nllb": NLLB_LANG_CODES}
+
+ENGINES = ("argos", "mbart", "nllb")
+
+
+def engine_lang_code(engine: str, code: str) -> str:
+    """Convertit un code ISO (`fr`) en code du moteur (`fr_XX`, `fra_Latn`) ; les codes déjà propres au moteur sont conservés"""
+    return LANG_CODES.get(engine, {}).get(code, code)
+
+
+def create_translator(translation_cfg: Dict, memory: Optional[TranslationMemory] = None,
+                      source_lang: Optional[str] = None, target_lang: Optional[str] = None):
+    """
+    Crée le traducteur décrit par la section `translation` de la configuration.
+
+    Tous les moteurs exposent la même interface : `engine_name`, `translate(text) -> str`
+    et `translate_batch(texts) -> List[str]` (traductions dans l'ordre des textes d'entrée).
+
+    Args:
+        translation_cfg (Dict): Section `translation` (engine, models, source_lang, target_lang,
+            max_batch_tokens, backend, compute_type, converted_dir, workers, timeout, chunk_size, threads)
+        memory (Optional[TranslationMemory]): Mémoire de traduction partagée
+        source_lang (Optional[str]): Langue source ISO, prioritaire sur la configuration
+        target_lang (Optional[str]): Langue cible ISO, prioritaire sur la configuration
+    """
+    engine = translation_cfg.get('engine', 'argos')
+    if engine not in ENGINES:
+        raise ValueError(f"Moteur de traduction inconnu : {engine} (disponibles : {', '.join(ENGINES)})")
+    source_lang = source_lang or translation_cfg.get('source_lang', 'en')
+    target_lang = target_lang or translation_cfg.get('target_lang', 'fr')
+    logger.info(f"Moteur de traduction {engine} ({source_lang} -> {target_lang})")
+
+    if translation_cfg.get('workers', 0) > 0:
+        from src.processors.translation_pool import TranslationPool
+        return TranslationPool(
+            dict(translation_cfg, source_lang=source_lang, target_lang=target_lang),
+            workers=translation_cfg['workers'],
+            timeout=translation_cfg.get('timeout', 30),
+            chunk_size=translation_cfg.get('chunk_size', 16),
+            memory=memory,
+            threads=translation_cfg.get('threads')
+        )
+
+    if engine == "argos":
+        from src.processors.argos_translator import ArgosTranslator
+        return ArgosTranslator(from_code=source_lang, to_code=target_lang, memory=memory)
+
+    from src.processors.translator import NLLBTranslator, Translator
+    translator_class = NLLBTranslator if engine == "nllb" else Translator
+    return translator_class(
+        (translation_cfg.get('models') or {}).get(engine),
+        memory=memory,
+        max_batch_tokens=translation_cfg.get('max_batch_tokens', 2048),
+        backend=translation_cfg.get('backend', 'transformers'),
+        compute_type=translation_cfg.get('compute_type'),
+        converted_dir=translation_cfg.get('converted_dir'),
+        source_lang=engine_lang_code(engine, source_lang),
+        target_lang=engine_lang_code(engine, target_lang)
+    )
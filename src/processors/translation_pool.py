@@ -0,0 +1,222 @@
+import logging
+import multiprocessing
+import os
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from src.processors.argos_translator import TranslationError
+from src.utils.translation_memory import TranslationMemory
+
+logger = logging.getLogger(__name__)
+
+
+def _worker_main(translation_cfg: Dict, threads: int, conn) -> None:
+    """Boucle d'un processus de traduction : charge le modèle une fois puis traite les requêtes"""
+    import torch
+    torch.set_num_threads(threads)
+    from src.processors.translation_backends import create_translator
+    try:
+        translator = create_translator(dict(translation_cfg, workers=0))
+    except Exception as e:
+        conn.send(("error", f"Chargement du traducteur impossible : {str(e)}"))
+        return
+    conn.send(("ready", translator.memory_key))
+
+    while True:
+        try:
+            texts = conn.recv()
+        except EOFError:
+            break
+        if texts is None:
+            break
+        try:
+            conn.send(("ok", translator.translate_batch(texts)))
+        except Exception as e:
+            conn.send(("error", str(e)))
+
+
+class _TranslationWorker:
+    """Processus de traduction dédié, avec son propre modèle chargé"""
+
+    def __init__(self, translation_cfg: Dict, threads: int, load_timeout: float):
+        self.translation_cfg = translation_cfg
+        self.threads = threads
+        self.load_timeout = load_timeout
+        self.process = None
+        self.conn = None
+        self.memory_key = None
+        self.launch()
+
+    def launch(self) -> None:
+        """Lance le processus, sans attendre le chargement de son modèle"""
+        context = multiprocessing.get_context("spawn")
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main, args=(self.translation_cfg, self.threads, child_conn), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+    def wait_ready(self) -> None:
+        """Attend que le processus ait chargé son modèle"""
+        if not self.conn.poll(self.load_timeout):
+            self.kill()
+            raise TranslationError(f"Le processus de traduction n'a pas chargé son modèle en {self.load_timeout}s")
+        status, payload = self.conn.recv()
+        if status != "ready":
+            self.kill()
+            raise TranslationError(payload)
+        self.memory_key = payload
+
+    def start(self) -> None:
+        self.launch()
+        self.wait_ready()
+
+    def kill(self) -> None:
+        if self.process is not None and self.process.is_alive():
+            self.process.kill()
+        if self.process is not None:
+            self.process.join()
+        if self.conn is not None:
+            self.conn.close()
+
+    @property
+    def alive(self) -> bool:
+        """Processus en vie et connexion ouverte"""
+        return (self.conn is not None and not self.conn.closed
+                and self.process is not None and self.process.is_alive())
+
+    def restart(self) -> None:
+        logger.warning(f"Redémarrage du processus de traduction {self.process.pid}")
+        self.kill()
+        self.start()
+
+    def call(self, texts: List[str], timeout: float) -> List[str]:
+        """Traduit un lot ; le processus est tué s'il dépasse `timeout` (relancé avant son prochain usage)"""
+        try:
+            self.conn.send(texts)
+            ready = self.conn.poll(timeout)
+            if ready:
+                status, payload = self.conn.recv()
+        except (EOFError, OSError) as e:
+            # Processus mort (plantage, mémoire insuffisante...) ou connexion déjà fermée
+            self.kill()
+            raise TranslationError(f"Le processus de traduction s'est arrêté : {str(e)}")
+        if not ready:
+            self.kill()
+            raise TimeoutError(f"Timeout de la traduction ({timeout}s)")
+        if status != "ok":
+            raise TranslationError(payload)
+        return payload
+
+    def close(self) -> None:
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=5)
+        self.kill()
+
+
+class TranslationPool:
+    """
+    Pool de processus de traduction : chaque processus garde son modèle chargé, les
+    segments sont répartis par lots entre les processus et chaque appel est borné par un
+    vrai timeout (le processus bloqué est tué puis relancé).
+    """
+
+    def __init__(self, translation_cfg: Dict, workers: int = 2, timeout: float = 30,
+                 chunk_size: int = 16, max_retries: int = 2, load_timeout: float = 600,
+                 memory: Optional[TranslationMemory] = None, threads: Optional[int] = None):
+        """
+        Args:
+            translation_cfg (Dict): Section `translation` décrivant le moteur de chaque processus
+            workers (int): Nombre de processus
+            timeout (float): Durée maximale d'un appel (un lot de `chunk_size` textes au plus)
+            chunk_size (int): Nombre de textes par lot envoyé à un processus
+            max_retries (int): Nombre de tentatives par lot
+            load_timeout (float): Durée maximale du chargement du modèle d'un processus
+            memory (Optional[TranslationMemory]): Mémoire de traduction, consultée dans le processus principal
+            threads (Optional[int]): Threads répartis entre les processus (par défaut, tous les cœurs)
+        """
+        self.workers = workers
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self.max_retries = max_retries
+        self.memory = memory
+        threads = max(1, (threads or os.cpu_count() or 1) // workers)
+        logger.info(f"Démarrage de {workers} processus de traduction ({threads} threads chacun)...")
+        # Processus lancés ensemble : les modèles se chargent en parallèle
+        self._all_workers = [_TranslationWorker(translation_cfg, threads, load_timeout) for _ in range(workers)]
+        try:
+            for worker in self._all_workers:
+                worker.wait_ready()
+        except Exception:
+            for worker in self._all_workers:
+                worker.kill()
+            raise
+        self._idle = queue.Queue()
+        for worker in self._all_workers:
+            self._idle.put(worker)
+        self.engine_name = translation_cfg.get('engine', 'argos')
+        self.memory_key = self._all_workers[0].memory_key
+
+    def _call(self, texts: List[str]) -> List[str]:
+        """Traduit un lot sur le premier processus libre, avec nouvelles tentatives"""
+        last_error = None
+        for attempt in range(self.max_retries):
+            worker = self._idle.get()
+            try:
+                if not worker.alive:
+                    # Processus tué ou dont le redémarrage a échoué : relancé avant usage
+                    worker.restart()
+                start_time = time.time()
+                result = worker.call(texts, self.timeout)
+                logger.info(f"Lot de {len(texts)} textes traduit en {time.time() - start_time:.2f}s")
+                return result
+            except Exception as e:
+                last_error = e
+                logger.warning(f"Échec de la traduction d'un lot de {len(texts)} textes "
+                               f"(tentative {attempt + 1}/{self.max_retries}) : {str(e)}")
+            finally:
+                self._idle.put(worker)
+        raise TranslationError(f"Échec de la traduction après {self.max_retries} tentatives : {str(last_error)}")
+
+    def _translate_batch(self, texts: List[str]) -> List[str]:
+        chunks = [texts[i:i + self.chunk_size] for i in range(0, len(texts), self.chunk_size)]
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = list(executor.map(self._call, chunks))
+        return [translation for chunk in results for translation in chunk]
+
+    def translate_batch(self, texts: List[str]) -> List[str]:
+        """
+        Traduit une liste de textes répartis par lots entre les processus.
+
+        Returns:
+            List[str]: Les traductions, dans l'ordre des textes d'entrée
+
+        Raises:
+            TranslationError: Si un lot échoue après toutes les tentatives
+        """
+        if self.memory is None:
+            return self._translate_batch(texts)
+        return self.memory.translate_batch(*self.memory_key, texts, self._translate_batch)
+
+    def translate(self, text: str) -> str:
+        """Traduit un texte sur le premier processus libre"""
+        if not text or not text.strip():
+            return text
+        return self.translate_batch([text])[0]
+
+    def close(self) -> None:
+        """Arrête tous les processus"""
+        for worker in self._all_workers:
+            worker.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,51 +1,255 @@
-from transformers import MBartForConditionalGeneration, MBart50TokenizerFast
+from transformers import AutoModelForSeq2SeqLM, AutoTokenizer, MBartForConditionalGeneration, MBart50TokenizerFast
 import logging
+import threading
+from pathlib import Path
+from typing import List, Optional
+import torch
 from tqdm import tqdm
+from src.utils.model_registry import get_registry
+from src.utils.text_segmenter import TextSegmenter
+from src.utils.translation_memory import TranslationMemory
+
+# Répertoire des modèles convertis au format CTranslate2
+CONVERTED_MODELS_DIR = Path("models/ctranslate2")
 
 class Translator:
-    def __init__(self, model_name="facebook/mbart-large-50-many-to-many-mmt"):
+    engine_name = "mbart"
+    default_model = "facebook/mbart-large-50-many-to-many-mmt"
+    tokenizer_class = MBart50TokenizerFast
+    model_class = MBartForConditionalGeneration
+    backends = ("transformers", "ctranslate2")
+
+    def __init__(self, model_name: Optional[str] = None, memory: Optional[TranslationMemory] = None,
+                 max_batch_tokens: int = 2048, backend: str = "transformers", compute_type: Optional[str] = None,
+                 converted_dir: Optional[str] = None, source_lang: str = "en_XX", target_lang: str = "fr_XX",
+                 max_piece_tokens: int = 256):
+        """
+        Args:
+            model_name (Optional[str]): Nom du modèle Hugging Face (modèle par défaut du moteur si absent)
+            memory (Optional[TranslationMemory]): Mémoire de traduction consultée avant le modèle
+            max_batch_tokens (int): Budget de jetons source par lot
+            backend (str): `transformers` (PyTorch) ou `ctranslate2` (modèle converti)
+            compute_type (Optional[str]): `int8` pour quantifier le modèle sur CPU, sinon précision d'origine
+            converted_dir (Optional[str]): Répertoire des modèles convertis pour CTranslate2
+            source_lang (str): Code de la langue source propre au modèle
+            target_lang (str): Code de la langue cible propre au modèle
+            max_piece_tokens (int): Nombre maximal de jetons d'un morceau de texte (les textes plus
+                longs sont découpés aux phrases, jamais tronqués)
+        """
         self.logger = logging.getLogger(__name__)
-        self.logger.info(f"Initialisation du traducteur avec le modèle {model_name}")
-        self.tokenizer = MBart50TokenizerFast.from_pretrained(model_name)
-        self.model = MBartForConditionalGeneration.from_pretrained(model_name)
-        
+        if backend not in self.backends:
+            raise ValueError(f"Moteur de traduction inconnu : {backend} (disponibles : {', '.join(self.backends)})")
+        model_name = model_name or self.default_model
+        self.model_name = model_name
+        self.source_lang = source_lang
+        self.target_lang = target_lang
+        self.memory = memory
+        self.max_batch_tokens = max_batch_tokens
+        self.backend = backend
+        self.compute_type = compute_type
+        self.converted_dir = Path(converted_dir) if converted_dir else CONVERTED_MODELS_DIR
+        self.logger.info(f"Initialisation du traducteur avec le modèle {model_name} "
+                         f"({backend}, {compute_type or 'précision par défaut'})")
+        self._loader = self._load_ctranslate2 if backend == "ctranslate2" else self._load_transformers
+        self._registry_kind = self.engine_name if backend == "transformers" else f"{self.engine_name}-ct2"
+        self._components()  # Chargement immédiat
+        self.segmenter = TextSegmenter(max_piece_tokens, self._count_tokens)
+
+    def _components(self):
+        """
+        (tokenizer, modèle, verrou) demandés au registre à chaque usage : le traducteur n'en
+        garde aucune référence, pour qu'une éviction libère réellement leur mémoire.
+
+        Le tokenizer et le modèle sont partagés par tous les traducteurs du même modèle (une
+        langue cible par thread) : ils ne sont utilisés que sous le verrou de leur entrée.
+        """
+        return get_registry().get(self._registry_kind, self.model_name, self._loader, compute_type=self.compute_type)
+
+    def _locked_tokenizer(self, tokenizer):
+        """Tokenizer réglé sur la langue source (à appeler sous le verrou)"""
+        if tokenizer.src_lang != self.source_lang:
+            tokenizer.src_lang = self.source_lang
+        return tokenizer
+
+    @property
+    def tokenizer(self):
+        return self._components()[0]
+
+    @property
+    def model(self):
+        return self._components()[1]
+
+    def _count_tokens(self, texts: List[str]) -> List[int]:
+        """Nombre de jetons de chaque texte (hors jetons spéciaux)"""
+        tokenizer, _, lock = self._components()
+        with lock:
+            input_ids = self._locked_tokenizer(tokenizer)(texts, add_special_tokens=False)["input_ids"]
+        return [len(ids) for ids in input_ids]
+
+    def _load_transformers(self):
+        tokenizer = self.tokenizer_class.from_pretrained(self.model_name, src_lang=self.source_lang)
+        model = self.model_class.from_pretrained(self.model_name)
+        model.eval()
+        if self.compute_type == "int8":
+            self.logger.info(f"Quantification dynamique int8 des couches linéaires de {self.model_name}")
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        return tokenizer, model, threading.Lock()
+
+    def _load_ctranslate2(self):
+        try:
+            import ctranslate2
+        except ImportError as e:
+            raise ImportError("Le moteur ctranslate2 nécessite le paquet ctranslate2 "
+                              "(pip install ctranslate2)") from e
+        compute_type = self.compute_type or "default"
+        model_dir = self.converted_dir / f"{self.model_name.replace('/', '--')}-{compute_type}"
+        if not (model_dir / "model.bin").exists():
+            # Conversion unique, réutilisée aux lancements suivants
+            self.logger.info(f"Conversion de {self.model_name} au format CTranslate2 dans {model_dir}...")
+            converter = ctranslate2.converters.TransformersConverter(self.model_name)
+            converter.convert(str(model_dir), quantization=self.compute_type, force=True)
+        tokenizer = self.tokenizer_class.from_pretrained(self.model_name, src_lang=self.source_lang)
+        model = ctranslate2.Translator(
+            str(model_dir),
+            device="cpu",
+            compute_type=compute_type,
+            intra_threads=torch.get_num_threads()
+        )
+        return tokenizer, model, threading.Lock()
+
+    @property
+    def memory_key(self) -> tuple:
+        """(moteur, modèle, langue source, langue cible) identifiant les traductions en mémoire"""
+        # Les variantes quantifiées ne produisent pas exactement les mêmes traductions
+        model = self.model_name
+        if self.backend != "transformers" or self.compute_type:
+            model = f"{self.model_name}:{self.backend}:{self.compute_type or 'default'}"
+        return (self.engine_name, model, self.source_lang, self.target_lang)
+
     def translate(self, text: str) -> str:
         """
-        Traduit le texte en utilisant le modèle mBART.
-        
+        Traduit le texte en utilisant le modèle.
+
         Args:
             text (str): Le texte à traduire
-            
+
         Returns:
             str: Le texte traduit
         """
+        if self.memory is not None:
+            cached = self.memory.lookup(*self.memory_key, text)
+            if cached is not None:
+                self.logger.info("Traduction trouvée en mémoire")
+                return cached
+
         try:
-            # Tokenisation du texte
-            self.tokenizer.src_lang = "en_XX"
-            encoded = self.tokenizer(text, return_tensors="pt", truncation=True, max_length=512)
-            
-            # Création de la barre de progression
-            pbar = tqdm(total=100, desc="Traduction en cours", unit="%")
-            
-            # Génération de la traduction
-            generated_tokens = self.model.generate(
+            translated_text = self._translate_batch([text], self.max_batch_tokens, progress=False)[0]
+
+            if self.memory is not None:
+                self.memory.store(*self.memory_key, text, translated_text)
+            return translated_text
+
+        except Exception as e:
+            self.logger.error(f"Erreur lors de la traduction : {str(e)}")
+            raise
+
+    def _generate(self, input_ids: List[List[int]]) -> List[str]:
+        """Génère et décode les traductions d'un lot d'entrées tokenisées, une génération à la fois par modèle"""
+        tokenizer, model, lock = self._components()
+        with lock:
+            return self._generate_locked(tokenizer, model, input_ids)
+
+    def _generate_locked(self, tokenizer, model, input_ids: List[List[int]]) -> List[str]:
+        if self.backend == "ctranslate2":
+            results = model.translate_batch(
+                [tokenizer.convert_ids_to_tokens(ids) for ids in input_ids],
+                target_prefix=[[self.target_lang]] * len(input_ids),
+                beam_size=5,
+                length_penalty=0.6,
+                max_decoding_length=512
+            )
+            return [
+                tokenizer.decode(
+                    tokenizer.convert_tokens_to_ids(result.hypotheses[0][1:]),
+                    skip_special_tokens=True
+                )
+                for result in results
+            ]
+
+        # Complétion dynamique : jusqu'à l'entrée la plus longue du lot
+        encoded = tokenizer.pad({"input_ids": input_ids}, return_tensors="pt")
+        with torch.inference_mode():
+            generated_tokens = model.generate(
                 **encoded,
-                forced_bos_token_id=self.tokenizer.lang_code_to_id["fr_XX"],
+                forced_bos_token_id=tokenizer.convert_tokens_to_ids(self.target_lang),
                 max_length=512,
                 num_beams=5,
                 length_penalty=0.6,
                 early_stopping=True
             )
-            
-            # Mise à jour de la barre de progression
-            pbar.update(100)
-            pbar.close()
-            
-            # Décodage de la traduction
-            translated_text = self.tokenizer.batch_decode(generated_tokens, skip_special_tokens=True)[0]
-            
-            return translated_text
-            
-        except Exception as e:
-            self.logger.error(f"Erreur lors de la traduction : {str(e)}")
-            raise 
\ No newline at end of file
+        return tokenizer.batch_decode(generated_tokens, skip_special_tokens=True)
+
+    def translate_batch(self, texts: List[str], max_batch_tokens: Optional[int] = None) -> List[str]:
+        """
+        Traduit une liste de textes (typiquement les segments d'une transcription) par lots.
+
+        Les textes sont triés par longueur en jetons puis regroupés tant que le lot complété
+        (nombre de textes x longueur du plus long) reste sous le budget de jetons ; chaque
+        lot n'est complété que jusqu'à son texte le plus long.
+
+        Args:
+            texts (List[str]): Les textes à traduire
+            max_batch_tokens (Optional[int]): Budget de jetons source par lot
+
+        Returns:
+            List[str]: Les traductions, dans l'ordre des textes d'entrée
+        """
+        max_batch_tokens = max_batch_tokens or self.max_batch_tokens
+        if self.memory is None:
+            return self._translate_batch(texts, max_batch_tokens)
+        return self.memory.translate_batch(
+            *self.memory_key, texts, lambda missing: self._translate_batch(missing, max_batch_tokens)
+        )
+
+    def _translate_batch(self, texts: List[str], max_batch_tokens: int, progress: bool = True) -> List[str]:
+        """Traduction par lots triés par longueur, sans mémoire de traduction"""
+        # Les textes trop longs sont découpés en morceaux, réassemblés après traduction
+        pieces = self.segmenter.split_many(texts)
+        if not pieces:
+            return list(texts)
+        tokenizer, _, lock = self._components()
+        with lock:
+            input_ids = self._locked_tokenizer(tokenizer)([piece.text for piece in pieces])["input_ids"]
+        order = sorted(range(len(pieces)), key=lambda k: len(input_ids[k]))
+
+        # Lots sous le budget de jetons complétés (textes triés : le dernier est le plus long)
+        batches, batch = [], []
+        for k in order:
+            if batch and (len(batch) + 1) * len(input_ids[k]) > max_batch_tokens:
+                batches.append(batch)
+                batch = []
+            batch.append(k)
+        if batch:
+            batches.append(batch)
+
+        translated = [None] * len(pieces)
+        with tqdm(total=len(pieces), desc="Traduction des segments", unit="morceau", disable=not progress) as pbar:
+            for batch in batches:
+                for k, translation in zip(batch, self._generate([input_ids[k] for k in batch])):
+                    translated[k] = translation
+                pbar.update(len(batch))
+        self.logger.info(f"{len(texts)} textes ({len(pieces)} morceaux) traduits en {len(batches)} lots")
+        return TextSegmenter.join(texts, pieces, translated)
+
+
+class NLLBTranslator(Translator):
+    """Traducteur NLLB-200 : même fonctionnement que mBART, avec les codes de langue FLORES-200"""
+
+    engine_name = "nllb"
+    default_model = "facebook/nllb-200-distilled-600M"
+    tokenizer_class = AutoTokenizer
+    model_class = AutoModelForSeq2SeqLM
+
+    def __init__(self, model_name: Optional[str] = None, source_lang: str = "eng_Latn",
+                 target_lang: str = "fra_Latn", **kwargs):
+        super().__init__(model_name, source_lang=source_lang, target_lang=target_lang, **kwargs)
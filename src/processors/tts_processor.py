@@ -2,19 +2,173 @@ import logging
 import tempfile
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 import subprocess
 import json
+import threading
 import numpy as np
 import soundfile as sf
-import shutil
+from src.utils.model_registry import get_registry
+from src.utils.tts_cache import TTSCache
 
 logger = logging.getLogger(__name__)
 
+# Données espeak-ng passées au binaire piper (installation Homebrew par défaut)
+DEFAULT_ESPEAK_DATA = '/opt/homebrew/share/espeak-ng-data'
+
+# espeak-ng (état global en C) n'est pas réentrant : un seul verrou pour toutes les voix
+_ESPEAK_LOCK = threading.Lock()
+
+def load_piper_voice(model_path: str, config_path: str, threads: Optional[int] = None):
+    """Charge une voix Piper ; `threads` limite les threads de sa session ONNX Runtime"""
+    from piper import PiperVoice
+    if not threads:
+        return PiperVoice.load(model_path, config_path=config_path)
+    # Session unique créée directement avec ses options (PiperVoice.load en créerait une autre)
+    import onnxruntime
+    from piper.config import PiperConfig
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = PiperConfig.from_dict(json.load(f))
+    options = onnxruntime.SessionOptions()
+    options.intra_op_num_threads = threads
+    options.inter_op_num_threads = 1
+    session = onnxruntime.InferenceSession(
+        str(model_path), sess_options=options, providers=["CPUExecutionProvider"]
+    )
+    return PiperVoice(session=session, config=config)
+
+class PiperVoiceEngine:
+    """Voix Piper chargée une fois en mémoire (session ONNX Runtime partagée via le registre, ou privée)"""
+
+    def __init__(self, model_path: str, config_path: str, speaker_id: Optional[int] = None,
+                 threads: Optional[int] = None, shared: bool = True):
+        self.model_path = model_path
+        self.config_path = config_path
+        self.threads = threads
+        # Voix privée gardée par l'instance ; voix partagée redemandée au registre à chaque usage
+        self._voice = None if shared else load_piper_voice(model_path, config_path, threads)
+        voice_config = self.voice.config
+        self.sample_rate = voice_config.sample_rate
+        # L'identifiant de locuteur n'est accepté que par les voix multi-locuteurs
+        self.speaker_id = speaker_id if voice_config.num_speakers > 1 else None
+
+    @property
+    def voice(self):
+        """Voix Piper (privée, ou partagée via le registre : une session par modèle et nombre de threads)"""
+        if self._voice is not None:
+            return self._voice
+        name = f"{self.model_path}:{self.threads}t" if self.threads else self.model_path
+        return get_registry().get(
+            "piper", name,
+            lambda: load_piper_voice(self.model_path, self.config_path, self.threads)
+        )
+
+    def _ids_to_audio(self, voice, phoneme_ids) -> np.ndarray:
+        """Inférence ONNX d'une phrase phonémisée"""
+        if hasattr(voice, 'synthesize_ids_to_raw'):
+            # piper-tts < 1.3 : PCM 16 bits
+            raw = voice.synthesize_ids_to_raw(phoneme_ids, speaker_id=self.speaker_id)
+            return np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+        from piper import SynthesisConfig
+        audio = voice.phoneme_ids_to_audio(phoneme_ids, SynthesisConfig(speaker_id=self.speaker_id))
+        # Normalisation appliquée par PiperVoice.synthesize (normalize_audio)
+        peak = float(np.abs(audio).max()) if len(audio) else 0.0
+        audio = audio / peak if peak > 1e-8 else np.zeros_like(audio)
+        return np.clip(audio, -1.0, 1.0).astype(np.float32)
+
+    def synthesize(self, text: str) -> np.ndarray:
+        voice = self.voice
+        # Seule la phonémisation est sérialisée ; l'inférence ONNX reste parallèle
+        with _ESPEAK_LOCK:
+            sentences = voice.phonemize(text)
+        chunks = [
+            self._ids_to_audio(voice, voice.phonemes_to_ids(phonemes))
+            for phonemes in sentences if phonemes
+        ]
+        return np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.float32)
+
+    def close(self):
+        pass
+
+class PiperProcessEngine:
+    """Processus piper unique (--json-input) qui garde la voix chargée pendant tout le traitement"""
+
+    def __init__(self, model_path: str, config_path: str, speaker_id: Optional[int] = None,
+                 espeak_data: Optional[str] = None):
+        with open(config_path, 'r', encoding='utf-8') as f:
+            self.sample_rate = json.load(f)['audio']['sample_rate']
+        self.output_dir = tempfile.mkdtemp(prefix='piper_')
+        command = [
+            'piper',
+            '--model', model_path,
+            '--config', config_path,
+            '--json-input',
+            '--output_dir', self.output_dir
+        ]
+        if speaker_id is not None:
+            command += ['--speaker', str(speaker_id)]
+        if espeak_data and os.path.isdir(espeak_data):
+            command += ['--espeak_data', espeak_data]
+        logger.info(f"Démarrage du processus Piper : {' '.join(command)}")
+        # Les logs de piper vont dans un fichier, pour ne jamais bloquer sur un tube plein
+        self._stderr = tempfile.TemporaryFile(mode='w+')
+        self.process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=self._stderr,
+            text=True,
+            bufsize=1
+        )
+        self._lock = threading.Lock()
+        self._count = 0
+
+    def _error_output(self) -> str:
+        self._stderr.seek(0)
+        return self._stderr.read()[-2000:]
+
+    def synthesize(self, text: str) -> np.ndarray:
+        with self._lock:
+            self._count += 1
+            output_file = os.path.join(self.output_dir, f'{self._count}.wav')
+            try:
+                self.process.stdin.write(json.dumps({"text": text, "output_file": output_file}) + "\n")
+                self.process.stdin.flush()
+                # piper écrit le chemin du fichier généré une fois la phrase synthétisée
+                line = self.process.stdout.readline()
+            except (BrokenPipeError, OSError) as e:
+                raise RuntimeError(f"Le processus Piper s'est arrêté : {self._error_output()}") from e
+            if not line:
+                raise RuntimeError(f"Le processus Piper s'est arrêté : {self._error_output()}")
+            samples, _ = sf.read(output_file, dtype='float32')
+            os.unlink(output_file)
+        return samples
+
+    def close(self):
+        if self.process.poll() is None:
+            self.process.stdin.close()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self._stderr.close()
+        try:
+            os.rmdir(self.output_dir)
+        except OSError:
+            pass
+
 class TTSProcessor:
     """Gestionnaire de la synthèse vocale"""
-    
-    def __init__(self, config: dict):
+
+    def __init__(self, config: dict, threads: Optional[int] = None, shared_voice: bool = True,
+                 cache: Optional[TTSCache] = None):
+        """
+        Args:
+            config (dict): Section `tts` de la configuration
+            threads (Optional[int]): Nombre maximal de threads de la session ONNX Runtime
+            shared_voice (bool): Partager la voix chargée via le registre (False : voix propre à l'instance)
+            cache (Optional[TTSCache]): Cache des clips, consulté avant la synthèse
+        """
         self.config = config
         self.engine = config.get('engine', 'piper')
         self.voice = config.get('voice')
@@ -23,8 +177,14 @@ class TTSProcessor:
         self.output_format = config.get('output_format')
         self.sample_rate = config.get('sample_rate')
         self.speaker_id = config.get('speaker_id', 1)
+        self.espeak_data = config.get('espeak_data', DEFAULT_ESPEAK_DATA)
+        self.threads = threads
+        self.shared_voice = shared_voice
+        self.cache = cache
         self.logger = logging.getLogger(__name__)
-        
+        self._synthesizer = None
+        self._synthesizer_lock = threading.Lock()
+
         if self.engine == 'piper':
             logger.info(f"Initialisation de Piper TTS avec le modèle {self.model_path}")
             # Vérification que le modèle existe
@@ -36,7 +196,48 @@ class TTSProcessor:
             self.model_path = None
             self.config_path = None
             logger.info("Aucun moteur TTS configuré")
-    
+
+    def _get_synthesizer(self):
+        """Charge la voix au premier appel : en mémoire si piper-tts est importable, sinon un processus piper persistant"""
+        with self._synthesizer_lock:
+            if self._synthesizer is None:
+                if self.engine != 'piper':
+                    raise RuntimeError("Aucun moteur TTS configuré")
+                try:
+                    self._synthesizer = PiperVoiceEngine(
+                        self.model_path, self.config_path, self.speaker_id,
+                        threads=self.threads, shared=self.shared_voice
+                    )
+                    self.logger.info("Voix Piper chargée en mémoire")
+                except ImportError:
+                    self.logger.info("Module piper indisponible : utilisation d'un processus piper persistant")
+                    self._synthesizer = PiperProcessEngine(
+                        self.model_path, self.config_path, self.speaker_id, self.espeak_data
+                    )
+            return self._synthesizer
+
+    def synthesize(self, text: str) -> Tuple[np.ndarray, int]:
+        """
+        Synthétise le texte en mémoire.
+
+        Returns:
+            Tuple[np.ndarray, int]: Échantillons float32 mono et fréquence d'échantillonnage de la voix
+        """
+        key = None
+        if self.cache is not None and self.engine == 'piper':
+            key = TTSCache.make_key(text, self.model_path, self.config_path, self.speaker_id, self.sample_rate)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        synthesizer = self._get_synthesizer()
+        samples = synthesizer.synthesize(text)
+        if len(samples) == 0:
+            raise RuntimeError("La synthèse vocale n'a produit aucun échantillon")
+        if key is not None:
+            self.cache.put(key, samples, synthesizer.sample_rate)
+        return samples, synthesizer.sample_rate
+
     def generate_audio(self, text, output_path=None):
         """Génère un fichier audio à partir du texte traduit."""
         try:
@@ -48,49 +249,23 @@ class TTSProcessor:
             else:
                 # Vérifier que le dossier de sortie existe
                 output_dir = os.path.dirname(output_path)
-                if not os.path.exists(output_dir):
+                if output_dir and not os.path.exists(output_dir):
                     os.makedirs(output_dir, exist_ok=True)
                     self.logger.info(f"Dossier de sortie créé : {output_dir}")
-            
-            # Créer un fichier temporaire pour l'audio
-            temp_audio = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
-            temp_audio_path = temp_audio.name
-            temp_audio.close()
-            
-            # Générer l'audio avec Piper
-            command = [
-                'piper',
-                '--model', self.model_path,
-                '--config', self.config_path,
-                '--output-file', temp_audio_path,
-                '--speaker', str(self.speaker_id),
-                '--espeak_data', '/opt/homebrew/share/espeak-ng-data'
-            ]
-            
-            # Exécuter la commande en passant le texte via stdin
-            self.logger.info(f"Commande Piper : {' '.join(command)}")
-            process = subprocess.Popen(
-                command,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            stdout, stderr = process.communicate(input=text)
-            
-            if process.returncode != 0:
-                self.logger.error(f"Erreur lors de la génération audio : {stderr}")
-                raise RuntimeError(f"Erreur lors de la génération audio : {stderr}")
-            
-            # Copier le fichier audio généré vers le chemin de sortie spécifié
-            shutil.copy2(temp_audio_path, output_path)
-            
-            # Nettoyer les fichiers temporaires
-            os.unlink(temp_audio_path)
-            
+
+            samples, sample_rate = self.synthesize(text)
+            sf.write(output_path, samples, sample_rate, subtype='PCM_16')
+
             self.logger.info(f"Audio généré avec succès : {output_path}")
             return output_path
-            
+
         except Exception as e:
             self.logger.error(f"Erreur lors de la génération audio : {str(e)}")
-            raise 
\ No newline at end of file
+            raise
+
+    def close(self):
+        """Libère la voix (arrête le processus piper persistant le cas échéant)"""
+        with self._synthesizer_lock:
+            if self._synthesizer is not None:
+                self._synthesizer.close()
+                self._synthesizer = None
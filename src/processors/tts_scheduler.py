@@ -0,0 +1,91 @@
+import logging
+import os
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.processors.tts_processor import TTSProcessor
+from src.utils.tts_cache import TTSCache
+
+logger = logging.getLogger(__name__)
+
+
+class TTSScheduler:
+    """
+    Synthèse vocale parallèle : `workers` voix chargées chacune de leur côté (session
+    ONNX Runtime limitée à `threads` threads, ou processus piper dédié), les segments
+    étant répartis sur la première voix libre. Les résultats sont rendus dans l'ordre
+    des segments.
+
+    Expose la même interface que TTSProcessor (`synthesize`, `generate_audio`).
+    """
+
+    def __init__(self, config: dict, workers: Optional[int] = None, threads: Optional[int] = None,
+                 cache: Optional[TTSCache] = None):
+        """
+        Args:
+            config (dict): Section `tts` de la configuration (clés `workers` et `threads` facultatives)
+            workers (Optional[int]): Nombre de voix synthétisant en parallèle
+            threads (Optional[int]): Threads ONNX Runtime par voix (par défaut, cœurs / workers)
+            cache (Optional[TTSCache]): Cache des clips partagé par toutes les voix
+        """
+        self.workers = max(1, workers or config.get('workers', 1))
+        threads = threads or config.get('threads') or max(1, (os.cpu_count() or 1) // self.workers)
+        logger.info(f"Synthèse vocale sur {self.workers} voix ({threads} threads chacune)")
+        # Une seule voix : elle peut être partagée avec le reste du processus
+        shared = self.workers == 1
+        self._processors = [
+            TTSProcessor(config, threads=threads, shared_voice=shared, cache=cache)
+            for _ in range(self.workers)
+        ]
+        self._idle = queue.Queue()
+        for processor in self._processors:
+            self._idle.put(processor)
+
+    def synthesize(self, text: str) -> Tuple[np.ndarray, int]:
+        """Synthétise le texte sur la première voix libre"""
+        processor = self._idle.get()
+        try:
+            return processor.synthesize(text)
+        finally:
+            self._idle.put(processor)
+
+    def generate_audio(self, text, output_path=None):
+        """Génère un fichier audio sur la première voix libre"""
+        processor = self._idle.get()
+        try:
+            return processor.generate_audio(text, output_path)
+        finally:
+            self._idle.put(processor)
+
+    def generate_many(self, jobs: Sequence[Tuple[str, str]]) -> List[Optional[str]]:
+        """
+        Génère en parallèle les fichiers audio de plusieurs segments.
+
+        Args:
+            jobs (Sequence[Tuple[str, str]]): Couples (texte, chemin de sortie), dans l'ordre de la timeline
+
+        Returns:
+            List[Optional[str]]: Chemins générés dans l'ordre des segments (None en cas d'échec)
+        """
+        start_time = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [executor.submit(self.generate_audio, text, output_path) for text, output_path in jobs]
+        results = []
+        for i, future in enumerate(futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                logger.error(f"Erreur lors de la synthèse du segment {i} : {str(e)}")
+                results.append(None)
+        logger.info(f"{len(jobs)} segments synthétisés en {time.perf_counter() - start_time:.2f}s "
+                    f"sur {self.workers} voix")
+        return results
+
+    def close(self):
+        """Libère toutes les voix"""
+        for processor in self._processors:
+            processor.close()
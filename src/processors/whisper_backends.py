@@ -0,0 +1,183 @@
+import logging
+from typing import Dict, Optional
+
+import numpy as np
+import torch
+
+from src.utils.audio_buffer import AudioBuffer
+from src.utils.model_registry import get_registry
+
+logger = logging.getLogger(__name__)
+
+
+def resolve_device(device: Optional[str]) -> str:
+    """Résout le périphérique demandé (`auto` ou absent : GPU si disponible)"""
+    if device in (None, "auto"):
+        return "cuda" if torch.cuda.is_available() else "cpu"
+    return device
+
+
+def quantize_linear_int8(model: torch.nn.Module) -> torch.nn.Module:
+    """
+    Quantification dynamique int8 des couches linéaires d'un modèle (sur CPU).
+
+    `quantize_dynamic` ne reconnaît que le type exact nn.Linear : les sous-classes (comme
+    whisper.model.Linear) sont d'abord remplacées par des nn.Linear partageant leurs poids.
+    """
+    for parent in list(model.modules()):
+        for name, child in list(parent.named_children()):
+            if isinstance(child, torch.nn.Linear) and type(child) is not torch.nn.Linear:
+                linear = torch.nn.Linear(child.in_features, child.out_features,
+                                         bias=child.bias is not None, device="meta")
+                linear.weight = child.weight
+                linear.bias = child.bias
+                setattr(parent, name, linear)
+    model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    n_quantized = sum(isinstance(m, torch.ao.nn.quantized.dynamic.Linear) for m in model.modules())
+    if n_quantized == 0:
+        raise RuntimeError("Quantification int8 : aucune couche linéaire n'a été quantifiée")
+    logger.info(f"{n_quantized} couches linéaires quantifiées en int8")
+    return model
+
+
+class OpenAIWhisperBackend:
+    """Moteur openai-whisper (PyTorch), quantifié dynamiquement en int8 sur CPU si demandé"""
+
+    name = "openai"
+
+    def __init__(self, model_name: str, device: str, compute_type: Optional[str] = None):
+        self.device = device
+        self.compute_type = compute_type
+        self.model_name = model_name
+        self.model  # Chargement immédiat
+
+    @property
+    def model(self):
+        """Modèle demandé au registre à chaque usage, pour qu'une éviction libère réellement sa mémoire"""
+        return get_registry().get(
+            "whisper", self.model_name,
+            lambda: self._load(self.model_name),
+            device=self.device,
+            compute_type=self.compute_type
+        )
+
+    def _load(self, model_name: str):
+        import whisper
+        model = whisper.load_model(model_name, device=self.device)
+        if self.compute_type == "int8" and self.device == "cpu":
+            logger.info("Quantification dynamique int8 des couches linéaires de Whisper")
+            model = quantize_linear_int8(model)
+        return model
+
+    def detect_language(self, buffer: AudioBuffer) -> str:
+        model = self.model
+        mel = buffer.first_window_mel(model.dims.n_mels).to(self.device)
+        logger.info(f"Forme du spectrogramme (30s): {mel.shape}")
+        _, probs = model.detect_language(mel)
+        return max(probs, key=probs.get)
+
+    def transcribe(self, samples: np.ndarray, **options) -> Dict:
+        return self.model.transcribe(samples, **options)
+
+
+class FasterWhisperBackend:
+    """Moteur faster-whisper (CTranslate2), avec poids quantifiés (int8, int8_float16...)"""
+
+    name = "faster-whisper"
+
+    def __init__(self, model_name: str, device: str, compute_type: Optional[str] = None):
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError as e:
+            raise ImportError("Le moteur faster-whisper nécessite le paquet faster-whisper "
+                              "(pip install faster-whisper)") from e
+        self.device = device
+        self.compute_type = compute_type or ("int8" if device == "cpu" else "float16")
+        self.model_name = model_name
+        self._model_class = WhisperModel
+        self.model  # Chargement immédiat
+
+    @property
+    def model(self):
+        """Modèle demandé au registre à chaque usage, pour qu'une éviction libère réellement sa mémoire"""
+        return get_registry().get(
+            "faster-whisper", self.model_name,
+            lambda: self._model_class(
+                self.model_name,
+                device=self.device,
+                compute_type=self.compute_type,
+                cpu_threads=torch.get_num_threads()
+            ),
+            device=self.device,
+            compute_type=self.compute_type
+        )
+
+    def detect_language(self, buffer: AudioBuffer) -> str:
+        # La langue est détectée avant la consommation du générateur de segments
+        _, info = self.model.transcribe(buffer.slice(0, 30), beam_size=1)
+        logger.info(f"Probabilité de la langue {info.language}: {info.language_probability:.3f}")
+        return info.language
+
+    def transcribe(self, samples: np.ndarray, **options) -> Dict:
+        """Transcrit et retourne un résultat au format openai-whisper"""
+        segments, info = self.model.transcribe(
+            samples,
+            language=options.get("language"),
+            task=options.get("task", "transcribe"),
+            beam_size=options.get("beam_size", 5),
+            best_of=options.get("best_of", 5),
+            temperature=options.get("temperature", 0.0),
+            condition_on_previous_text=options.get("condition_on_previous_text", True),
+            no_speech_threshold=options.get("no_speech_threshold", 0.6),
+            compression_ratio_threshold=options.get("compression_ratio_threshold", 2.4),
+            log_prob_threshold=options.get("logprob_threshold", -1.0),
+            initial_prompt=options.get("initial_prompt"),
+            suppress_tokens=options.get("suppress_tokens", [-1]),
+            word_timestamps=options.get("word_timestamps", False)
+        )
+        converted = []
+        for seg in segments:
+            converted.append({
+                "id": seg.id,
+                "seek": seg.seek,
+                "start": seg.start,
+                "end": seg.end,
+                "text": seg.text,
+                "tokens": list(seg.tokens),
+                "temperature": seg.temperature,
+                "avg_logprob": seg.avg_logprob,
+                "compression_ratio": seg.compression_ratio,
+                "no_speech_prob": seg.no_speech_prob,
+                "words": [
+                    {"word": w.word, "start": w.start, "end": w.end, "probability": w.probability}
+                    for w in (seg.words or [])
+                ]
+            })
+        return {
+            "text": "".join(seg["text"] for seg in converted),
+            "segments": converted,
+            "language": info.language
+        }
+
+
+BACKENDS = {
+    OpenAIWhisperBackend.name: OpenAIWhisperBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend,
+}
+
+
+def create_backend(backend: str, model_name: str, device: Optional[str] = None, compute_type: Optional[str] = None):
+    """
+    Crée le moteur de transcription demandé.
+
+    Args:
+        backend (str): `openai` ou `faster-whisper`
+        model_name (str): Nom du modèle Whisper
+        device (Optional[str]): Périphérique (`cpu`, `cuda` ou `auto`)
+        compute_type (Optional[str]): Précision de calcul (`int8`, `float16`, `float32`...)
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Moteur de transcription inconnu : {backend} (disponibles : {', '.join(BACKENDS)})")
+    device = resolve_device(device)
+    logger.info(f"Moteur de transcription {backend} sur {device} ({compute_type or 'précision par défaut'})")
+    return BACKENDS[backend](model_name, device, compute_type)
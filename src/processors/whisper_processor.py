@@ -1,177 +1,569 @@
 import logging
+import multiprocessing
+import os
 import torch
 import whisper
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from src.utils.audio_buffer import AudioBuffer
+from src.utils.audio_chunker import find_chunk_boundaries
+from src.utils.transcription_cache import TranscriptionCache
+from src.utils.vad import detect_speech_regions
+from src.utils.timeline import FLAG_ESCALATED, SegmentTimeline
 from src.utils.types import TranscriptionResult
+from src.processors.whisper_backends import OpenAIWhisperBackend, create_backend
 
 logger = logging.getLogger(__name__)
 
+# Moteur chargé dans chaque processus du pool de transcription parallèle
+_worker_backend = None
+
+# Durée représentée par un jeton de timestamp Whisper (2 trames mel de 10 ms)
+TIME_PRECISION = 0.02
+
+# Seuils par défaut du mode cascade : au-delà, un segment est redécodé par le modèle principal
+CASCADE_DEFAULTS = {
+    "min_avg_logprob": -0.7,
+    "max_compression_ratio": 2.2,
+    "max_no_speech_prob": 0.5,
+    "padding": 0.2
+}
+
+def _decode_options(language: str, device: str) -> Dict:
+    """Paramètres de décodage optimisés pour la précision des timestamps"""
+    return dict(
+        verbose=False,
+        language=language,
+        task="transcribe",
+        fp16=False if device == "cpu" else True,
+        beam_size=5,  # Réduction pour éviter le crash
+        best_of=5,    # Réduction pour éviter le crash
+        temperature=0.0,
+        condition_on_previous_text=True,
+        no_speech_threshold=0.6,
+        compression_ratio_threshold=2.4,
+        logprob_threshold=-1.0,
+        # word_timestamps=True,  # Désactivé pour test
+        initial_prompt=None,   # Pas de prompt initial pour éviter les biais
+        suppress_tokens=[]    # Pas de suppression de tokens
+    )
+
+def _init_worker(backend: str, model_name: str, device: str, compute_type: Optional[str], threads: int) -> None:
+    """Charge le modèle une seule fois par processus du pool"""
+    global _worker_backend
+    torch.set_num_threads(threads)
+    _worker_backend = create_backend(backend, model_name, device, compute_type)
+
+def _transcribe_chunk(samples: np.ndarray, offset: float, language: str, device: str) -> Dict:
+    """Transcrit un morceau dans un processus du pool et recale ses timestamps"""
+    result = _worker_backend.transcribe(samples, **_decode_options(language, device))
+    for seg in result["segments"]:
+        seg["start"] += offset
+        seg["end"] += offset
+        for word in seg.get("words", []):
+            word["start"] += offset
+            word["end"] += offset
+    return result
+
 class WhisperProcessor:
     """Gestionnaire des opérations Whisper"""
-    def __init__(self, model_name: str = "base"):
-        self.model = whisper.load_model(model_name)
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+    def __init__(
+        self,
+        model_name: str = "base",
+        workers: int = 1,
+        chunk_seconds: float = 300,
+        cache: Optional[TranscriptionCache] = None,
+        batch_size: int = 1,
+        backend: str = "openai",
+        device: Optional[str] = None,
+        compute_type: Optional[str] = None,
+        cascade: Optional[Dict] = None
+    ):
+        """
+        Args:
+            model_name (str): Nom du modèle Whisper
+            workers (int): Nombre de processus de transcription (1 = séquentiel)
+            chunk_seconds (float): Durée maximale d'un morceau en mode parallèle
+            cache (Optional[TranscriptionCache]): Cache disque des transcriptions
+            batch_size (int): Nombre de fenêtres de 30 s décodées ensemble (1 = décodage Whisper standard)
+            backend (str): Moteur d'inférence (`openai` ou `faster-whisper`)
+            device (Optional[str]): Périphérique (`cpu`, `cuda`, `auto` ; auto par défaut)
+            compute_type (Optional[str]): Précision de calcul (`int8` pour l'inférence quantifiée sur CPU)
+            cascade (Optional[Dict]): Mode cascade : `draft_model` (modèle rapide) et seuils d'escalade
+        """
+        self.model_name = model_name
+        self.workers = workers
+        self.chunk_seconds = chunk_seconds
+        self.cache = cache
+        self.batch_size = batch_size
+        self.compute_type = compute_type
+        self.cascade = {**CASCADE_DEFAULTS, **cascade} if cascade and cascade.get('draft_model') else None
+        self.backend = create_backend(backend, model_name, device, compute_type)
+        self.device = self.backend.device
         logger.info(f"Utilisation du modèle Whisper {model_name} sur {self.device}")
 
-    def detect_speech_boundaries(self, audio: np.ndarray, min_silence_duration: float = 0.1) -> tuple[float, float]:
+    @classmethod
+    def from_config(cls, config: Dict, cache: Optional[TranscriptionCache] = None) -> "WhisperProcessor":
+        """Crée le processeur à partir de la section `whisper` de la configuration"""
+        return cls(
+            config.get('model', config.get('model_name', 'base')),
+            workers=config.get('workers', 1),
+            chunk_seconds=config.get('chunk_seconds', 300),
+            cache=cache,
+            batch_size=config.get('batch_size', 1),
+            backend=config.get('backend', 'openai'),
+            device=config.get('device'),
+            compute_type=config.get('compute_type'),
+            cascade=config.get('cascade')
+        )
+
+    def _as_buffer(self, audio: Union[str, np.ndarray, AudioBuffer]) -> AudioBuffer:
+        """Normalise l'entrée audio en tampon partagé (décodage ffmpeg uniquement pour un chemin)"""
+        if isinstance(audio, AudioBuffer):
+            return audio
+        if isinstance(audio, np.ndarray):
+            return AudioBuffer(audio)
+        return AudioBuffer.from_file(str(audio))
+
+    def detect_speech_boundaries(
+        self,
+        audio: Union[np.ndarray, AudioBuffer],
+        min_silence_duration: float = 0.1,
+        return_regions: bool = False
+    ) -> tuple:
         """
-        Détecte le début et la fin de la parole en utilisant le modèle Whisper.
+        Détecte le début et la fin de la parole sur tout le fichier, par détection
+        d'activité vocale vectorisée (énergie, platitude spectrale, passages par zéro)
+        plutôt que par décodage Whisper.
         
         Args:
-            audio (np.ndarray): Signal audio
+            audio (Union[np.ndarray, AudioBuffer]): Signal audio ou tampon partagé
             min_silence_duration (float): Durée minimale du silence en secondes
+            return_regions (bool): Retourner aussi la liste complète des zones de parole
             
         Returns:
-            tuple[float, float]: Timestamps du début et de la fin de la parole
+            tuple[float, float]: Timestamps du début et de la fin de la parole,
+                suivis de la liste des zones (début, fin) si `return_regions` est vrai
         """
-        # Découpage de l'audio en segments de 5 secondes pour une meilleure précision
-        segment_duration = 5
-        sample_rate = 16000  # Whisper utilise 16kHz
-        segment_samples = segment_duration * sample_rate
-        
-        # Analyse des segments pour détecter la parole
-        speech_segments = []
-        speech_probs = []
-        
-        # Analyse des 30 premières secondes avec une précision plus fine
-        for i in range(0, min(len(audio), 30 * sample_rate), segment_samples):
-            segment = audio[i:i + segment_samples]
-            if len(segment) < sample_rate:  # Ignorer les segments trop courts
-                continue
-                
-            # Création du spectrogramme pour le segment
-            mel = whisper.log_mel_spectrogram(segment).to(self.device)
-            
-            # Détection de la parole avec Whisper
-            result = self.model.transcribe(
-                segment,
-                verbose=False,
-                task="transcribe",
-                fp16=False if self.device == "cpu" else True,
-                beam_size=5,
-                best_of=5,
-                temperature=0.0
-            )
-            
-            # Log détaillé pour chaque segment
-            segment_start = i / sample_rate
-            segment_end = (i + len(segment)) / sample_rate
-            no_speech_prob = result["segments"][0].get("no_speech_prob", 1.0) if result["segments"] else 1.0
-            has_speech = no_speech_prob < 0.5  # Seuil plus permissif
-            
-            logger.info(f"Segment {segment_start:.2f}-{segment_end:.2f}s: "
-                       f"Parole détectée: {has_speech}, "
-                       f"Probabilité de non-parole: {no_speech_prob:.3f}")
-            
-            speech_probs.append((segment_start, no_speech_prob))
-            
-            if has_speech:
-                speech_segments.append((segment_start, segment_end))
+        buffer = self._as_buffer(audio)
+        regions = detect_speech_regions(
+            buffer.samples,
+            buffer.sample_rate,
+            min_silence_duration=min_silence_duration
+        )
         
-        if not speech_segments:
+        if not regions:
             logger.warning("Aucun segment de parole détecté")
-            return 0.0, len(audio) / sample_rate
-            
-        # Analyse des probabilités pour trouver le point de transition
-        speech_probs = np.array(speech_probs)
-        # Chercher le premier point où la probabilité de non-parole chute significativement
-        for i in range(1, len(speech_probs)):
-            if speech_probs[i-1][1] > 0.8 and speech_probs[i][1] < 0.5:
-                start_time = speech_probs[i][0]
-                logger.info(f"Transition détectée à {start_time:.2f}s "
-                          f"(prob: {speech_probs[i-1][1]:.3f} -> {speech_probs[i][1]:.3f})")
-                break
+            start_time, end_time = 0.0, buffer.duration
         else:
-            start_time = speech_segments[0][0]
-        
-        # Trouver le dernier segment avec de la parole
-        end_time = speech_segments[-1][1]
-        
-        logger.info(f"Segments de parole détectés: {speech_segments}")
-        logger.info(f"Début de la parole détecté à {start_time:.2f} secondes")
-        logger.info(f"Fin de la parole détecté à {end_time:.2f} secondes")
+            start_time, end_time = regions[0][0], regions[-1][1]
+            logger.info(f"{len(regions)} zones de parole détectées")
+            logger.info(f"Début de la parole détecté à {start_time:.2f} secondes")
+            logger.info(f"Fin de la parole détecté à {end_time:.2f} secondes")
         
+        if return_regions:
+            return start_time, end_time, regions
         return start_time, end_time
 
-    def transcribe(self, audio_path: str, target_language: str = None) -> TranscriptionResult:
-        """Transcrit une vidéo avec Whisper"""
+    def detect_language(self, audio: Union[str, AudioBuffer], target_language: Optional[str] = None) -> str:
+        """Détecte la langue sur les 30 premières secondes si elle n'est pas spécifiée"""
+        buffer = self._as_buffer(audio)
+        if target_language is not None:
+            logger.info(f"Langue détectée: {target_language}")
+            return target_language
+
+        # Détection sur la première fenêtre de 30s
+        detected_language = self.backend.detect_language(buffer)
+        logger.info(f"Langue détectée: {detected_language}")
+        return detected_language
+
+    def _modes(self, buffer: AudioBuffer) -> Tuple[bool, bool, bool]:
+        """Mode de transcription de `transcribe` pour cet audio : (parallèle, cascade, par lots)"""
+        parallel = self.workers > 1 and buffer.duration > self.chunk_seconds
+        cascade = not parallel and self.cascade is not None
+        batched = (not parallel and not cascade and self.batch_size > 1
+                   and self.backend.name == OpenAIWhisperBackend.name)
+        return parallel, cascade, batched
+
+    def _cache_key(self, buffer: AudioBuffer, target_language: Optional[str]) -> Optional[str]:
+        """Clé de cache de la transcription de `transcribe`, ou None sans cache"""
+        if self.cache is None:
+            return None
+        parallel, cascade, batched = self._modes(buffer)
+        options = _decode_options(target_language, self.device)
+        options["chunk_seconds"] = self.chunk_seconds if parallel else None
+        options["batch_size"] = self.batch_size if batched else 1
+        options["backend"] = self.backend.name
+        options["compute_type"] = self.compute_type
+        options["cascade"] = self.cascade if cascade else None
+        return self.cache.make_key(buffer.digest(), self.model_name, target_language, options)
+
+    def cached_transcription(self, audio: Union[str, AudioBuffer],
+                             target_language: str = None) -> Optional[TranscriptionResult]:
+        """Transcription en cache que `transcribe` retournerait pour cet audio, ou None"""
+        cache_key = self._cache_key(self._as_buffer(audio), target_language)
+        return self.cache.get(cache_key) if cache_key is not None else None
+
+    def transcribe(self, audio: Union[str, AudioBuffer], target_language: str = None) -> TranscriptionResult:
+        """
+        Transcrit une vidéo avec Whisper.
+        
+        Args:
+            audio (Union[str, AudioBuffer]): Chemin du fichier ou tampon déjà décodé.
+                Avec un tampon, aucun nouveau décodage ffmpeg n'est effectué.
+            target_language (str): Langue de la transcription (détectée si None)
+        """
         try:
-            # Chargement de l'audio sans padding ni trimming
-            audio = whisper.load_audio(audio_path)
-            logger.info(f"Durée totale de l'audio: {len(audio)/16000:.2f} secondes")
-
-            # Pour la détection de langue, Whisper attend un spectrogramme de 30s max
-            audio_30s = audio[:30*16000]  # 30 secondes à 16kHz
-            mel = whisper.log_mel_spectrogram(audio_30s).to(self.device)
-            logger.info(f"Forme du spectrogramme (30s): {mel.shape}")
-
-            # Détection de la langue si non spécifiée
-            if target_language is None:
-                _, probs = self.model.detect_language(mel)
-                detected_language = max(probs, key=probs.get)
+            # Décodage unique de l'audio (sans padding ni trimming)
+            buffer = self._as_buffer(audio)
+            logger.info(f"Durée totale de l'audio: {buffer.duration:.2f} secondes")
+
+            parallel, cascade, batched = self._modes(buffer)
+            cache_key = self._cache_key(buffer, target_language)
+            if cache_key is not None:
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    return cached
+
+            detected_language = self.detect_language(buffer, target_language)
+
+            if parallel:
+                transcription = self.transcribe_parallel(buffer, detected_language)
+            elif cascade:
+                transcription = self.transcribe_cascade(buffer, detected_language)
+            elif batched:
+                transcription = self.transcribe_batched(buffer, detected_language)
             else:
-                detected_language = target_language
-            logger.info(f"Langue détectée: {detected_language}")
-
-            # Transcription avec les paramètres optimisés pour la précision des timestamps
-            result = self.model.transcribe(
-                audio_path,  # On repasse le chemin du fichier audio
-                verbose=False,
-                language=detected_language,
-                task="transcribe",
-                fp16=False if self.device == "cpu" else True,
-                beam_size=5,  # Réduction pour éviter le crash
-                best_of=5,    # Réduction pour éviter le crash
-                temperature=0.0,
-                condition_on_previous_text=True,
-                no_speech_threshold=0.6,
-                compression_ratio_threshold=2.4,
-                logprob_threshold=-1.0,
-                # word_timestamps=True,  # Désactivé pour test
-                initial_prompt=None,   # Pas de prompt initial pour éviter les biais
-                suppress_tokens=[]    # Pas de suppression de tokens
-            )
-
-            # Vérification et ajustement des timestamps
-            segments = result["segments"]
-            for i, seg in enumerate(segments):
-                # Vérification de la cohérence des timestamps
-                if i > 0:
-                    prev_end = segments[i-1]["end"]
-                    if seg["start"] < prev_end:
-                        logger.warning(f"Chevauchement détecté entre les segments {i-1} et {i}")
-                        # Ajustement du début du segment actuel
-                        seg["start"] = prev_end
-                
-                # Vérification de la durée minimale
-                if seg["end"] - seg["start"] < 0.1:  # 100ms minimum
-                    logger.warning(f"Segment {i} trop court: {seg['end'] - seg['start']:.3f}s")
-                    if i > 0:
-                        # Fusion avec le segment précédent
-                        segments[i-1]["end"] = seg["end"]
-                        segments[i-1]["text"] += " " + seg["text"]
-                        segments.pop(i)
-                        i -= 1
-
-            # Log détaillé des segments avec vérification des timestamps
-            logger.info("Segments détectés avec timestamps:")
-            for i, seg in enumerate(segments):
-                logger.info(f"Segment {i}: {seg['start']:.3f}s - {seg['end']:.3f}s (durée: {seg['end'] - seg['start']:.3f}s): {seg['text']}")
-                if "words" in seg:
-                    logger.info(f"  Mots: {[(w['word'], w['start'], w['end']) for w in seg['words']]}")
-
-            return TranscriptionResult(
-                text=result["text"],
-                segments=segments,
-                timestamps=[{
-                    "start": seg["start"],
-                    "end": seg["end"],
-                    "text": seg["text"],
-                    "confidence": seg.get("confidence", 0.0),
-                    "words": seg.get("words", [])  # Inclusion des timestamps au niveau des mots
-                } for seg in segments],
-                language=detected_language
-            )
+                # Transcription avec les paramètres optimisés pour la précision des timestamps
+                result = self.backend.transcribe(
+                    buffer.samples,  # Signal déjà décodé, pas de second passage par ffmpeg
+                    **_decode_options(detected_language, self.device)
+                )
+                transcription = self.build_result(result["text"], result["segments"], detected_language)
+
+            if cache_key is not None:
+                self.cache.put(cache_key, transcription)
+            return transcription
         except Exception as e:
             logger.error(f"Erreur lors de la transcription: {e}")
-            raise 
\ No newline at end of file
+            raise
+
+    def transcribe_parallel(
+        self,
+        audio: Union[str, AudioBuffer],
+        target_language: str = None,
+        workers: Optional[int] = None,
+        chunk_seconds: Optional[float] = None
+    ) -> TranscriptionResult:
+        """
+        Transcrit l'audio découpé sur les silences, en parallèle sur un pool de processus.
+        
+        Chaque processus charge son propre modèle ; les timestamps des segments sont
+        recalés sur la position de leur morceau puis réunis dans un seul résultat.
+        
+        Args:
+            audio (Union[str, AudioBuffer]): Chemin du fichier ou tampon déjà décodé
+            target_language (str): Langue de la transcription (détectée si None)
+            workers (Optional[int]): Nombre de processus (par défaut celui du constructeur)
+            chunk_seconds (Optional[float]): Durée maximale d'un morceau
+        """
+        buffer = self._as_buffer(audio)
+        language = self.detect_language(buffer, target_language)
+        workers = workers or self.workers
+        chunk_seconds = chunk_seconds or self.chunk_seconds
+
+        regions = detect_speech_regions(buffer.samples, buffer.sample_rate)
+        boundaries = find_chunk_boundaries(
+            buffer.samples, buffer.sample_rate, chunk_seconds, speech_regions=regions
+        )
+        workers = max(1, min(workers, len(boundaries)))
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        logger.info(f"Transcription parallèle : {len(boundaries)} morceaux, "
+                    f"{workers} processus de {threads} threads")
+
+        # "spawn" évite de dupliquer l'état de PyTorch du processus parent
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self.backend.name, self.model_name, self.device, self.compute_type, threads)
+        ) as executor:
+            futures = [
+                executor.submit(
+                    _transcribe_chunk,
+                    buffer.samples[start:end],
+                    start / buffer.sample_rate,
+                    language,
+                    self.device
+                )
+                for start, end in boundaries
+            ]
+            results = [future.result() for future in futures]
+
+        segments = []
+        for result in results:
+            segments.extend(result["segments"])
+        for i, seg in enumerate(segments):
+            seg["id"] = i
+        text = " ".join(result["text"].strip() for result in results if result["text"].strip())
+        return self.build_result(text, segments, language)
+
+    def transcribe_cascade(self, audio: Union[str, AudioBuffer], target_language: str = None) -> TranscriptionResult:
+        """
+        Transcrit d'abord avec un modèle rapide, puis redécode avec le modèle principal
+        uniquement les segments incertains (avg_logprob, compression_ratio ou
+        no_speech_prob hors des seuils) et les réinsère dans la timeline.
+        
+        La part de l'audio redécodée est indiquée dans `stats` du résultat.
+        
+        Args:
+            audio (Union[str, AudioBuffer]): Chemin du fichier ou tampon déjà décodé
+            target_language (str): Langue de la transcription (détectée si None)
+        """
+        if self.cascade is None:
+            raise ValueError("Le mode cascade nécessite whisper.cascade.draft_model dans la configuration")
+        buffer = self._as_buffer(audio)
+        language = self.detect_language(buffer, target_language)
+        options = _decode_options(language, self.device)
+        
+        draft_backend = create_backend(
+            self.backend.name, self.cascade['draft_model'], self.device, self.compute_type
+        )
+        logger.info(f"Cascade : transcription rapide avec le modèle {self.cascade['draft_model']}")
+        draft = SegmentTimeline.from_segments(draft_backend.transcribe(buffer.samples, **options)["segments"])
+        
+        uncertain = draft.vocal_mask & (
+            (draft.avg_logprob < self.cascade['min_avg_logprob'])
+            | (draft.compression_ratio > self.cascade['max_compression_ratio'])
+            | (draft.no_speech_prob > self.cascade['max_no_speech_prob'])
+        )
+        
+        # Plages contiguës de segments incertains, élargies sans empiéter sur les segments conservés
+        edges = np.diff(uncertain.astype(np.int8), prepend=0, append=0)
+        first, last = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1) - 1
+        padding = self.cascade['padding']
+        span_starts = draft.start[first] - padding
+        span_ends = draft.end[last] + padding
+        has_prev = first > 0
+        span_starts[has_prev] = np.maximum(span_starts[has_prev], draft.end[first[has_prev] - 1])
+        has_next = last < len(draft) - 1
+        span_ends[has_next] = np.minimum(span_ends[has_next], draft.start[last[has_next] + 1])
+        span_starts = np.clip(span_starts, 0.0, buffer.duration)
+        span_ends = np.clip(span_ends, 0.0, buffer.duration)
+        
+        # Plages trop courtes pour être redécodées : leurs segments du brouillon sont conservés
+        decoded = (span_ends - span_starts) >= 0.1
+        span_of_segment = np.cumsum(edges[:-1] == 1) - 1
+        escalated_mask = np.zeros(len(draft), dtype=bool)
+        escalated_mask[uncertain] = decoded[span_of_segment[uncertain]]
+        
+        refined = []
+        for span_start, span_end in zip(span_starts[decoded].tolist(), span_ends[decoded].tolist()):
+            result = self.backend.transcribe(buffer.slice(span_start, span_end), **options)
+            timeline = SegmentTimeline.from_segments(result["segments"]).shift(span_start)
+            timeline.flags |= FLAG_ESCALATED
+            refined.append(timeline)
+        
+        merged = SegmentTimeline.concatenate([draft.take(~escalated_mask)] + refined)
+        merged = merged.take(np.argsort(merged.start, kind='stable'))
+        
+        escalated = float(np.sum(span_ends[decoded] - span_starts[decoded]))
+        speech = float(np.sum(draft.durations[draft.vocal_mask]))
+        stats = {
+            "draft_model": self.cascade['draft_model'],
+            "escalated_segments": int(escalated_mask.sum()),
+            "escalated_seconds": escalated,
+            "escalated_fraction": escalated / buffer.duration if buffer.duration else 0.0,
+            "escalated_speech_fraction": escalated / speech if speech else 0.0
+        }
+        logger.info(f"Cascade : {stats['escalated_segments']}/{len(draft)} segments redécodés, "
+                    f"{stats['escalated_fraction']:.1%} de l'audio ({escalated:.1f}s)")
+        
+        transcription = self.build_result(" ".join(t.strip() for t in merged.texts), merged, language)
+        transcription.stats.update(stats)
+        return transcription
+
+    def transcribe_batched(
+        self,
+        audio: Union[str, AudioBuffer],
+        target_language: str = None,
+        batch_size: Optional[int] = None
+    ) -> TranscriptionResult:
+        """
+        Transcrit l'audio en décodant plusieurs fenêtres de 30 s indépendantes dans un même lot.
+        
+        Les fenêtres sont coupées sur les silences détectés par la VAD, leurs spectrogrammes
+        sont extraits du log-mel partagé du tampon, puis décodés par lots (lot × faisceau),
+        ce qui occupe mieux les multiplications matricielles sur CPU. Les fenêtres étant
+        indépendantes, le texte précédent n'est pas utilisé comme contexte et il n'y a pas
+        de repli en température.
+        
+        Args:
+            audio (Union[str, AudioBuffer]): Chemin du fichier ou tampon déjà décodé
+            target_language (str): Langue de la transcription (détectée si None)
+            batch_size (Optional[int]): Nombre de fenêtres par lot (par défaut celui du constructeur)
+        """
+        if self.backend.name != OpenAIWhisperBackend.name:
+            raise ValueError(f"Le décodage par lots nécessite le moteur openai (moteur actuel : {self.backend.name})")
+        buffer = self._as_buffer(audio)
+        language = self.detect_language(buffer, target_language)
+        batch_size = batch_size or self.batch_size
+        
+        regions = detect_speech_regions(buffer.samples, buffer.sample_rate)
+        boundaries = find_chunk_boundaries(
+            buffer.samples, buffer.sample_rate, whisper.audio.CHUNK_LENGTH, speech_regions=regions
+        )
+        # Pas de décodage pour les fenêtres sans parole
+        if regions:
+            boundaries = [
+                (start, end) for start, end in boundaries
+                if any(r_start < end / buffer.sample_rate and r_end > start / buffer.sample_rate
+                       for r_start, r_end in regions)
+            ]
+        
+        model = self.backend.model
+        n_mels = model.dims.n_mels
+        mel = buffer.log_mel(n_mels, padding=whisper.audio.N_SAMPLES)
+        hop = whisper.audio.HOP_LENGTH
+        tokenizer = whisper.tokenizer.get_tokenizer(
+            model.is_multilingual,
+            num_languages=model.num_languages,
+            language=language,
+            task="transcribe"
+        )
+        options = whisper.DecodingOptions(
+            task="transcribe",
+            language=language,
+            temperature=0.0,
+            beam_size=5,
+            fp16=False if self.device == "cpu" else True,
+            suppress_tokens=[]
+        )
+        logger.info(f"Décodage par lots : {len(boundaries)} fenêtres, lots de {batch_size}")
+        
+        segments = []
+        for batch_start in range(0, len(boundaries), batch_size):
+            batch = boundaries[batch_start:batch_start + batch_size]
+            mel_batch = torch.stack([
+                whisper.pad_or_trim(mel[:, start // hop:end // hop], whisper.audio.N_FRAMES)
+                for start, end in batch
+            ]).to(self.device)
+            results = whisper.decode(model, mel_batch, options)
+            for (start, end), result in zip(batch, results):
+                # Même critère de non-parole que Whisper
+                if result.no_speech_prob > 0.6 and result.avg_logprob < -1.0:
+                    continue
+                offset = start / buffer.sample_rate
+                duration = (end - start) / buffer.sample_rate
+                for seg in self._tokens_to_segments(result, tokenizer, offset, duration, start // hop):
+                    seg["id"] = len(segments)
+                    segments.append(seg)
+            logger.info(f"Lot {batch_start // batch_size + 1}/{-(-len(boundaries) // batch_size)} décodé")
+        
+        text = " ".join(seg["text"].strip() for seg in segments)
+        return self.build_result(text, segments, language)
+
+    @staticmethod
+    def _tokens_to_segments(result, tokenizer, offset: float, duration: float, seek: int) -> List[Dict]:
+        """Découpe les jetons d'une fenêtre décodée en segments, d'après les jetons de timestamp"""
+        segments = []
+        current: List[int] = []
+        seg_start = 0.0
+        
+        def close(end: float) -> None:
+            text = tokenizer.decode(current)
+            if text.strip():
+                segments.append({
+                    "seek": seek,
+                    "start": offset + seg_start,
+                    "end": offset + min(max(end, seg_start), duration),
+                    "text": text,
+                    "tokens": list(current),
+                    "temperature": 0.0,
+                    "avg_logprob": result.avg_logprob,
+                    "compression_ratio": result.compression_ratio,
+                    "no_speech_prob": result.no_speech_prob
+                })
+        
+        for token in result.tokens:
+            if token >= tokenizer.timestamp_begin:
+                timestamp = (token - tokenizer.timestamp_begin) * TIME_PRECISION
+                if current:
+                    close(timestamp)
+                    current = []
+                seg_start = timestamp
+            else:
+                current.append(token)
+        if current:
+            close(duration)
+        return segments
+
+    def iter_segments(
+        self,
+        audio: Union[str, AudioBuffer],
+        target_language: str = None,
+        window_seconds: float = 30
+    ) -> Iterator[Dict]:
+        """
+        Transcrit l'audio fenêtre par fenêtre et produit chaque segment dès que sa fenêtre est décodée.
+        
+        Les fenêtres (30 s au plus) sont coupées sur les silences détectés par la VAD,
+        pour que les étapes suivantes (traduction, TTS) démarrent avant la fin de Whisper.
+        
+        Args:
+            audio (Union[str, AudioBuffer]): Chemin du fichier ou tampon déjà décodé
+            target_language (str): Langue de la transcription (détectée si None)
+            window_seconds (float): Durée maximale d'une fenêtre
+            
+        Yields:
+            Dict: Segment finalisé, timestamps exprimés sur le fichier complet
+        """
+        buffer = self._as_buffer(audio)
+        language = self.detect_language(buffer, target_language)
+        regions = detect_speech_regions(buffer.samples, buffer.sample_rate)
+        boundaries = find_chunk_boundaries(
+            buffer.samples, buffer.sample_rate, window_seconds, speech_regions=regions
+        )
+        
+        segment_id = 0
+        prev_end = 0.0
+        for start, end in boundaries:
+            offset = start / buffer.sample_rate
+            window_end = end / buffer.sample_rate
+            # Pas de décodage pour les fenêtres sans parole
+            if regions and not any(r_start < window_end and r_end > offset for r_start, r_end in regions):
+                continue
+            result = self.backend.transcribe(buffer.samples[start:end], **_decode_options(language, self.device))
+            for seg in result["segments"]:
+                seg["id"] = segment_id
+                seg["start"] = max(seg["start"] + offset, prev_end)
+                seg["end"] = max(seg["end"] + offset, seg["start"])
+                for word in seg.get("words", []):
+                    word["start"] += offset
+                    word["end"] += offset
+                prev_end = seg["end"]
+                segment_id += 1
+                yield seg
+
+    def build_result(
+        self,
+        text: str,
+        segments: Union[List[Dict], SegmentTimeline],
+        language: str
+    ) -> TranscriptionResult:
+        """Vérifie les timestamps des segments et construit le résultat de la transcription"""
+        if not isinstance(segments, SegmentTimeline):
+            segments = SegmentTimeline.from_segments(segments)
+        # Chevauchements corrigés et segments de moins de 100 ms fusionnés, en temps linéaire
+        timeline = segments.normalize(min_duration=0.1)
+
+        # Log détaillé des segments avec vérification des timestamps
+        logger.info("Segments détectés avec timestamps:")
+        for i, (start, end, seg_text) in enumerate(zip(timeline.start.tolist(), timeline.end.tolist(), timeline.texts)):
+            logger.info(f"Segment {i}: {start:.3f}s - {end:.3f}s (durée: {end - start:.3f}s): {seg_text}")
+            if timeline.words[i]:
+                logger.info(f"  Mots: {[(w['word'], w['start'], w['end']) for w in timeline.words[i]]}")
+
+        return TranscriptionResult(text=text, timeline=timeline, language=language)
@@ -0,0 +1,117 @@
+import hashlib
+import logging
+import subprocess
+import wave
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000  # Whisper travaille en 16 kHz mono
+WINDOW_SECONDS = 30  # Fenêtre d'analyse de Whisper
+
+
+class AudioBuffer:
+    """Audio décodé une seule fois en mémoire (float32 mono), partagé entre les étapes du pipeline"""
+
+    def __init__(self, samples: np.ndarray, sample_rate: int = SAMPLE_RATE, source: Optional[str] = None):
+        self.samples = np.ascontiguousarray(samples, dtype=np.float32)
+        self.sample_rate = sample_rate
+        self.source = source
+        self._mel_cache: Dict[Tuple, object] = {}
+        self._digest: Optional[str] = None
+
+    @classmethod
+    def from_file(cls, path: str, sample_rate: int = SAMPLE_RATE) -> "AudioBuffer":
+        """
+        Décode un fichier audio ou vidéo avec ffmpeg, en une seule passe.
+
+        Args:
+            path (str): Chemin vers le fichier audio ou vidéo
+            sample_rate (int): Fréquence d'échantillonnage cible
+
+        Returns:
+            AudioBuffer: Le signal décodé en float32 mono
+        """
+        command = [
+            'ffmpeg', '-nostdin',
+            '-threads', '0',
+            '-i', path,
+            '-f', 's16le',
+            '-ac', '1',
+            '-acodec', 'pcm_s16le',
+            '-ar', str(sample_rate),
+            '-'
+        ]
+        try:
+            logger.info(f"Décodage de l'audio de {path}")
+            out = subprocess.run(command, capture_output=True, check=True).stdout
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Erreur lors du décodage audio: {e.stderr.decode(errors='ignore')}")
+            raise
+        samples = np.frombuffer(out, np.int16).astype(np.float32) / 32768.0
+        logger.info(f"Audio décodé: {len(samples) / sample_rate:.2f} secondes")
+        return cls(samples, sample_rate, source=path)
+
+    @property
+    def duration(self) -> float:
+        """Durée du signal en secondes"""
+        return len(self.samples) / self.sample_rate
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def digest(self) -> str:
+        """Empreinte SHA-256 du signal décodé, calculée une seule fois"""
+        if self._digest is None:
+            h = hashlib.sha256()
+            h.update(str(self.sample_rate).encode())
+            h.update(self.samples.tobytes())
+            self._digest = h.hexdigest()
+        return self._digest
+
+    def slice(self, start: float, end: Optional[float] = None) -> np.ndarray:
+        """Retourne une vue (sans copie) du signal entre deux instants en secondes"""
+        start_idx = max(0, int(start * self.sample_rate))
+        end_idx = len(self.samples) if end is None else min(len(self.samples), int(end * self.sample_rate))
+        return self.samples[start_idx:end_idx]
+
+    def log_mel(self, n_mels: int = 80, padding: int = 0):
+        """
+        Log-mel spectrogramme du signal complet, calculé une seule fois par jeu de paramètres.
+
+        Args:
+            n_mels (int): Nombre de bandes mel du modèle
+            padding (int): Nombre d'échantillons de silence ajoutés en fin de signal
+
+        Returns:
+            torch.Tensor: Spectrogramme (n_mels, n_frames) sur CPU
+        """
+        key = ("full", n_mels, padding)
+        if key not in self._mel_cache:
+            import whisper
+            self._mel_cache[key] = whisper.log_mel_spectrogram(self.samples, n_mels, padding=padding)
+        return self._mel_cache[key]
+
+    def first_window_mel(self, n_mels: int = 80):
+        """
+        Log-mel spectrogramme des 30 premières secondes, complété ou tronqué à une fenêtre Whisper.
+        Utilisé pour la détection de langue.
+        """
+        key = ("window", n_mels)
+        if key not in self._mel_cache:
+            import whisper
+            window = whisper.pad_or_trim(self.samples[:WINDOW_SECONDS * self.sample_rate])
+            self._mel_cache[key] = whisper.log_mel_spectrogram(window, n_mels)
+        return self._mel_cache[key]
+
+    def write_wav(self, path: str) -> None:
+        """Écrit le signal en WAV PCM 16 bits sans repasser par ffmpeg"""
+        pcm = (np.clip(self.samples, -1.0, 1.0) * 32767).astype('<i2')
+        with wave.open(str(path), 'wb') as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(self.sample_rate)
+            f.writeframes(pcm.tobytes())
+        logger.info(f"Audio écrit vers {path}")
@@ -0,0 +1,90 @@
+import logging
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def frame_energy_db(samples: np.ndarray, frame_samples: int) -> np.ndarray:
+    """
+    Énergie RMS en dB par trame (trames contiguës, sans recouvrement).
+
+    Args:
+        samples (np.ndarray): Signal float32
+        frame_samples (int): Taille d'une trame en échantillons
+
+    Returns:
+        np.ndarray: Énergie de chaque trame complète en dB
+    """
+    n_frames = len(samples) // frame_samples
+    if n_frames == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = samples[:n_frames * frame_samples].reshape(n_frames, frame_samples)
+    rms = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+    return 20 * np.log10(rms + 1e-10)
+
+
+def find_chunk_boundaries(
+    samples: np.ndarray,
+    sample_rate: int,
+    max_chunk_seconds: float,
+    min_chunk_ratio: float = 0.5,
+    frame_seconds: float = 0.03,
+    speech_regions: Optional[List[Tuple[float, float]]] = None
+) -> List[Tuple[int, int]]:
+    """
+    Découpe un signal en morceaux de longueur bornée, coupés sur les silences.
+
+    Chaque coupure est placée au milieu du plus long silence entre deux zones de parole
+    de la seconde moitié de la fenêtre autorisée ou, à défaut, sur sa trame la moins
+    énergétique, afin de ne pas couper un mot.
+
+    Args:
+        samples (np.ndarray): Signal float32
+        sample_rate (int): Fréquence d'échantillonnage
+        max_chunk_seconds (float): Durée maximale d'un morceau
+        min_chunk_ratio (float): Fraction de la durée maximale avant laquelle on ne coupe pas
+        frame_seconds (float): Résolution de la recherche de silence
+        speech_regions (Optional[List[Tuple[float, float]]]): Zones de parole (secondes) issues de la VAD
+
+    Returns:
+        List[Tuple[int, int]]: Bornes (début, fin) de chaque morceau en échantillons
+    """
+    total = len(samples)
+    max_chunk = int(max_chunk_seconds * sample_rate)
+    if total <= max_chunk:
+        return [(0, total)]
+
+    frame_samples = max(1, int(frame_seconds * sample_rate))
+    energy = frame_energy_db(samples, frame_samples)
+    if speech_regions:
+        # Silences entre zones de parole consécutives, en échantillons
+        gap_starts = np.array([end for _, end in speech_regions[:-1]]) * sample_rate
+        gap_ends = np.array([start for start, _ in speech_regions[1:]]) * sample_rate
+    else:
+        gap_starts = gap_ends = np.zeros(0)
+
+    boundaries = []
+    start = 0
+    while total - start > max_chunk:
+        window_lo = start + int(max_chunk * min_chunk_ratio)
+        window_hi = start + max_chunk
+        lo = window_lo // frame_samples
+        hi = window_hi // frame_samples
+        in_window = (gap_starts >= window_lo) & (gap_ends <= window_hi)
+        if in_window.any():
+            widths = np.where(in_window, gap_ends - gap_starts, -1)
+            longest = int(np.argmax(widths))
+            cut = int((gap_starts[longest] + gap_ends[longest]) / 2)
+        elif hi <= lo:
+            cut = start + max_chunk
+        else:
+            quietest = lo + int(np.argmin(energy[lo:hi]))
+            cut = quietest * frame_samples + frame_samples // 2
+        boundaries.append((start, cut))
+        start = cut
+    boundaries.append((start, total))
+
+    logger.info(f"Audio découpé en {len(boundaries)} morceaux (max {max_chunk_seconds:.0f}s)")
+    return boundaries
@@ -0,0 +1,138 @@
+import logging
+from functools import lru_cache
+from math import gcd
+from typing import Optional, Tuple
+
+import numpy as np
+import soundfile as sf
+
+from src.utils.audio_buffer import AudioBuffer
+
+logger = logging.getLogger(__name__)
+
+CROSSFADE_SECONDS = 0.020  # Fondu enchaîné aux bords de chaque clip
+
+
+def resample(samples: np.ndarray, orig_sr: int, target_sr: int) -> np.ndarray:
+    """
+    Rééchantillonne un signal mono dans le domaine fréquentiel (les fréquences au-delà de
+    la nouvelle fréquence de Nyquist sont coupées, sans repliement).
+    """
+    if orig_sr == target_sr or len(samples) == 0:
+        return np.asarray(samples, dtype=np.float32)
+    n_out = int(round(len(samples) * target_sr / orig_sr))
+    # Signal complété de zéros jusqu'à une longueur à FFT rapide, correspondant à un nombre
+    # entier d'échantillons aux deux fréquences (ex. 441 * 2^k à 22050 Hz, 320 * 2^k à 16 kHz)
+    step = gcd(orig_sr, target_sr)
+    in_block, out_block = orig_sr // step, target_sr // step
+    n_blocks = 1 << (-(-len(samples) // in_block) - 1).bit_length()
+    spectrum = np.fft.rfft(samples, n_blocks * in_block)
+    resized = np.zeros(n_blocks * out_block // 2 + 1, dtype=spectrum.dtype)
+    n_bins = min(len(spectrum), len(resized))
+    resized[:n_bins] = spectrum[:n_bins]
+    resampled = np.fft.irfft(resized, n_blocks * out_block)[:n_out]
+    return (resampled * (out_block / in_block)).astype(np.float32)
+
+
+@lru_cache(maxsize=64)
+def _ramp(n: int) -> np.ndarray:
+    """Rampe linéaire croissante de n échantillons, strictement entre 0 et 1 (partagée, en lecture seule)"""
+    ramp = np.linspace(0.0, 1.0, n + 2, dtype=np.float32)[1:-1]
+    ramp.setflags(write=False)
+    return ramp
+
+
+def load_clip(path: str, sample_rate: Optional[int] = None) -> np.ndarray:
+    """Lit un fichier audio en float32 mono, rééchantillonné en mémoire si `sample_rate` est donné"""
+    samples, file_rate = sf.read(str(path), dtype='float32', always_2d=True)
+    samples = samples.mean(axis=1) if samples.shape[1] > 1 else samples[:, 0]
+    return resample(samples, file_rate, sample_rate) if sample_rate else samples
+
+
+class TimelineMixer:
+    """
+    Tampon de mixage préalloué sur toute la durée de l'audio : chaque clip est écrit
+    (`write`) ou ajouté (`overlay`) à son timestamp, directement dans le tampon. Chaque
+    opération ne touche que l'intervalle du clip : mixer n clips coûte O(durée + clips).
+    """
+
+    def __init__(self, base: np.ndarray, sample_rate: int, crossfade: float = CROSSFADE_SECONDS):
+        """
+        Args:
+            base (np.ndarray): Audio de fond (copié), qui fixe la durée du mixage
+            sample_rate (int): Fréquence d'échantillonnage du mixage
+            crossfade (float): Durée des fondus enchaînés en secondes
+        """
+        self.buffer = np.array(base, dtype=np.float32)
+        self.sample_rate = sample_rate
+        self.crossfade = int(crossfade * sample_rate)
+
+    @classmethod
+    def silent(cls, duration: float, sample_rate: int, **kwargs) -> "TimelineMixer":
+        """Mixage sur un fond silencieux de `duration` secondes"""
+        return cls(np.zeros(int(round(duration * sample_rate)), dtype=np.float32), sample_rate, **kwargs)
+
+    @classmethod
+    def from_file(cls, path: str, sample_rate: int, **kwargs) -> "TimelineMixer":
+        """Mixage sur l'audio d'un fichier, lu une seule fois"""
+        return cls(load_clip(path, sample_rate), sample_rate, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.buffer)
+
+    @property
+    def duration(self) -> float:
+        return len(self.buffer) / self.sample_rate
+
+    def _clamp(self, clip: np.ndarray, start: float) -> Tuple[np.ndarray, int]:
+        """Partie du clip placé à `start` secondes qui tombe dans le mixage, et sa position"""
+        offset = int(round(start * self.sample_rate))
+        if offset < 0:
+            clip, offset = clip[-offset:], 0
+        return clip[:max(0, len(self.buffer) - offset)], offset
+
+    def write(self, clip: np.ndarray, start: float) -> None:
+        """
+        Remplace l'audio de fond par le clip à partir de `start` secondes, avec un fondu
+        enchaîné en entrée et en sortie. Les parties du clip hors du mixage (avant le début
+        ou après la fin) sont ignorées.
+        """
+        clip, offset = self._clamp(clip, start)
+        if len(clip) == 0:
+            return
+        region = self.buffer[offset:offset + len(clip)]
+        fade = min(self.crossfade, len(clip) // 2)
+        ramp = _ramp(fade)
+        # Bords : fond et clip pondérés par des rampes complémentaires ; centre : copie directe
+        for edge, weights in ((slice(0, fade), ramp), (slice(len(clip) - fade, len(clip)), ramp[::-1])):
+            region[edge] += weights * (clip[edge] - region[edge])
+        region[fade:len(clip) - fade] = clip[fade:len(clip) - fade]
+
+    def overlay(self, clip: np.ndarray, start: float, gain: float = 1.0,
+                fade_in: float = 0.0, fade_out: float = 0.0) -> None:
+        """
+        Ajoute le clip à l'audio en place à partir de `start` secondes.
+
+        Args:
+            clip (np.ndarray): Signal float32 mono, à la fréquence du mixage
+            start (float): Position du clip en secondes (les parties hors du mixage sont ignorées)
+            gain (float): Gain linéaire appliqué au clip
+            fade_in (float): Durée du fondu d'entrée en secondes
+            fade_out (float): Durée du fondu de sortie en secondes
+        """
+        clip, offset = self._clamp(clip, start)
+        if len(clip) == 0:
+            return
+        region = self.buffer[offset:offset + len(clip)]
+        n_in = min(int(fade_in * self.sample_rate), len(clip))
+        n_out = min(int(fade_out * self.sample_rate), len(clip) - n_in)
+        middle = slice(n_in, len(clip) - n_out)
+        region[middle] += clip[middle] if gain == 1.0 else gain * clip[middle]
+        if n_in:
+            region[:n_in] += (gain * _ramp(n_in)) * clip[:n_in]
+        if n_out:
+            region[len(clip) - n_out:] += (gain * _ramp(n_out)[::-1]) * clip[len(clip) - n_out:]
+
+    def write_wav(self, path: str) -> None:
+        """Écrit le mixage en WAV PCM 16 bits"""
+        AudioBuffer(self.buffer, self.sample_rate).write_wav(path)
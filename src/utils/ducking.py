@@ -0,0 +1,117 @@
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FFT_SIZE = 1 << 16  # Taille des blocs traités (enveloppe et filtrage)
+
+
+def merge_spans(spans: Sequence[Tuple[float, float]], gap: float) -> List[Tuple[float, float]]:
+    """Fusionne les intervalles (début, fin) séparés de moins de `gap` secondes"""
+    merged = []
+    for start, end in sorted(spans):
+        if merged and start - merged[-1][1] < gap:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def voice_band_filter(low: float, high: float, sample_rate: int, taps: int = 511) -> np.ndarray:
+    """Filtre passe-bande RIF à phase linéaire (sinus cardinal fenêtré par Blackman)"""
+    n = np.arange(taps) - taps // 2
+    high = min(high, sample_rate / 2)
+    h = 2 * high / sample_rate * np.sinc(2 * high / sample_rate * n) - \
+        2 * low / sample_rate * np.sinc(2 * low / sample_rate * n)
+    return (h * np.blackman(taps)).astype(np.float32)
+
+
+class Ducker:
+    """
+    Atténuation (ducking) de l'audio original pendant la parole, avant l'ajout du doublage.
+
+    L'enveloppe de gain est linéaire par morceaux : elle descend à `depth_db` sur `attack`
+    secondes avant chaque segment et remonte sur `release` secondes après ; les segments
+    trop proches sont fusionnés pour que le gain ne remonte pas entre eux. Avec `voice_band`,
+    seule la bande de fréquences de la voix est atténuée (coupe-bande), ce qui garde les
+    basses et les aigus de la musique et de l'ambiance.
+    """
+
+    def __init__(self, depth_db: float = -18.0, attack: float = 0.05, release: float = 0.25,
+                 voice_band: Optional[Sequence[float]] = None, taps: int = 511):
+        """
+        Args:
+            depth_db (float): Atténuation pendant la parole, en dB
+            attack (float): Durée de la descente avant chaque segment, en secondes
+            release (float): Durée de la remontée après chaque segment, en secondes
+            voice_band (Optional[Sequence[float]]): Fréquences (basse, haute) de la bande atténuée ;
+                None : tout le signal est atténué
+            taps (int): Longueur (impaire) du filtre de bande
+        """
+        self.gain = 10 ** (depth_db / 20)
+        self.attack = attack
+        self.release = release
+        self.voice_band = tuple(voice_band) if voice_band else None
+        self.taps = taps | 1
+        self._filters: Dict[int, np.ndarray] = {}
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "Ducker":
+        """Crée le ducker à partir de la section `mix` de la configuration"""
+        return cls(
+            depth_db=config.get('duck_db', -18.0),
+            attack=config.get('attack', 0.05),
+            release=config.get('release', 0.25),
+            voice_band=config.get('voice_band')
+        )
+
+    def breakpoints(self, spans: Sequence[Tuple[float, float]], sample_rate: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Points (échantillon, gain) de l'enveloppe, croissants, à interpoler linéairement"""
+        merged = merge_spans(spans, self.attack + self.release)
+        positions = np.array([
+            [start - self.attack, start, end, end + self.release] for start, end in merged
+        ], dtype=np.float64).reshape(-1) * sample_rate
+        gains = np.tile(np.array([1.0, self.gain, self.gain, 1.0]), len(merged))
+        return positions, gains
+
+    def _band_response(self, sample_rate: int) -> np.ndarray:
+        if sample_rate not in self._filters:
+            h = voice_band_filter(*self.voice_band, sample_rate, self.taps)
+            self._filters[sample_rate] = np.fft.rfft(h, FFT_SIZE)
+        return self._filters[sample_rate]
+
+    def apply(self, samples: np.ndarray, sample_rate: int, spans: Sequence[Tuple[float, float]]) -> None:
+        """
+        Atténue le signal en place pendant les intervalles de parole `spans` (en secondes).
+
+        Le signal est traité par blocs (mémoire bornée) ; les blocs hors parole ne sont pas touchés.
+        """
+        positions, gains = self.breakpoints(spans, sample_rate)
+        if len(positions) == 0:
+            return
+        half = self.taps // 2
+        block = FFT_SIZE - 2 * half
+        n = len(samples)
+        tail = np.zeros(half, dtype=np.float32)  # Échantillons originaux précédant le bloc
+        for b0 in range(0, n, block):
+            b1 = min(n, b0 + block)
+            # Bloc touché s'il commence dans un intervalle atténué ou en contient un début
+            first = np.searchsorted(positions, b0, side='right')
+            touched = first < len(positions) and (first % 4 != 0 or positions[first] < b1)
+            next_tail = np.concatenate((tail, samples[b0:b1]))[-half:] if half else tail
+            if touched:
+                envelope = np.interp(np.arange(b0, b1), positions, gains).astype(np.float32)
+                if self.voice_band is None:
+                    samples[b0:b1] *= envelope
+                else:
+                    # Composante vocale du bloc (filtrage par FFT, marges de half échantillons
+                    # originaux de part et d'autre), retirée dans la proportion 1 - gain
+                    segment = np.zeros(b1 - b0 + 2 * half, dtype=np.float32)
+                    segment[:half] = tail
+                    right = samples[b0:min(n, b1 + half)]
+                    segment[half:half + len(right)] = right
+                    voice = np.fft.irfft(np.fft.rfft(segment, FFT_SIZE) * self._band_response(sample_rate), FFT_SIZE)
+                    samples[b0:b1] -= (1.0 - envelope) * voice[2 * half:2 * half + b1 - b0]
+            tail = next_tail
@@ -0,0 +1,200 @@
+import gc
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ModelKey = Tuple[str, str, str, Optional[str]]
+
+
+@dataclass
+class ModelEntry:
+    """Modèle chargé et ses statistiques"""
+    model: Any
+    load_time: float
+    size_mb: float
+    hits: int = 0
+    last_used: float = field(default_factory=time.time)
+
+
+def _current_rss_mb() -> float:
+    """Mémoire résidente du processus en Mo (0 si indisponible)"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 2**20
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (OSError, ValueError):
+        return 0.0
+
+
+def _tensor_size_mb(model: Any) -> float:
+    """Taille des poids d'un modèle PyTorch (ou d'un objet qui en contient un) en Mo"""
+    candidates = list(model) if isinstance(model, (tuple, list)) else [model]
+    total = 0
+    for candidate in candidates:
+        module = getattr(candidate, 'model', candidate)  # pipeline transformers
+        if not hasattr(module, 'parameters'):
+            continue
+        try:
+            total += sum(p.numel() * p.element_size() for p in module.parameters())
+            total += sum(b.numel() * b.element_size() for b in module.buffers())
+        except Exception:
+            continue
+    return total / 2**20
+
+
+class ModelRegistry:
+    """
+    Registre des modèles chargés, partagé par tout le processus, avec budget mémoire et éviction LRU.
+
+    Le registre doit détenir la seule référence durable à chaque modèle : les processeurs
+    redemandent leur modèle via `get` à chaque usage (une recherche dans un dictionnaire)
+    au lieu de le garder en attribut, sans quoi une éviction ne libérerait aucune mémoire.
+    """
+
+    def __init__(self, memory_budget_mb: Optional[float] = None):
+        self.memory_budget_mb = memory_budget_mb
+        self._entries: "OrderedDict[ModelKey, ModelEntry]" = OrderedDict()
+        self._known_sizes: Dict[ModelKey, float] = {}
+        self._lock = threading.RLock()
+
+    @property
+    def used_mb(self) -> float:
+        """Mémoire estimée occupée par les modèles chargés"""
+        return sum(entry.size_mb for entry in self._entries.values())
+
+    def get(
+        self,
+        kind: str,
+        name: str,
+        loader: Callable[[], Any],
+        device: str = "cpu",
+        compute_type: Optional[str] = None,
+        size_hint_mb: Optional[float] = None
+    ) -> Any:
+        """
+        Retourne un modèle déjà chargé ou le charge avec `loader`.
+
+        Args:
+            kind (str): Famille du modèle (whisper, argos, mbart...)
+            name (str): Nom ou chemin du modèle
+            loader (Callable[[], Any]): Fonction de chargement appelée en cas d'absence
+            device (str): Périphérique d'exécution
+            compute_type (Optional[str]): Précision de calcul (int8, float16...)
+            size_hint_mb (Optional[float]): Taille attendue, pour libérer la place avant le chargement
+
+        Returns:
+            Any: L'instance partagée du modèle
+        """
+        key = (kind, name, device, compute_type)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                entry.hits += 1
+                entry.last_used = time.time()
+                logger.debug(f"Modèle {kind}:{name} réutilisé depuis le registre")
+                return entry.model
+
+            expected_mb = size_hint_mb or self._known_sizes.get(key, 0.0)
+            self._evict_until_fits(expected_mb)
+
+            logger.info(f"Chargement du modèle {kind}:{name} ({device}, {compute_type or 'défaut'})")
+            rss_before = _current_rss_mb()
+            start = time.perf_counter()
+            model = loader()
+            load_time = time.perf_counter() - start
+            # Les tenseurs PyTorch ne comptent ni les poids int8 empaquetés (quantize_dynamic) ni
+            # les modèles natifs (CTranslate2, Argos) : la hausse de RSS est retenue si elle est plus grande
+            size_mb = max(_tensor_size_mb(model), _current_rss_mb() - rss_before, 0.0)
+
+            self._entries[key] = ModelEntry(model=model, load_time=load_time, size_mb=size_mb)
+            self._known_sizes[key] = size_mb
+            logger.info(f"Modèle {kind}:{name} chargé en {load_time:.2f}s ({size_mb:.0f} Mo)")
+
+            # Le modèle qui vient d'être chargé n'est jamais évincé par son propre chargement
+            self._evict_until_fits(0.0, keep=key)
+            return model
+
+    def _evict_until_fits(self, extra_mb: float, keep: Optional[ModelKey] = None) -> None:
+        """Évince les modèles les moins récemment utilisés jusqu'à respecter le budget"""
+        if self.memory_budget_mb is None:
+            return
+        while self.used_mb + extra_mb > self.memory_budget_mb:
+            victim = next((key for key in self._entries if key != keep), None)
+            if victim is None:
+                break
+            self.evict(victim)
+
+    def evict(self, key: ModelKey) -> None:
+        """Retire un modèle du registre et libère la mémoire associée"""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return
+            logger.info(f"Éviction du modèle {key[0]}:{key[1]} ({entry.size_mb:.0f} Mo)")
+            del entry
+            gc.collect()
+            try:
+                import torch
+                if torch.cuda.is_available():
+                    torch.cuda.empty_cache()
+            except ImportError:
+                pass
+
+    def clear(self) -> None:
+        """Vide le registre"""
+        with self._lock:
+            for key in list(self._entries):
+                self.evict(key)
+
+    def stats(self) -> List[Dict]:
+        """Statistiques par modèle chargé, du moins au plus récemment utilisé"""
+        with self._lock:
+            return [{
+                "kind": key[0],
+                "name": key[1],
+                "device": key[2],
+                "compute_type": key[3],
+                "load_time": entry.load_time,
+                "size_mb": entry.size_mb,
+                "hits": entry.hits
+            } for key, entry in self._entries.items()]
+
+    def log_stats(self) -> None:
+        """Affiche l'état du registre dans les logs"""
+        budget = f"{self.memory_budget_mb:.0f} Mo" if self.memory_budget_mb is not None else "illimité"
+        logger.info(f"Registre des modèles : {self.used_mb:.0f} Mo utilisés (budget {budget})")
+        for stat in self.stats():
+            logger.info(f"  {stat['kind']}:{stat['name']} - {stat['size_mb']:.0f} Mo, "
+                        f"chargé en {stat['load_time']:.2f}s, réutilisé {stat['hits']} fois")
+
+
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry(memory_budget_mb: Optional[float] = None) -> ModelRegistry:
+    """
+    Retourne le registre de modèles du processus.
+
+    Args:
+        memory_budget_mb (Optional[float]): Budget mémoire à appliquer (conserve le budget actuel si None)
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry(memory_budget_mb)
+        elif memory_budget_mb is not None:
+            _registry.memory_budget_mb = memory_budget_mb
+        return _registry
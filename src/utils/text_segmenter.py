@@ -0,0 +1,125 @@
+import logging
+import re
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Frontières de découpe, de la plus naturelle à la plus brutale : phrases, propositions, mots
+_BOUNDARIES = [
+    re.compile(r'[.!?;…]+["»)\]]*\s+'),
+    re.compile(r'[,:]\s+'),
+    re.compile(r'\s+'),
+]
+
+TokenCounter = Callable[[List[str]], List[int]]
+
+
+def count_words(texts: List[str]) -> List[int]:
+    """Compteur de jetons approximatif (un mot = un jeton), quand le tokenizer du modèle n'est pas disponible"""
+    return [len(text.split()) for text in texts]
+
+
+@dataclass
+class TextPiece:
+    """Morceau de texte, avec sa position dans le texte source"""
+    text: str
+    start: int
+    end: int
+    n_tokens: int
+    owner: int = 0  # Indice du texte source (split_many)
+
+
+class TextSegmenter:
+    """
+    Découpe les textes en morceaux d'au plus `max_tokens` jetons du modèle cible.
+
+    Les phrases sont regroupées tant que le budget de jetons le permet ; une phrase trop
+    longue est coupée aux propositions, puis aux mots. Aucun texte n'est tronqué et chaque
+    morceau garde ses positions dans le texte source.
+    """
+
+    def __init__(self, max_tokens: int = 128, token_counter: Optional[TokenCounter] = None):
+        """
+        Args:
+            max_tokens (int): Nombre maximal de jetons par morceau
+            token_counter (Optional[TokenCounter]): Nombre de jetons de chaque texte d'une liste
+                (tokenizer du modèle) ; à défaut, nombre de mots
+        """
+        self.max_tokens = max_tokens
+        self.token_counter = token_counter or count_words
+
+    def split(self, text: str) -> List[TextPiece]:
+        """Découpe un texte en morceaux (aucun pour un texte vide)"""
+        if not text or not text.strip():
+            return []
+        return self._pack(text, self._fit(text, [(0, len(text))], 0))
+
+    def split_many(self, texts: Sequence[str]) -> List[TextPiece]:
+        """Découpe plusieurs textes ; `owner` donne l'indice du texte de chaque morceau"""
+        pieces = []
+        for owner, text in enumerate(texts):
+            for piece in self.split(text):
+                piece.owner = owner
+                pieces.append(piece)
+        return pieces
+
+    @staticmethod
+    def join(texts: Sequence[str], pieces: Sequence[TextPiece], translations: Sequence[str]) -> List[str]:
+        """
+        Réassemble les traductions des morceaux par texte source.
+
+        Returns:
+            List[str]: Un texte par texte source (le texte source s'il n'avait aucun morceau)
+        """
+        parts = [[] for _ in texts]
+        for piece, translation in zip(pieces, translations):
+            if translation and translation.strip():
+                parts[piece.owner].append(translation.strip())
+        return [" ".join(p) if p else text for text, p in zip(texts, parts)]
+
+    def _fit(self, text: str, spans: List[Tuple[int, int]], level: int) -> List[Tuple[int, int, int]]:
+        """Redécoupe les intervalles trop longs jusqu'à ce que chacun tienne dans le budget"""
+        counts = self.token_counter([text[start:end] for start, end in spans])
+        fitted = []
+        for (start, end), n_tokens in zip(spans, counts):
+            if n_tokens <= self.max_tokens or end - start <= 1:
+                fitted.append((start, end, n_tokens))
+            else:
+                fitted.extend(self._fit(text, self._cut(text, start, end, level), level + 1))
+        return fitted
+
+    @staticmethod
+    def _cut(text: str, start: int, end: int, level: int) -> List[Tuple[int, int]]:
+        """Coupe un intervalle à la première frontière disponible à partir du niveau `level`"""
+        for pattern in _BOUNDARIES[level:]:
+            cuts = [m.end() for m in pattern.finditer(text, start, end) if start < m.end() < end]
+            if cuts:
+                return list(zip([start] + cuts, cuts + [end]))
+        # Mot unique plus long que le budget : coupe au milieu
+        middle = (start + end) // 2
+        return [(start, middle), (middle, end)]
+
+    def _pack(self, text: str, spans: List[Tuple[int, int, int]]) -> List[TextPiece]:
+        """Regroupe les intervalles consécutifs tant que le budget de jetons le permet"""
+        pieces = []
+        current_start, current_end, current_tokens = None, None, 0
+        for start, end, n_tokens in spans:
+            if current_start is not None and current_tokens + n_tokens > self.max_tokens:
+                self._emit(text, current_start, current_end, current_tokens, pieces)
+                current_start = None
+            if current_start is None:
+                current_start, current_tokens = start, 0
+            current_end = end
+            current_tokens += n_tokens
+        if current_start is not None:
+            self._emit(text, current_start, current_end, current_tokens, pieces)
+        return pieces
+
+    @staticmethod
+    def _emit(text: str, start: int, end: int, n_tokens: int, pieces: List[TextPiece]) -> None:
+        raw = text[start:end]
+        stripped = raw.strip()
+        if stripped:
+            start += len(raw) - len(raw.lstrip())
+            pieces.append(TextPiece(stripped, start, start + len(stripped), n_tokens))
@@ -0,0 +1,139 @@
+import logging
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FRAME_SECONDS = 0.040      # Trames WSOLA de 40 ms (recouvrement de 50 %)
+TOLERANCE_SECONDS = 0.006  # Décalage maximal recherché autour de la position idéale
+FADE_SECONDS = 0.010       # Fondu appliqué quand un clip est tronqué
+
+
+def _next_pow2(n: int) -> int:
+    return 1 << (n - 1).bit_length()
+
+
+def time_stretch(samples: np.ndarray, rate: float, sample_rate: int,
+                 out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Change la durée d'un signal mono sans changer sa hauteur (WSOLA vectorisé).
+
+    Chaque trame de sortie est prise autour de sa position idéale dans le signal source,
+    au décalage qui prolonge le mieux la trame précédente, puis les trames fenêtrées sont
+    additionnées avec un recouvrement de 50 %. Les intercorrélations de toutes les trames
+    sont calculées en un seul lot de FFT ; seul le choix des décalages reste séquentiel.
+
+    Args:
+        samples (np.ndarray): Signal float32 mono
+        rate (float): Facteur de vitesse (> 1 accélère, < 1 ralentit)
+        sample_rate (int): Fréquence d'échantillonnage du signal
+        out (Optional[np.ndarray]): Tampon float32 de destination (au moins len(samples) / rate
+            échantillons), pour écrire directement dans un mixage
+
+    Returns:
+        np.ndarray: Le signal étiré, de round(len(samples) / rate) échantillons (vue de `out` le cas échéant)
+    """
+    samples = np.asarray(samples, dtype=np.float32)
+    n_out = int(round(len(samples) / rate))
+    if out is None:
+        out = np.empty(n_out, dtype=np.float32)
+    else:
+        out = out[:n_out]
+    if abs(rate - 1.0) < 1e-3 or len(samples) == 0:
+        n_copy = min(n_out, len(samples))
+        out[:n_copy] = samples[:n_copy]
+        out[n_copy:] = 0.0
+        return out
+
+    hop = max(16, int(FRAME_SECONDS * sample_rate) // 2)  # Pas de synthèse
+    frame = 2 * hop
+    tolerance = max(1, int(TOLERANCE_SECONDS * sample_rate))
+    n_frames = -(-n_out // hop) + 1
+
+    # Signal complété de zéros : la trame k est centrée sur la position source k * hop * rate
+    margin = 2 * tolerance
+    pad_front = hop + margin
+    positions = np.round(np.arange(n_frames) * hop * rate).astype(np.int64) + margin
+    padded = np.zeros(max(pad_front + len(samples), positions[-1] + margin + frame + 1), dtype=np.float32)
+    padded[pad_front:pad_front + len(samples)] = samples
+
+    # Intercorrélation, pour chaque trame, entre le prolongement de la trame précédente
+    # (zone de recouvrement) et les décalages relatifs possibles de la trame courante
+    n_lags = 2 * margin + 1
+    templates = padded[(positions[:-1] + hop)[:, None] + np.arange(hop)]
+    regions = padded[(positions[1:] - margin)[:, None] + np.arange(hop + 2 * margin)]
+    n_fft = _next_pow2(hop + 2 * margin)
+    correlation = np.fft.irfft(
+        np.conj(np.fft.rfft(templates, n_fft)) * np.fft.rfft(regions, n_fft), n_fft
+    )[:, :n_lags]
+    del templates, regions
+
+    # Seul le chaînage des décalages est séquentiel : une recherche d'argmax par trame
+    shifts = np.zeros(n_frames, dtype=np.int64)
+    shift = 0
+    for k, row in enumerate(correlation, start=1):
+        # Décalage relatif borné pour que le décalage absolu reste dans [-tolerance, tolerance]
+        low = margin - tolerance - shift
+        shift += low - margin + int(row[low:low + n_lags - margin].argmax())
+        shifts[k] = shift
+
+    # Addition-recouvrement : avec un pas d'une demi-trame, chaque bloc de sortie est la
+    # seconde moitié d'une trame plus la première moitié de la suivante
+    window = np.hanning(frame + 1)[:frame].astype(np.float32)  # Somme constante à 50 % de recouvrement
+    frames = padded[(positions + shifts)[:, None] + np.arange(frame)]
+    frames *= window
+    blocks = np.zeros((n_frames + 1, hop), dtype=np.float32)
+    blocks[:-1] += frames[:, :hop]
+    blocks[1:] += frames[:, hop:]
+    out[:] = blocks.reshape(-1)[hop:hop + n_out]
+    return out
+
+
+@dataclass
+class StretchResult:
+    """Ajustement d'un clip à son créneau"""
+    index: int
+    slot: float       # Durée du créneau (s)
+    duration: float   # Durée du clip synthétisé (s)
+    rate: float       # Facteur de vitesse appliqué
+    trimmed: bool     # Clip tronqué (trop long même accéléré au maximum)
+
+
+def fit_clip(samples: np.ndarray, sample_rate: int, slot: float, min_speed: float = 0.8,
+             max_speed: float = 1.5, index: int = 0) -> Tuple[np.ndarray, StretchResult]:
+    """
+    Ajuste un clip TTS à la durée de son créneau.
+
+    Le facteur de vitesse est borné par [min_speed, max_speed] ; au-delà, le clip étiré
+    est complété de silence ou tronqué avec un fondu de sortie.
+
+    Returns:
+        Tuple[np.ndarray, StretchResult]: Clip de exactement slot * sample_rate échantillons, et son rapport
+    """
+    target = max(1, int(round(slot * sample_rate)))
+    duration = len(samples) / sample_rate
+    rate = float(np.clip(len(samples) / target, min_speed, max_speed)) if len(samples) else 1.0
+    fitted = np.zeros(max(target, int(round(len(samples) / rate))), dtype=np.float32)
+    time_stretch(samples, rate, sample_rate, out=fitted)
+    trimmed = len(fitted) > target
+    fitted = fitted[:target]
+    if trimmed:
+        fade = min(len(fitted), int(FADE_SECONDS * sample_rate))
+        fitted[len(fitted) - fade:] *= np.linspace(1.0, 0.0, fade, dtype=np.float32)
+    return fitted, StretchResult(index, slot, duration, rate, trimmed)
+
+
+def log_stretch_report(results: List[StretchResult]) -> None:
+    """Affiche le facteur de vitesse de chaque segment et un résumé"""
+    if not results:
+        return
+    for r in results:
+        status = "tronqué" if r.trimmed else "ok"
+        logger.info(f"Segment {r.index} : clip {r.duration:.2f}s -> créneau {r.slot:.2f}s, "
+                    f"vitesse x{r.rate:.2f} ({status})")
+    rates = np.array([r.rate for r in results])
+    n_trimmed = sum(r.trimmed for r in results)
+    logger.info(f"Ajustement de {len(results)} clips : vitesse médiane x{np.median(rates):.2f}, "
+                f"min x{rates.min():.2f}, max x{rates.max():.2f}, {n_trimmed} tronqué(s)")
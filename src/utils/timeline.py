@@ -0,0 +1,233 @@
+import logging
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Drapeaux par segment (combinables)
+FLAG_NON_VOCAL = 1  # Musique, applaudissements... ("[Music]")
+FLAG_MERGED = 2     # Segment issu de la fusion de segments trop courts
+FLAG_ESCALATED = 4  # Segment redécodé par le modèle principal (mode cascade)
+
+# Colonnes numériques : nom -> (type, valeur par défaut)
+_COLUMNS = {
+    "start": (np.float64, 0.0),
+    "end": (np.float64, 0.0),
+    "confidence": (np.float32, 0.0),
+    "avg_logprob": (np.float32, 0.0),
+    "compression_ratio": (np.float32, 0.0),
+    "no_speech_prob": (np.float32, 0.0),
+    "temperature": (np.float32, 0.0),
+    "seek": (np.int32, 0),
+    "flags": (np.uint8, 0),
+}
+
+
+def is_non_vocal_text(text: str) -> bool:
+    """Vérifie si un texte désigne un segment non vocal (musique, applaudissements, etc.)"""
+    text = text.strip()
+    return text.startswith('[') and text.endswith(']')
+
+
+class SegmentTimeline:
+    """
+    Timeline des segments stockée en colonnes NumPy (début, fin, confiance, drapeaux...),
+    le texte, les jetons et les mots étant conservés à part.
+    """
+
+    def __init__(
+        self,
+        texts: Sequence[str],
+        tokens: Optional[List[List[int]]] = None,
+        words: Optional[List[List[Dict]]] = None,
+        **columns: np.ndarray
+    ):
+        n = len(texts)
+        self.texts = list(texts)
+        self.tokens = tokens if tokens is not None else [[] for _ in range(n)]
+        self.words = words if words is not None else [[] for _ in range(n)]
+        for name, (dtype, default) in _COLUMNS.items():
+            values = columns.get(name)
+            setattr(self, name, np.full(n, default, dtype=dtype) if values is None
+                    else np.asarray(values, dtype=dtype))
+
+    @classmethod
+    def from_segments(cls, segments: List[Dict]) -> "SegmentTimeline":
+        """Construit la timeline à partir de segments au format Whisper"""
+        texts = [seg.get("text", "") for seg in segments]
+        columns = {
+            name: np.fromiter((seg.get(name, default) or default for seg in segments), dtype=dtype, count=len(segments))
+            for name, (dtype, default) in _COLUMNS.items()
+            if name not in ("confidence", "flags")
+        }
+        # Confiance : probabilité moyenne des jetons quand Whisper fournit avg_logprob
+        columns["confidence"] = np.array([
+            np.exp(seg["avg_logprob"]) if "avg_logprob" in seg else seg.get("confidence", 0.0)
+            for seg in segments
+        ], dtype=np.float32)
+        columns["flags"] = np.array([
+            FLAG_NON_VOCAL if is_non_vocal_text(text) else 0 for text in texts
+        ], dtype=np.uint8)
+        return cls(
+            texts,
+            tokens=[list(seg.get("tokens", [])) for seg in segments],
+            words=[list(seg.get("words", [])) for seg in segments],
+            **columns
+        )
+
+    @classmethod
+    def concatenate(cls, timelines: Sequence["SegmentTimeline"]) -> "SegmentTimeline":
+        """Concatène plusieurs timelines (supposées dans l'ordre chronologique)"""
+        return cls(
+            [text for t in timelines for text in t.texts],
+            tokens=[tok for t in timelines for tok in t.tokens],
+            words=[w for t in timelines for w in t.words],
+            **{name: np.concatenate([getattr(t, name) for t in timelines]) if timelines else None
+               for name in _COLUMNS}
+        )
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    @property
+    def durations(self) -> np.ndarray:
+        return self.end - self.start
+
+    @property
+    def vocal_mask(self) -> np.ndarray:
+        """Masque des segments vocaux"""
+        return (self.flags & FLAG_NON_VOCAL) == 0
+
+    def take(self, indices: np.ndarray) -> "SegmentTimeline":
+        """Sous-timeline des indices (ou du masque) donnés"""
+        indices = np.flatnonzero(indices) if np.asarray(indices).dtype == bool else np.asarray(indices)
+        return SegmentTimeline(
+            [self.texts[i] for i in indices],
+            tokens=[self.tokens[i] for i in indices],
+            words=[self.words[i] for i in indices],
+            **{name: getattr(self, name)[indices] for name in _COLUMNS}
+        )
+
+    def shift(self, offset: float) -> "SegmentTimeline":
+        """Décale tous les timestamps (segments et mots) de `offset` secondes, en place"""
+        self.start += offset
+        self.end += offset
+        for words in self.words:
+            for word in words:
+                word["start"] += offset
+                word["end"] += offset
+        return self
+
+    def normalize(self, min_duration: float = 0.1) -> "SegmentTimeline":
+        """
+        Corrige la timeline en temps linéaire : les chevauchements sont supprimés en
+        ramenant chaque début après la fin des segments précédents, puis chaque segment
+        plus court que `min_duration` est fusionné avec le segment qui le précède.
+
+        Args:
+            min_duration (float): Durée minimale d'un segment en secondes
+
+        Returns:
+            SegmentTimeline: Nouvelle timeline normalisée
+        """
+        n = len(self)
+        if n == 0:
+            return self
+        start = self.start.copy()
+        end = self.end.copy()
+
+        # Chevauchements : début >= plus grande fin précédente
+        prev_end = np.maximum.accumulate(end)[:-1]
+        overlaps = start[1:] < prev_end
+        if overlaps.any():
+            logger.warning(f"{int(overlaps.sum())} chevauchements de segments corrigés")
+            start[1:] = np.maximum(start[1:], prev_end)
+        end = np.maximum(end, start)
+
+        # Segments trop courts : fusion avec le segment précédent (sauf le premier)
+        short = (end - start) < min_duration
+        short[0] = False
+        if not short.any():
+            normalized = self.take(np.arange(n))
+            normalized.start, normalized.end = start, end
+            return normalized
+
+        logger.warning(f"{int(short.sum())} segments trop courts fusionnés avec le précédent")
+        heads = np.flatnonzero(~short)
+        group = np.cumsum(~short) - 1
+        group_sizes = np.bincount(group)
+
+        texts, tokens, words = [], [], []
+        for g, head in enumerate(heads):
+            if group_sizes[g] == 1:
+                texts.append(self.texts[head])
+                tokens.append(self.tokens[head])
+                words.append(self.words[head])
+            else:
+                members = range(head, head + group_sizes[g])
+                texts.append(" ".join(self.texts[i] for i in members))
+                tokens.append([tok for i in members for tok in self.tokens[i]])
+                words.append([w for i in members for w in self.words[i]])
+
+        columns = {name: getattr(self, name)[heads] for name in _COLUMNS}
+        columns["start"] = start[heads]
+        columns["end"] = np.maximum.reduceat(end, heads)
+        columns["flags"] = self.flags[heads] | np.where(group_sizes > 1, FLAG_MERGED, 0).astype(np.uint8)
+        return SegmentTimeline(texts, tokens=tokens, words=words, **columns)
+
+    def index_at(self, time: float) -> int:
+        """Indice du segment couvrant l'instant `time` (recherche dichotomique), -1 si aucun"""
+        i = int(np.searchsorted(self.start, time, side='right')) - 1
+        if i >= 0 and time < self.end[i]:
+            return i
+        return -1
+
+    def segment_at(self, time: float) -> Optional[Dict]:
+        """Segment couvrant l'instant `time`, ou None"""
+        i = self.index_at(time)
+        return self.segment(i) if i >= 0 else None
+
+    def segment(self, i: int) -> Dict:
+        """Segment `i` au format Whisper"""
+        return {
+            "id": i,
+            "seek": int(self.seek[i]),
+            "start": float(self.start[i]),
+            "end": float(self.end[i]),
+            "text": self.texts[i],
+            "tokens": self.tokens[i],
+            "temperature": float(self.temperature[i]),
+            "avg_logprob": float(self.avg_logprob[i]),
+            "compression_ratio": float(self.compression_ratio[i]),
+            "no_speech_prob": float(self.no_speech_prob[i]),
+            "words": self.words[i]
+        }
+
+    def to_segments(self) -> List[Dict]:
+        """Sérialise la timeline en segments au format Whisper"""
+        return [self.segment(i) for i in range(len(self))]
+
+    def to_timestamps(self) -> List[Dict]:
+        """Sérialise la timeline en timestamps (début, fin, texte, confiance, mots)"""
+        return [{
+            "start": start,
+            "end": end,
+            "text": text,
+            "confidence": confidence,
+            "words": words
+        } for start, end, text, confidence, words in zip(
+            self.start.tolist(), self.end.tolist(), self.texts, self.confidence.tolist(), self.words
+        )]
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Colonnes de la timeline, pour un stockage compact (np.savez)"""
+        return {name: getattr(self, name) for name in _COLUMNS}
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], texts: List[str],
+                    tokens: Optional[List[List[int]]] = None,
+                    words: Optional[List[List[Dict]]] = None) -> "SegmentTimeline":
+        """Reconstruit une timeline à partir de ses colonnes et de ses textes"""
+        return cls(texts, tokens=tokens, words=words,
+                   **{name: arrays[name] for name in _COLUMNS if name in arrays})
@@ -0,0 +1,118 @@
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+from src.utils.timeline import SegmentTimeline
+from src.utils.types import TranscriptionResult
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptionCache:
+    """Cache disque des transcriptions, adressé par le contenu de l'audio et les paramètres de décodage"""
+
+    def __init__(self, directory: str, max_size_mb: float = 500):
+        self.directory = Path(directory)
+        self.max_size_mb = max_size_mb
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "TranscriptionCache":
+        """Crée le cache à partir de la section `cache` de la configuration"""
+        return cls(
+            config.get('directory', './output/cache'),
+            max_size_mb=config.get('transcription_max_mb', 500)
+        )
+
+    @staticmethod
+    def make_key(audio_digest: str, model_name: str, language: Optional[str], options: Dict) -> str:
+        """
+        Construit la clé d'une transcription.
+
+        Args:
+            audio_digest (str): Empreinte SHA-256 de l'audio décodé
+            model_name (str): Nom du modèle Whisper
+            language (Optional[str]): Langue demandée (None pour la détection automatique)
+            options (Dict): Paramètres de décodage
+
+        Returns:
+            str: Clé hexadécimale
+        """
+        payload = json.dumps({
+            "audio": audio_digest,
+            "model": model_name,
+            "language": language or "auto",
+            "options": options
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.npz"
+
+    def get(self, key: str) -> Optional[TranscriptionResult]:
+        """Retourne la transcription en cache, ou None"""
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                meta = json.loads(str(data["meta"]))
+                offsets = data["token_offsets"]
+                tokens = np.split(data["tokens"], offsets[1:-1])
+                timeline = SegmentTimeline.from_arrays(
+                    data, meta["texts"],
+                    tokens=[t.tolist() for t in tokens] if len(offsets) > 1 else [],
+                    words=meta["words"]
+                )
+            os.utime(path)  # Marque l'entrée comme récemment utilisée
+            logger.info(f"Transcription trouvée dans le cache : {path.name}")
+            return TranscriptionResult(
+                text=meta["text"], timeline=timeline, language=meta["language"], stats=meta.get("stats", {})
+            )
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Entrée de cache illisible {path.name}, ignorée : {e}")
+            return None
+
+    def put(self, key: str, result: TranscriptionResult) -> None:
+        """Enregistre une transcription (colonnes de la timeline compressées) puis applique la limite de taille"""
+        path = self._path(key)
+        tmp_path = path.with_suffix('.tmp.npz')
+        timeline = result.timeline
+        meta = json.dumps({
+            "text": result.text,
+            "language": result.language,
+            "stats": result.stats,
+            "texts": timeline.texts,
+            "words": timeline.words
+        }, ensure_ascii=False, separators=(',', ':'))
+        lengths = np.array([len(tokens) for tokens in timeline.tokens], dtype=np.int64)
+        np.savez_compressed(
+            tmp_path,
+            meta=np.array(meta),
+            tokens=np.fromiter((tok for tokens in timeline.tokens for tok in tokens), dtype=np.int32),
+            token_offsets=np.concatenate(([0], np.cumsum(lengths))),
+            **timeline.to_arrays()
+        )
+        os.replace(tmp_path, path)
+        logger.info(f"Transcription enregistrée dans le cache : {path.name}")
+        self.evict()
+
+    def evict(self) -> None:
+        """Supprime les entrées les moins récemment utilisées au-delà de la taille maximale"""
+        entries = [(p, p.stat()) for p in self.directory.glob('*.npz')]
+        total = sum(stat.st_size for _, stat in entries)
+        limit = self.max_size_mb * 2**20
+        for path, stat in sorted(entries, key=lambda entry: entry[1].st_mtime):
+            if total <= limit:
+                break
+            try:
+                path.unlink()
+                total -= stat.st_size
+                logger.info(f"Éviction de la transcription en cache {path.name}")
+            except OSError as e:
+                logger.warning(f"Impossible de supprimer {path}: {e}")
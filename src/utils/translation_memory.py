@@ -0,0 +1,214 @@
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Nombre maximal de paramètres par requête SQLite
+_SQL_BATCH = 500
+
+# Nombre d'entrées enregistrées entre deux évictions
+_EVICT_INTERVAL = 1000
+
+
+def normalize_text(text: str) -> str:
+    """Normalise un texte source (Unicode NFC, espaces réduits) pour la recherche en mémoire"""
+    return re.sub(r'\s+', ' ', unicodedata.normalize('NFC', text)).strip()
+
+
+class TranslationMemory:
+    """Mémoire de traduction persistante (SQLite en mode WAL), partagée par les traducteurs"""
+
+    def __init__(self, path: str, max_entries: Optional[int] = None, max_age_days: Optional[float] = None):
+        """
+        Args:
+            path (str): Chemin de la base SQLite
+            max_entries (Optional[int]): Nombre maximal d'entrées conservées
+            max_age_days (Optional[float]): Âge maximal (depuis la dernière utilisation) d'une entrée
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+        self._stored_since_evict = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS translations (
+                key TEXT PRIMARY KEY,
+                engine TEXT NOT NULL,
+                model TEXT NOT NULL,
+                source_lang TEXT NOT NULL,
+                target_lang TEXT NOT NULL,
+                source_text TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_translations_last_used ON translations(last_used)")
+        self._conn.commit()
+        self.evict()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> Optional["TranslationMemory"]:
+        """Crée la mémoire à partir de la section `translation_memory` (None si désactivée)"""
+        if not config.get('enabled', False):
+            return None
+        return cls(
+            config.get('path', './output/cache/translation_memory.sqlite'),
+            max_entries=config.get('max_entries'),
+            max_age_days=config.get('max_age_days')
+        )
+
+    @staticmethod
+    def _key(engine: str, model: str, source_lang: str, target_lang: str, text: str) -> str:
+        payload = "\x1f".join((engine, model, source_lang, target_lang, normalize_text(text)))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def lookup_many(self, engine: str, model: str, source_lang: str, target_lang: str,
+                    texts: Iterable[str]) -> Dict[str, str]:
+        """
+        Recherche plusieurs textes en une seule série de requêtes.
+
+        Returns:
+            Dict[str, str]: Traductions trouvées, indexées par texte source
+        """
+        # Plusieurs textes sources peuvent partager une clé (mêmes textes une fois normalisés)
+        keys: Dict[str, List[str]] = {}
+        for text in dict.fromkeys(texts):
+            keys.setdefault(self._key(engine, model, source_lang, target_lang, text), []).append(text)
+        if not keys:
+            return {}
+        found: Dict[str, str] = {}
+        hit_keys = []
+        with self._lock:
+            key_list = list(keys)
+            for start in range(0, len(key_list), _SQL_BATCH):
+                batch = key_list[start:start + _SQL_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, translation FROM translations WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                for key, translation in rows:
+                    hit_keys.append(key)
+                    for text in keys[key]:
+                        found[text] = translation
+            if hit_keys:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE translations SET last_used = ? WHERE key = ?", [(now, key) for key in hit_keys]
+                )
+                self._conn.commit()
+            self.hits += len(found)
+            self.misses += sum(len(group) for group in keys.values()) - len(found)
+        return found
+
+    def lookup(self, engine: str, model: str, source_lang: str, target_lang: str, text: str) -> Optional[str]:
+        """Recherche la traduction d'un texte"""
+        return self.lookup_many(engine, model, source_lang, target_lang, [text]).get(text)
+
+    def store_many(self, engine: str, model: str, source_lang: str, target_lang: str,
+                   pairs: Iterable[Tuple[str, str]]) -> None:
+        """Enregistre des couples (texte source, traduction)"""
+        now = time.time()
+        rows = [
+            (self._key(engine, model, source_lang, target_lang, text), engine, model, source_lang,
+             target_lang, normalize_text(text), translation, now, now)
+            for text, translation in pairs if text and translation
+        ]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            self._conn.commit()
+            self._stored_since_evict += len(rows)
+            evict_due = self._stored_since_evict >= _EVICT_INTERVAL
+        # Éviction périodique (et à l'ouverture et à la fermeture), pas à chaque enregistrement
+        if evict_due:
+            self.evict()
+
+    def store(self, engine: str, model: str, source_lang: str, target_lang: str, text: str, translation: str) -> None:
+        """Enregistre la traduction d'un texte"""
+        self.store_many(engine, model, source_lang, target_lang, [(text, translation)])
+
+    def translate_batch(self, engine: str, model: str, source_lang: str, target_lang: str,
+                        texts: List[str], translate_fn: Callable[[List[str]], List[str]]) -> List[str]:
+        """
+        Traduit une liste de textes en ne confiant au modèle que ceux absents de la mémoire.
+
+        Args:
+            texts (List[str]): Les textes à traduire (les textes vides sont renvoyés tels quels)
+            translate_fn (Callable): Traduction groupée des textes manquants (sans doublons)
+
+        Returns:
+            List[str]: Les traductions, dans l'ordre des textes d'entrée
+        """
+        to_translate = [text for text in texts if text and text.strip()]
+        known = self.lookup_many(engine, model, source_lang, target_lang, to_translate)
+        if known:
+            logger.info(f"{sum(text in known for text in to_translate)} textes sur {len(to_translate)} "
+                        f"trouvés en mémoire de traduction")
+        missing = list(dict.fromkeys(text for text in to_translate if text not in known))
+        if missing:
+            new_pairs = list(zip(missing, translate_fn(missing)))
+            self.store_many(engine, model, source_lang, target_lang, new_pairs)
+            known.update(new_pairs)
+        return [known.get(text, text) for text in texts]
+
+    def evict(self) -> None:
+        """Supprime les entrées trop anciennes, puis les moins récemment utilisées au-delà du maximum"""
+        with self._lock:
+            self._stored_since_evict = 0
+            removed = 0
+            if self.max_age_days is not None:
+                cutoff = time.time() - self.max_age_days * 86400
+                removed += self._conn.execute("DELETE FROM translations WHERE last_used < ?", (cutoff,)).rowcount
+            if self.max_entries is not None:
+                excess = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0] - self.max_entries
+                if excess > 0:
+                    # Parcours de l'index sur last_used : seules les entrées en trop sont lues
+                    removed += self._conn.execute("""
+                        DELETE FROM translations WHERE key IN (
+                            SELECT key FROM translations ORDER BY last_used LIMIT ?
+                        )
+                    """, (excess,)).rowcount
+            if removed:
+                self._conn.commit()
+                logger.info(f"{removed} entrées évincées de la mémoire de traduction")
+
+    def stats(self) -> Dict:
+        """Compteurs de succès et d'échecs de la mémoire"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": entries
+        }
+
+    def log_stats(self) -> None:
+        """Affiche les statistiques de la mémoire dans les logs"""
+        stats = self.stats()
+        logger.info(f"Mémoire de traduction : {stats['hits']} succès, {stats['misses']} échecs "
+                    f"({stats['hit_rate']:.1%}), {stats['entries']} entrées")
+
+    def close(self) -> None:
+        """Applique les limites de la mémoire puis ferme la connexion SQLite"""
+        self.evict()
+        with self._lock:
+            self._conn.close()
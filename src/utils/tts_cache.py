@@ -0,0 +1,149 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import soundfile as sf
+
+from src.utils.translation_memory import normalize_text
+
+logger = logging.getLogger(__name__)
+
+# Empreintes des fichiers de voix, par (chemin, taille, date de modification)
+_file_digests: Dict[Tuple[str, int, int], str] = {}
+_file_digests_lock = threading.Lock()
+
+
+def file_digest(path: str) -> str:
+    """Empreinte SHA-256 du contenu d'un fichier, calculée une fois par version du fichier"""
+    stat = os.stat(path)
+    cache_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    with _file_digests_lock:
+        if cache_key in _file_digests:
+            return _file_digests[cache_key]
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    with _file_digests_lock:
+        _file_digests[cache_key] = digest.hexdigest()
+    return _file_digests[cache_key]
+
+
+class TTSCache:
+    """Cache disque des clips de synthèse vocale (FLAC), adressé par le texte et la voix"""
+
+    def __init__(self, directory: str, max_size_mb: float = 1000):
+        self.directory = Path(directory)
+        self.max_size_mb = max_size_mb
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # Taille totale suivie en mémoire : le répertoire n'est parcouru que pour évincer
+        self._size = self.evict()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "TTSCache":
+        """Crée le cache à partir de la section `cache` de la configuration"""
+        return cls(
+            os.path.join(config.get('directory', './output/cache'), 'tts'),
+            max_size_mb=config.get('tts_max_mb', 1000)
+        )
+
+    @staticmethod
+    def make_key(text: str, model_path: str, config_path: str, speaker_id: Optional[int],
+                 sample_rate: Optional[int]) -> str:
+        """
+        Construit la clé d'un clip.
+
+        Args:
+            text (str): Texte synthétisé (normalisé avant hachage)
+            model_path (str): Fichier ONNX de la voix (haché par contenu)
+            config_path (str): Fichier de configuration de la voix (haché par contenu)
+            speaker_id (Optional[int]): Locuteur
+            sample_rate (Optional[int]): Fréquence d'échantillonnage demandée
+
+        Returns:
+            str: Clé hexadécimale
+        """
+        payload = json.dumps({
+            "text": normalize_text(text),
+            "model": file_digest(model_path),
+            "config": file_digest(config_path),
+            "speaker": speaker_id,
+            "sample_rate": sample_rate
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.flac"
+
+    def get(self, key: str) -> Optional[Tuple[np.ndarray, int]]:
+        """Retourne le clip en cache (échantillons float32, fréquence), ou None"""
+        path = self._path(key)
+        try:
+            samples, sample_rate = sf.read(path, dtype='float32')
+            os.utime(path)  # Marque l'entrée comme récemment utilisée
+        except (OSError, RuntimeError) as e:
+            if path.exists():
+                logger.warning(f"Clip de cache illisible {path.name}, ignoré : {e}")
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return samples, sample_rate
+
+    def put(self, key: str, samples: np.ndarray, sample_rate: int) -> None:
+        """Enregistre un clip (FLAC 16 bits) puis applique la limite de taille"""
+        path = self._path(key)
+        tmp_path = self.directory / f"{key}.{threading.get_ident()}.tmp.flac"
+        sf.write(tmp_path, samples, sample_rate, subtype='PCM_16')
+        size = tmp_path.stat().st_size
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._size += size
+            over_limit = self._size > self.max_size_mb * 2**20
+        if over_limit:
+            size = self.evict()
+            with self._lock:
+                self._size = size
+
+    def evict(self) -> int:
+        """
+        Supprime les clips les moins récemment utilisés au-delà de la taille maximale.
+
+        Returns:
+            int: Taille totale restante en octets
+        """
+        entries = []
+        for path in self.directory.glob('*.flac'):
+            if path.name.endswith('.tmp.flac'):
+                continue  # Clip en cours d'écriture
+            try:
+                entries.append((path, path.stat()))
+            except OSError:
+                continue  # Supprimé entre-temps par un autre thread
+        total = sum(stat.st_size for _, stat in entries)
+        limit = self.max_size_mb * 2**20
+        for path, stat in sorted(entries, key=lambda entry: entry[1].st_mtime):
+            if total <= limit:
+                break
+            try:
+                path.unlink()
+                total -= stat.st_size
+                logger.info(f"Éviction du clip en cache {path.name}")
+            except OSError as e:
+                logger.warning(f"Impossible de supprimer {path}: {e}")
+        return total
+
+    def log_stats(self) -> None:
+        """Affiche les statistiques du cache dans les logs"""
+        total = self.hits + self.misses
+        rate = self.hits / total if total else 0.0
+        logger.info(f"Cache TTS : {self.hits} clips réutilisés, {self.misses} synthétisés ({rate:.1%})")
@@ -1,17 +1,35 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import cached_property
 from typing import Dict, List
+from src.utils.timeline import SegmentTimeline
 
 @dataclass
 class TranscriptionResult:
     """Classe pour stocker les résultats de la transcription"""
     text: str
-    segments: List[Dict]
-    timestamps: List[Dict]
+    timeline: SegmentTimeline
     language: str
+    stats: Dict = field(default_factory=dict)
+
+    @classmethod
+    def from_segments(cls, text: str, segments: List[Dict], language: str) -> "TranscriptionResult":
+        """Construit le résultat à partir de segments au format Whisper"""
+        return cls(text=text, timeline=SegmentTimeline.from_segments(segments), language=language)
+
+    # Sérialisations calculées au premier accès puis conservées (la timeline n'est plus modifiée)
+    @cached_property
+    def segments(self) -> List[Dict]:
+        """Segments au format Whisper (format JSON historique)"""
+        return self.timeline.to_segments()
+
+    @cached_property
+    def timestamps(self) -> List[Dict]:
+        """Timestamps des segments (début, fin, texte, confiance, mots)"""
+        return self.timeline.to_timestamps()
 
 @dataclass
 class SummaryResult:
     """Classe pour stocker les différents résumés"""
     short: str
     medium: str
-    long: str 
\ No newline at end of file
+    long: str
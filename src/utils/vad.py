@@ -0,0 +1,111 @@
+import logging
+from typing import List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Nombre de trames analysées par bloc FFT, pour borner la mémoire sur les longs fichiers
+_BLOCK_FRAMES = 4096
+
+
+def _frame_features(samples: np.ndarray, frame_samples: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Calcule l'énergie (dB), la platitude spectrale et le taux de passage par zéro de chaque trame.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: energy_db, flatness, zcr
+    """
+    n_frames = len(samples) // frame_samples
+    frames = samples[:n_frames * frame_samples].reshape(n_frames, frame_samples)
+
+    energy_db = 20 * np.log10(np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1)) + 1e-10)
+    signs = np.signbit(frames)
+    zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / frame_samples
+
+    window = np.hanning(frame_samples).astype(np.float32)
+    flatness = np.empty(n_frames, dtype=np.float32)
+    for start in range(0, n_frames, _BLOCK_FRAMES):
+        block = frames[start:start + _BLOCK_FRAMES] * window
+        power = np.square(np.abs(np.fft.rfft(block, axis=1))) + 1e-10
+        flatness[start:start + _BLOCK_FRAMES] = np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+    return energy_db, flatness, zcr
+
+
+def _hysteresis(low: np.ndarray, high: np.ndarray) -> np.ndarray:
+    """Garde les plages continues de `low` qui contiennent au moins une trame `high`"""
+    if not low.any():
+        return low
+    run_starts = low & ~np.concatenate(([False], low[:-1]))
+    run_ids = np.cumsum(run_starts) * low  # 0 hors des plages
+    has_high = np.bincount(run_ids, weights=(high & low), minlength=run_ids.max() + 1) > 0
+    has_high[0] = False
+    return has_high[run_ids]
+
+
+def _mask_to_regions(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Indices de début (inclus) et de fin (exclus) des plages vraies d'un masque"""
+    edges = np.diff(mask.astype(np.int8), prepend=0, append=0)
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def detect_speech_regions(
+    samples: np.ndarray,
+    sample_rate: int = 16000,
+    frame_seconds: float = 0.03,
+    high_margin_db: float = 12.0,
+    low_margin_db: float = 6.0,
+    max_flatness: float = 0.5,
+    max_zcr: float = 0.35,
+    min_speech_duration: float = 0.25,
+    min_silence_duration: float = 0.3
+) -> List[Tuple[float, float]]:
+    """
+    Détecte les zones de parole d'un signal, sans modèle, par opérations vectorisées.
+
+    Une trame est candidate si son énergie dépasse le plancher de bruit (percentile 10)
+    d'une marge ; le seuil haut exige en plus un spectre peu plat (voisé) et un taux de
+    passage par zéro modéré. Une hystérésis étend chaque zone tant que le seuil bas est
+    tenu, puis les silences trop courts sont comblés et les zones trop courtes supprimées.
+
+    Args:
+        samples (np.ndarray): Signal float32 mono
+        sample_rate (int): Fréquence d'échantillonnage
+        frame_seconds (float): Durée d'une trame d'analyse
+        high_margin_db (float): Marge au-dessus du bruit pour entrer dans une zone de parole
+        low_margin_db (float): Marge au-dessus du bruit pour y rester
+        max_flatness (float): Platitude spectrale maximale d'une trame voisée
+        max_zcr (float): Taux de passage par zéro maximal d'une trame voisée
+        min_speech_duration (float): Durée minimale d'une zone de parole
+        min_silence_duration (float): Durée minimale d'un silence entre deux zones
+
+    Returns:
+        List[Tuple[float, float]]: Zones de parole (début, fin) en secondes
+    """
+    frame_samples = max(1, int(frame_seconds * sample_rate))
+    if len(samples) < frame_samples:
+        return []
+
+    energy_db, flatness, zcr = _frame_features(np.asarray(samples, dtype=np.float32), frame_samples)
+    noise_floor = np.percentile(energy_db, 10)
+    low = energy_db > noise_floor + low_margin_db
+    high = (energy_db > noise_floor + high_margin_db) & (flatness < max_flatness) & (zcr < max_zcr)
+    speech = _hysteresis(low, high)
+
+    starts, ends = _mask_to_regions(speech)
+    if len(starts) == 0:
+        return []
+
+    # Comblement des silences trop courts entre deux zones
+    min_gap = int(np.ceil(min_silence_duration / frame_seconds))
+    keep_gap = (starts[1:] - ends[:-1]) >= min_gap
+    starts = starts[np.concatenate(([True], keep_gap))]
+    ends = ends[np.concatenate((keep_gap, [True]))]
+
+    # Suppression des zones trop courtes
+    min_len = int(np.ceil(min_speech_duration / frame_seconds))
+    long_enough = (ends - starts) >= min_len
+    starts, ends = starts[long_enough], ends[long_enough]
+
+    scale = frame_samples / sample_rate
+    return list(zip((starts * scale).tolist(), (ends * scale).tolist()))
@@ -0,0 +1,121 @@
+import numpy as np
+import soundfile as sf
+
+from src.utils.audio_mixer import TimelineMixer, load_clip, resample
+
+SAMPLE_RATE = 1000
+
+
+def _sine(freq: float, duration: float, sample_rate: int) -> np.ndarray:
+    t = np.arange(int(round(duration * sample_rate))) / sample_rate
+    return np.sin(2 * np.pi * freq * t).astype(np.float32)
+
+
+def _mixer(n: int = 100, crossfade: float = 0.0) -> TimelineMixer:
+    return TimelineMixer(np.full(n, 0.5, dtype=np.float32), SAMPLE_RATE, crossfade=crossfade)
+
+
+def test_write_replaces_region():
+    mixer = _mixer()
+    mixer.write(np.ones(10, dtype=np.float32), 0.02)
+    expected = np.full(100, 0.5, dtype=np.float32)
+    expected[20:30] = 1.0
+    np.testing.assert_array_equal(mixer.buffer, expected)
+
+
+def test_write_crossfades_edges():
+    mixer = _mixer(crossfade=0.004)
+    mixer.write(np.ones(20, dtype=np.float32), 0.04)
+    region = mixer.buffer[40:60]
+    assert np.all(np.diff(region[:4]) > 0) and np.all(np.diff(region[-4:]) < 0)
+    assert 0.5 < region[0] < 1.0 and 0.5 < region[-1] < 1.0
+    np.testing.assert_array_equal(region[4:-4], 1.0)
+    np.testing.assert_array_equal(mixer.buffer[:40], 0.5)
+    np.testing.assert_array_equal(mixer.buffer[60:], 0.5)
+
+
+def test_write_clamps_to_buffer():
+    clip = np.arange(1, 21, dtype=np.float32)
+    mixer = _mixer()
+    mixer.write(clip, -0.005)  # 5 premiers échantillons avant le début
+    np.testing.assert_array_equal(mixer.buffer[:15], clip[5:])
+    np.testing.assert_array_equal(mixer.buffer[15:], 0.5)
+
+    mixer = _mixer()
+    mixer.write(clip, 0.09)  # Dépasse la fin
+    np.testing.assert_array_equal(mixer.buffer[90:], clip[:10])
+
+    mixer = _mixer()
+    for start in (-0.05, 0.1, 0.5):  # Entièrement hors du mixage
+        mixer.write(clip, start)
+    mixer.write(np.zeros(0, dtype=np.float32), 0.01)
+    np.testing.assert_array_equal(mixer.buffer, 0.5)
+
+
+def test_overlay_adds_with_gain_and_fades():
+    mixer = _mixer()
+    mixer.overlay(np.ones(20, dtype=np.float32), 0.01, gain=0.5, fade_in=0.004, fade_out=0.004)
+    added = mixer.buffer[10:30] - 0.5
+    np.testing.assert_allclose(added[4:16], 0.5)
+    assert np.all(np.diff(added[:4]) > 0) and np.all(np.diff(added[-4:]) < 0)
+    assert 0.0 < added[0] < 0.5 and 0.0 < added[-1] < 0.5
+    np.testing.assert_array_equal(mixer.buffer[:10], 0.5)
+    np.testing.assert_array_equal(mixer.buffer[30:], 0.5)
+
+
+def test_overlay_clamps_to_buffer():
+    clip = np.arange(1, 21, dtype=np.float32)
+    mixer = _mixer()
+    mixer.overlay(clip, -0.005)
+    np.testing.assert_array_equal(mixer.buffer[:15], 0.5 + clip[5:])
+    np.testing.assert_array_equal(mixer.buffer[15:], 0.5)
+
+    mixer = _mixer()
+    mixer.overlay(clip, 0.095)
+    np.testing.assert_array_equal(mixer.buffer[95:], 0.5 + clip[:5])
+
+    mixer = _mixer()
+    mixer.overlay(clip, -0.03)
+    mixer.overlay(clip, 0.2)
+    np.testing.assert_array_equal(mixer.buffer, 0.5)
+
+
+def test_silent_mixer_and_wav_round_trip(tmp_path):
+    mixer = TimelineMixer.silent(0.1, SAMPLE_RATE * 16)
+    assert len(mixer) == 1600 and mixer.duration == 0.1
+    mixer.overlay(0.25 * _sine(440, 0.05, SAMPLE_RATE * 16), 0.02)
+    path = tmp_path / "mix.wav"
+    mixer.write_wav(str(path))
+    samples, rate = sf.read(str(path), dtype='float32')
+    assert rate == SAMPLE_RATE * 16
+    np.testing.assert_allclose(samples, mixer.buffer, atol=1e-4)
+
+
+def test_resample_matches_reference_sine():
+    for orig_sr, target_sr in ((16000, 22050), (22050, 16000), (44100, 16000), (8000, 48000)):
+        resampled = resample(_sine(440, 0.5, orig_sr), orig_sr, target_sr)
+        reference = _sine(440, 0.5, target_sr)
+        assert len(resampled) == len(reference)
+        # Bords exclus (la sinusoïde tronquée n'est pas périodique sur le bloc FFT)
+        edge = target_sr // 50
+        np.testing.assert_allclose(resampled[edge:-edge], reference[edge:-edge], atol=1e-2)
+
+
+def test_resample_removes_frequencies_above_nyquist():
+    resampled = resample(_sine(6000, 0.5, 16000), 16000, 8000)
+    edge = 8000 // 50
+    assert np.abs(resampled[edge:-edge]).max() < 1e-2
+
+
+def test_resample_identity_and_empty():
+    samples = _sine(440, 0.01, 16000)
+    np.testing.assert_array_equal(resample(samples, 16000, 16000), samples)
+    assert len(resample(np.zeros(0, dtype=np.float32), 16000, 22050)) == 0
+
+
+def test_load_clip_downmixes_and_resamples(tmp_path):
+    left = _sine(440, 0.25, 22050)
+    path = tmp_path / "clip.wav"
+    sf.write(str(path), np.stack([left, np.zeros_like(left)], axis=1), 22050, subtype='FLOAT')
+    np.testing.assert_allclose(load_clip(str(path)), left / 2, atol=1e-6)
+    assert len(load_clip(str(path), 16000)) == 4000
@@ -0,0 +1,75 @@
+import numpy as np
+
+from src.utils.ducking import FFT_SIZE, Ducker, merge_spans, voice_band_filter
+
+SAMPLE_RATE = 16000
+
+
+def test_merge_spans():
+    spans = [(5.0, 6.0), (0.0, 1.0), (1.2, 2.0), (3.0, 4.0)]
+    assert merge_spans(spans, 0.3) == [(0.0, 2.0), (3.0, 4.0), (5.0, 6.0)]
+    assert merge_spans(spans, 0.1) == sorted(spans)
+    assert merge_spans([], 1.0) == []
+
+
+def test_breakpoints_merge_close_spans():
+    ducker = Ducker(depth_db=-20, attack=0.1, release=0.2)
+    positions, gains = ducker.breakpoints([(1.0, 2.0), (2.2, 3.0), (5.0, 6.0)], 10)
+    np.testing.assert_allclose(positions, [9, 10, 30, 32, 49, 50, 60, 62])
+    np.testing.assert_allclose(gains, [1.0, 0.1, 0.1, 1.0] * 2)
+
+
+def test_envelope_values():
+    ducker = Ducker(depth_db=-20, attack=0.1, release=0.2)
+    samples = np.ones(5 * SAMPLE_RATE, dtype=np.float32)
+    ducker.apply(samples, SAMPLE_RATE, [(1.0, 2.0)])
+    at = lambda t: samples[int(round(t * SAMPLE_RATE))]
+    assert at(0.5) == 1.0 and at(0.9) == 1.0
+    assert abs(at(0.95) - 0.55) < 1e-3   # Milieu de la descente
+    assert abs(at(1.5) - 0.1) < 1e-6
+    assert abs(at(2.1) - 0.55) < 1e-3    # Milieu de la remontée
+    assert at(2.2) == 1.0 and at(4.0) == 1.0
+
+
+def test_envelope_across_blocks_matches_interpolation():
+    # Signal de plusieurs blocs, zones atténuées à cheval sur les frontières de bloc
+    ducker = Ducker(depth_db=-12, attack=0.05, release=0.25)
+    n = 3 * FFT_SIZE + 1234
+    spans = [(0.5, 4.0), (4.05, 4.1), (8.0, 12.5)]
+    samples = np.random.default_rng(0).standard_normal(n).astype(np.float32)
+    expected = samples * np.interp(np.arange(n), *ducker.breakpoints(spans, SAMPLE_RATE)).astype(np.float32)
+    ducker.apply(samples, SAMPLE_RATE, spans)
+    np.testing.assert_allclose(samples, expected, rtol=1e-6)
+
+
+def test_no_spans_leaves_signal_untouched():
+    samples = np.random.default_rng(1).standard_normal(1000).astype(np.float32)
+    original = samples.copy()
+    Ducker().apply(samples, SAMPLE_RATE, [])
+    np.testing.assert_array_equal(samples, original)
+
+
+def test_band_mode_matches_direct_convolution():
+    ducker = Ducker(depth_db=-18, attack=0.05, release=0.25, voice_band=(300, 3400), taps=511)
+    n = 2 * FFT_SIZE + 5000
+    spans = [(1.0, 3.0), (4.06, 6.0), (8.0, 8.5)]
+    samples = np.random.default_rng(2).standard_normal(n).astype(np.float32)
+
+    # Référence : composante vocale par convolution directe (filtre centré), retirée selon l'enveloppe
+    h = voice_band_filter(300, 3400, SAMPLE_RATE, 511)
+    voice = np.convolve(samples.astype(np.float64), h)[255:255 + n]
+    envelope = np.interp(np.arange(n), *ducker.breakpoints(spans, SAMPLE_RATE))
+    expected = samples - (1.0 - envelope) * voice
+
+    ducker.apply(samples, SAMPLE_RATE, spans)
+    np.testing.assert_allclose(samples, expected, atol=1e-4)
+
+
+def test_band_mode_keeps_frequencies_outside_voice_band():
+    t = np.arange(2 * SAMPLE_RATE) / SAMPLE_RATE
+    bass = np.sin(2 * np.pi * 80 * t)
+    voice = np.sin(2 * np.pi * 1000 * t)
+    samples = (bass + voice).astype(np.float32)
+    Ducker(depth_db=-40, voice_band=(300, 3400)).apply(samples, SAMPLE_RATE, [(0.0, 2.0)])
+    middle = slice(SAMPLE_RATE // 2, 3 * SAMPLE_RATE // 2)
+    np.testing.assert_allclose(samples[middle], bass[middle] + 0.01 * voice[middle], atol=2e-2)
@@ -0,0 +1,23 @@
+import numpy as np
+
+from src.utils.model_registry import ModelRegistry
+
+
+def _native_model(mb: int):
+    """Modèle sans tenseur PyTorch (comme CTranslate2) : seule la RSS reflète sa taille"""
+    return np.ones(mb * 2**20 // 8)
+
+
+def test_size_falls_back_to_rss_without_tensors():
+    registry = ModelRegistry()
+    registry.get("native", "a", lambda: _native_model(64))
+    assert registry.stats()[0]["size_mb"] > 48
+
+
+def test_budget_evicts_least_recently_used():
+    registry = ModelRegistry(memory_budget_mb=100)
+    registry.get("native", "a", lambda: _native_model(64))
+    registry.get("native", "b", lambda: _native_model(64))
+    assert [stat["name"] for stat in registry.stats()] == ["b"]
+    model = registry.get("native", "b", lambda: None)
+    assert model is not None and registry.stats()[0]["hits"] == 1
@@ -0,0 +1,74 @@
+import numpy as np
+
+from src.utils.time_stretch import fit_clip, time_stretch
+
+SAMPLE_RATE = 22050
+
+
+def _sine(freq: float, duration: float) -> np.ndarray:
+    t = np.arange(int(duration * SAMPLE_RATE)) / SAMPLE_RATE
+    return (0.5 * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def _dominant_frequency(samples: np.ndarray) -> float:
+    spectrum = np.abs(np.fft.rfft(samples * np.hanning(len(samples))))
+    return np.argmax(spectrum) * SAMPLE_RATE / len(samples)
+
+
+def test_fit_clip_near_unit_rate():
+    # 3000 échantillons pour un créneau de 3001,5 : vitesse ~1, copie directe
+    samples = _sine(220, 3000 / SAMPLE_RATE)
+    fitted, result = fit_clip(samples, SAMPLE_RATE, 3001.5 / SAMPLE_RATE)
+    assert len(fitted) == 3002
+    assert abs(result.rate - 1.0) < 1e-3 and not result.trimmed
+    np.testing.assert_array_equal(fitted[:3000], samples)
+    assert not fitted[3000:].any()
+
+
+def test_fit_clip_empty_clip():
+    fitted, result = fit_clip(np.zeros(0, dtype=np.float32), SAMPLE_RATE, 0.5)
+    assert len(fitted) == int(0.5 * SAMPLE_RATE)
+    assert not fitted.any()
+    assert result.rate == 1.0 and not result.trimmed and result.duration == 0.0
+
+
+def test_fit_clip_speeds_up_within_bounds():
+    samples = _sine(220, 1.2)
+    fitted, result = fit_clip(samples, SAMPLE_RATE, 1.0)
+    assert len(fitted) == SAMPLE_RATE
+    assert abs(result.rate - 1.2) < 1e-3 and not result.trimmed
+
+
+def test_fit_clip_trims_beyond_max_speed():
+    samples = _sine(220, 2.0)
+    fitted, result = fit_clip(samples, SAMPLE_RATE, 1.0, max_speed=1.5)
+    assert len(fitted) == SAMPLE_RATE
+    assert result.rate == 1.5 and result.trimmed
+    assert abs(fitted[-1]) < 1e-6  # Fondu de sortie
+
+
+def test_fit_clip_pads_below_min_speed():
+    samples = _sine(220, 0.5)
+    fitted, result = fit_clip(samples, SAMPLE_RATE, 1.0, min_speed=0.8)
+    assert len(fitted) == SAMPLE_RATE
+    assert result.rate == 0.8 and not result.trimmed
+    assert not fitted[int(0.5 / 0.8 * SAMPLE_RATE) + 1:].any()
+
+
+def test_time_stretch_preserves_pitch_and_level():
+    samples = _sine(220, 1.0)
+    for rate in (0.8, 1.25, 1.5):
+        stretched = time_stretch(samples, rate, SAMPLE_RATE)
+        assert len(stretched) == int(round(len(samples) / rate))
+        middle = stretched[len(stretched) // 4:3 * len(stretched) // 4]
+        assert abs(_dominant_frequency(middle) - 220) < 5
+        # Trames en phase : niveau RMS conservé
+        assert abs(np.sqrt(np.mean(middle ** 2)) - 0.5 / np.sqrt(2)) < 0.03
+
+
+def test_time_stretch_writes_into_out():
+    samples = _sine(220, 0.5)
+    out = np.zeros(SAMPLE_RATE, dtype=np.float32)
+    stretched = time_stretch(samples, 1.25, SAMPLE_RATE, out=out)
+    assert np.shares_memory(stretched, out)
+    assert not out[len(stretched):].any()
@@ -0,0 +1,95 @@
+import numpy as np
+
+from src.utils.timeline import FLAG_MERGED, FLAG_NON_VOCAL, SegmentTimeline
+from src.utils.transcription_cache import TranscriptionCache
+from src.utils.types import TranscriptionResult
+
+
+def _segments():
+    return [
+        {"id": 0, "seek": 0, "start": 0.0, "end": 1.5, "text": " Bonjour.", "tokens": [1, 2],
+         "temperature": 0.0, "avg_logprob": -0.25, "compression_ratio": 1.2, "no_speech_prob": 0.01,
+         "words": [{"word": " Bonjour.", "start": 0.0, "end": 1.5, "probability": 0.9}]},
+        {"id": 1, "seek": 0, "start": 1.5, "end": 4.0, "text": "[Music]", "tokens": [3],
+         "temperature": 0.0, "avg_logprob": -1.0, "compression_ratio": 0.5, "no_speech_prob": 0.8,
+         "words": []},
+        {"id": 2, "seek": 3000, "start": 4.0, "end": 6.25, "text": " Au revoir.", "tokens": [4, 5, 6],
+         "temperature": 0.2, "avg_logprob": -0.5, "compression_ratio": 1.1, "no_speech_prob": 0.02,
+         "words": []},
+    ]
+
+
+def _assert_segments_close(actual, expected):
+    assert len(actual) == len(expected)
+    for a, e in zip(actual, expected):
+        assert a.keys() == e.keys()
+        for key, value in e.items():
+            if isinstance(value, float):
+                assert abs(a[key] - value) < 1e-6, key
+            else:
+                assert a[key] == value, key
+
+
+def test_segments_round_trip():
+    timeline = SegmentTimeline.from_segments(_segments())
+    _assert_segments_close(timeline.to_segments(), _segments())
+    assert timeline.flags.tolist() == [0, FLAG_NON_VOCAL, 0]
+    assert timeline.vocal_mask.tolist() == [True, False, True]
+    np.testing.assert_allclose(timeline.confidence, np.exp([-0.25, -1.0, -0.5]), rtol=1e-6)
+
+
+def test_arrays_round_trip():
+    timeline = SegmentTimeline.from_segments(_segments())
+    restored = SegmentTimeline.from_arrays(timeline.to_arrays(), timeline.texts,
+                                           tokens=timeline.tokens, words=timeline.words)
+    _assert_segments_close(restored.to_segments(), timeline.to_segments())
+    assert restored.to_timestamps() == timeline.to_timestamps()
+
+
+def test_cache_round_trip(tmp_path):
+    cache = TranscriptionCache(str(tmp_path))
+    result = TranscriptionResult.from_segments("Bonjour. Au revoir.", _segments(), "fr")
+    result.stats["escalated_segments"] = 1
+    key = cache.make_key("digest", "small", "fr", {"beam_size": 5})
+    cache.put(key, result)
+
+    restored = cache.get(key)
+    assert (restored.text, restored.language, restored.stats) == (result.text, result.language, result.stats)
+    _assert_segments_close(restored.segments, result.segments)
+    assert restored.timestamps == result.timestamps
+    assert cache.get(cache.make_key("digest", "small", "en", {"beam_size": 5})) is None
+
+
+def test_cache_round_trip_empty(tmp_path):
+    cache = TranscriptionCache(str(tmp_path))
+    cache.put("empty", TranscriptionResult.from_segments("", [], "en"))
+    restored = cache.get("empty")
+    assert len(restored.timeline) == 0 and restored.segments == []
+
+
+def test_result_serializations_are_cached():
+    result = TranscriptionResult.from_segments("", _segments(), "fr")
+    assert result.segments is result.segments
+    assert result.timestamps is result.timestamps
+
+
+def test_normalize_clamps_overlaps_and_merges_short_segments():
+    timeline = SegmentTimeline(
+        ["a", "b", "c", "d"],
+        start=np.array([0.0, 0.8, 2.0, 2.05]),
+        end=np.array([1.0, 2.0, 2.05, 3.0]),
+    )
+    normalized = timeline.normalize(min_duration=0.1)
+    assert normalized.texts == ["a", "b c", "d"]
+    np.testing.assert_allclose(normalized.start, [0.0, 1.0, 2.05])
+    np.testing.assert_allclose(normalized.end, [1.0, 2.05, 3.0])
+    assert normalized.flags.tolist() == [0, FLAG_MERGED, 0]
+
+
+def test_index_at():
+    timeline = SegmentTimeline.from_segments(_segments())
+    assert timeline.index_at(0.0) == 0
+    assert timeline.index_at(1.5) == 1
+    assert timeline.index_at(6.25) == -1
+    assert timeline.index_at(-1.0) == -1
+    assert timeline.segment_at(5.0)["text"] == " Au revoir."
@@ -0,0 +1,39 @@
+from src.utils import translation_memory
+from src.utils.translation_memory import TranslationMemory
+
+KEY = ("argos", "en-fr", "en", "fr")
+
+
+def test_lookup_returns_every_text_sharing_a_key(tmp_path):
+    memory = TranslationMemory(str(tmp_path / "tm.sqlite"))
+    memory.store(*KEY, "Hello world", "Bonjour le monde")
+    found = memory.lookup_many(*KEY, ["Hello world", "Hello  world ", "Hello world", "Goodbye"])
+    assert found == {"Hello world": "Bonjour le monde", "Hello  world ": "Bonjour le monde"}
+    assert (memory.hits, memory.misses) == (2, 1)
+    memory.close()
+
+
+def test_translate_batch_only_translates_missing_texts(tmp_path):
+    memory = TranslationMemory(str(tmp_path / "tm.sqlite"))
+    memory.store(*KEY, "one", "un")
+    calls = []
+
+    def translate(texts):
+        calls.append(texts)
+        return [text.upper() for text in texts]
+
+    assert memory.translate_batch(*KEY, ["one", "two", "", "two"], translate) == ["un", "TWO", "", "TWO"]
+    assert calls == [["two"]]
+    memory.close()
+
+
+def test_eviction_is_periodic_and_keeps_most_recent(tmp_path, monkeypatch):
+    monkeypatch.setattr(translation_memory, "_EVICT_INTERVAL", 4)
+    memory = TranslationMemory(str(tmp_path / "tm.sqlite"), max_entries=2)
+    for i in range(3):
+        memory.store(*KEY, f"text {i}", f"texte {i}")
+    assert memory.stats()["entries"] == 3  # Pas encore d'éviction
+    memory.store(*KEY, "text 3", "texte 3")
+    assert memory.stats()["entries"] == 2
+    assert memory.lookup_many(*KEY, ["text 2", "text 3"]) == {"text 2": "texte 2", "text 3": "texte 3"}
+    memory.close()
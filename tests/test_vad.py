@@ -0,0 +1,66 @@
+import numpy as np
+
+from src.utils.vad import _hysteresis, _mask_to_regions, detect_speech_regions
+
+SAMPLE_RATE = 16000
+
+
+def _voiced(duration: float, f0: float = 150.0) -> np.ndarray:
+    """Signal voisé synthétique : fondamentale et harmoniques décroissantes"""
+    t = np.arange(int(duration * SAMPLE_RATE)) / SAMPLE_RATE
+    return sum(0.3 / k * np.sin(2 * np.pi * k * f0 * t) for k in range(1, 6)).astype(np.float32)
+
+
+def _noise(duration: float, level: float = 1e-3, seed: int = 0) -> np.ndarray:
+    return (level * np.random.default_rng(seed).standard_normal(int(duration * SAMPLE_RATE))).astype(np.float32)
+
+
+def test_hysteresis_keeps_runs_with_high_frame():
+    low = np.array([1, 1, 0, 1, 1, 1, 0, 1], dtype=bool)
+    high = np.array([0, 0, 0, 0, 1, 0, 0, 1], dtype=bool)
+    expected = np.array([0, 0, 0, 1, 1, 1, 0, 1], dtype=bool)
+    np.testing.assert_array_equal(_hysteresis(low, high), expected)
+
+
+def test_hysteresis_ignores_high_outside_low():
+    low = np.array([1, 1, 0, 0], dtype=bool)
+    high = np.array([0, 0, 1, 1], dtype=bool)
+    assert not _hysteresis(low, high).any()
+    assert not _hysteresis(np.zeros(4, dtype=bool), np.ones(4, dtype=bool)).any()
+
+
+def test_mask_to_regions_edges():
+    starts, ends = _mask_to_regions(np.array([1, 1, 0, 1, 0, 1], dtype=bool))
+    assert starts.tolist() == [0, 3, 5]
+    assert ends.tolist() == [2, 4, 6]
+
+    starts, ends = _mask_to_regions(np.ones(3, dtype=bool))
+    assert (starts.tolist(), ends.tolist()) == ([0], [3])
+
+    starts, ends = _mask_to_regions(np.zeros(3, dtype=bool))
+    assert len(starts) == len(ends) == 0
+
+
+def test_detect_speech_region_around_voiced_burst():
+    samples = _noise(3.0)
+    samples[SAMPLE_RATE:2 * SAMPLE_RATE] += _voiced(1.0)
+    regions = detect_speech_regions(samples, SAMPLE_RATE)
+    assert len(regions) == 1
+    start, end = regions[0]
+    assert abs(start - 1.0) <= 0.03 and abs(end - 2.0) <= 0.03
+
+
+def test_detect_speech_fills_short_gaps_and_drops_short_regions():
+    samples = _noise(4.0)
+    samples[int(0.5 * SAMPLE_RATE):int(1.5 * SAMPLE_RATE)] += _voiced(1.0)
+    samples[int(1.6 * SAMPLE_RATE):int(2.4 * SAMPLE_RATE)] += _voiced(0.8)  # Silence de 0,1 s comblé
+    samples[int(3.2 * SAMPLE_RATE):int(3.3 * SAMPLE_RATE)] += _voiced(0.1)  # Zone trop courte
+    regions = detect_speech_regions(samples, SAMPLE_RATE)
+    assert len(regions) == 1
+    start, end = regions[0]
+    assert abs(start - 0.5) <= 0.03 and abs(end - 2.4) <= 0.03
+
+
+def test_detect_speech_ignores_noise_and_short_input():
+    assert detect_speech_regions(_noise(2.0, level=0.1), SAMPLE_RATE) == []
+    assert detect_speech_regions(np.zeros(10, dtype=np.float32), SAMPLE_RATE) == []